@@ -0,0 +1,131 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+from .geo import GeoIndex
+from .index_alias import HotSwapStore, Target, resolve_directory
+from .prices import PriceTable
+
+load_dotenv()
+
+# 음식점 메타데이터는 검색기가 서빙/failover에 쓰는 로컬 스냅샷에서 읽습니다.
+# 로컬 벡터 인덱스 artifact(store.export_local_index)가 있으면 그것을, 없으면 Chroma 스냅샷을 씁니다.
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "./local_index")
+CATALOG_CHROMA_PATH = os.getenv("CATALOG_CHROMA_PATH", "./chroma_db_upstage")
+CATALOG_COLLECTION_NAME = os.getenv("CATALOG_COLLECTION_NAME", "jamsil_restaurants_upstage")
+# 카탈로그 "현재 버전" 포인터를 다시 확인하는 주기 (초, 0이면 확인하지 않음)
+CATALOG_POLL_S = float(os.getenv("INDEX_ALIAS_POLL_S", "30"))
+GEO_CELL_SIZE_M = float(os.getenv("GEO_CELL_SIZE_M", "250"))
+# store.export_price_table 이 만든 메뉴 가격 사이드 테이블
+PRICE_TABLE_PATH = os.getenv("PRICE_TABLE_PATH", "./price_table.npz")
+
+
+class Catalog:
+    """한 스냅샷 버전의 음식점 메타데이터와, 그것으로 처음 쓸 때 만드는 격자 인덱스."""
+
+    def __init__(self, directory: str, metadatas: List[Dict[str, Any]]) -> None:
+        self.directory = directory
+        self.metadatas = metadatas
+        self._geo_index: Optional[GeoIndex] = None
+        self._representatives: Optional[Dict[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def representatives(self) -> Dict[int, int]:
+        """중복 제거(INDEX_DEDUP=1)로 빠진 음식점 id → 대표 문서의 restaurant_id (대표의 duplicate_ids에서)."""
+        if self._representatives is None:
+            mapping: Dict[int, int] = {}
+            for meta in self.metadatas:
+                for duplicate in str(meta.get("duplicate_ids") or "").split(","):
+                    if duplicate.strip():
+                        mapping[int(duplicate)] = int(meta["restaurant_id"])
+            self._representatives = mapping
+        return self._representatives
+
+    @property
+    def geo_index(self) -> GeoIndex:
+        if self._geo_index is None:
+            with self._lock:
+                if self._geo_index is None:
+                    self._geo_index = GeoIndex.from_metadatas(self.metadatas, cell_size_m=GEO_CELL_SIZE_M)
+        return self._geo_index
+
+
+def _read_catalog_target() -> Target:
+    # 버전 루트(INDEX_VERSIONED=1 빌드)면 current.json이 가리키는 디렉터리를 씁니다.
+    if os.path.exists(LOCAL_INDEX_PATH):
+        return {"kind": "local", "directory": resolve_directory(LOCAL_INDEX_PATH)}
+    return {"kind": "chroma", "directory": resolve_directory(CATALOG_CHROMA_PATH)}
+
+
+def _read_local_index_metadatas(directory: str) -> List[Dict[str, Any]]:
+    # 메타데이터 테이블만 필요하므로 벡터는 memory-map으로만 열고 읽지 않습니다 (Chroma 불필요).
+    from .vector_index import LocalVectorIndex
+
+    return LocalVectorIndex(directory, mode="float32").metadatas()
+
+
+def _read_chroma_metadatas(directory: str) -> List[Dict[str, Any]]:
+    # Chroma는 없는 DB를 빈 DB로 새로 만들므로, 스냅샷이 실제로 있는지 먼저 확인합니다.
+    if not os.path.exists(os.path.join(directory, "chroma.sqlite3")):
+        raise FileNotFoundError(f"카탈로그 스냅샷이 없습니다: {directory}")
+
+    from langchain_chroma import Chroma
+
+    store = Chroma(collection_name=CATALOG_COLLECTION_NAME, persist_directory=directory)
+    return store.get(include=["metadatas"])["metadatas"]
+
+
+def _open_catalog(target: Target) -> Catalog:
+    """스냅샷의 전체 메타데이터를 읽습니다 (임베딩 호출 없음)."""
+    directory = target["directory"]
+    if target.get("kind") == "local":
+        metadatas = _read_local_index_metadatas(directory)
+    else:
+        metadatas = _read_chroma_metadatas(directory)
+    metadatas = [meta for meta in metadatas if meta]
+    if not metadatas:
+        # 빈 카탈로그로는 도보 반경 조건을 풀 수 없으므로 조용히 넘어가지 않고 실패합니다.
+        raise ValueError(f"카탈로그 스냅샷이 비어 있습니다: {directory}")
+    print(f"✅ 카탈로그 메타데이터 {len(metadatas)}건 로드: {directory}")
+    return Catalog(directory, metadatas)
+
+
+# 재색인으로 포인터가 바뀌면 검색 저장소와 함께 카탈로그(격자 인덱스)도 새 버전으로 교체됩니다.
+catalog_store = HotSwapStore("catalog", _read_catalog_target, _open_catalog, poll_interval=CATALOG_POLL_S)
+
+
+def load_catalog_metadatas() -> List[Dict[str, Any]]:
+    """현재 스냅샷 버전의 전체 메타데이터 (버전별로 한 번만 읽어 캐시)."""
+    return catalog_store.get().metadatas
+
+
+def get_geo_index() -> GeoIndex:
+    """현재 카탈로그 좌표로 만든 격자 인덱스 (버전별로 1회 생성)."""
+    return catalog_store.get().geo_index
+
+
+def representative_ids(ids: Iterable[int]) -> List[int]:
+    """
+    음식점 id를 색인에 실제로 있는 대표 id로 바꿉니다 (순서 유지, 중복 제거).
+    격자 인덱스/가격 테이블에는 중복 제거로 빠진 id도 있어, 그대로 $in에 넣으면 대표 문서를 놓칩니다.
+    카탈로그가 없으면 중복 정보가 없으므로 그대로 둡니다.
+    """
+    try:
+        mapping = catalog_store.get().representatives
+    except (FileNotFoundError, ValueError):
+        mapping = {}
+    return list(dict.fromkeys(mapping.get(int(i), int(i)) for i in ids))
+
+
+@lru_cache(maxsize=1)
+def get_price_table() -> PriceTable:
+    """메뉴 가격 사이드 테이블 (프로세스당 1회 로드)."""
+    if not os.path.exists(PRICE_TABLE_PATH):
+        raise FileNotFoundError(f"가격 테이블이 없습니다: {PRICE_TABLE_PATH}")
+    table = PriceTable.load(PRICE_TABLE_PATH)
+    print(f"✅ 가격 테이블 {len(table)}곳 로드: {PRICE_TABLE_PATH}")
+    return table
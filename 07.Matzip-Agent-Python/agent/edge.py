@@ -5,6 +5,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 from langchain_core.documents import Document
+from .fusion import reciprocal_rank_fusion
+from .rerank import rerank_documents
 from .tool import tools
 from .state import GraphState
 from pydantic import BaseModel, Field
@@ -130,6 +132,32 @@ def should_retrieve(state: GraphState) -> str:
     
     return END
 
+def rerank(state: GraphState) -> GraphState:
+    """
+    검색 후보를 리뷰수·거리·날씨 태그·가격대 특징으로 재정렬해 상위 문서만 남깁니다.
+    """
+    print("---후보 재정렬---")
+    messages = state["messages"]
+    # 에이전트가 한 턴에 도구를 여러 번 호출했으면 (ToolNode가 동시에 실행) 결과를 RRF로 합칩니다.
+    last_call = max(
+        (idx for idx, msg in enumerate(messages) if getattr(msg, "tool_calls", None)),
+        default=-1,
+    )
+    artifacts = [
+        list(getattr(msg, "artifact", None) or [])
+        for msg in messages[last_call + 1:]
+        if msg.type == "tool"
+    ]
+    candidates = artifacts[0] if len(artifacts) == 1 else reciprocal_rank_fusion(artifacts)
+
+    documents = rerank_documents(
+        candidates,
+        user_location=state.get("user_location"),
+        weather=state.get("weather"),
+    )
+    print(f"---후보 {len(candidates)}개 → {len(documents)}개---")
+    return {"documents": documents}
+
 class GradeDocuments(BaseModel):
     """검색된 문서에 관련성 점수를 부여합니다."""
     binary_score: str = Field(description="관련성 점수 'yes' 또는 'no'")
@@ -159,13 +187,14 @@ def grade_documents(state: GraphState) -> GraphState:
     chain = prompt | model
     
     last_message = messages[-1]
+    context = _format_docs_with_metadata(state.get("documents")) or last_message.content
     
     score = chain.invoke({
         "question": messages[0].content,
-        "context": last_message.content,
+        "context": context,
     })
     print(messages[0].content)
-    print(last_message.content)
+    print(context)
 
     return {"messages": [AIMessage(content=score.binary_score)]}
 
@@ -240,7 +269,12 @@ a   답변을 생성합니다.
         raise ValueError("대화 기록에서 도구 메시지를 찾을 수 없습니다")
 
         
-    docs = last_tool_message.content
+    # rerank 노드가 고른 문서를 우선 사용하고, 없으면 검색 도구의 artifact/본문을 사용합니다.
+    docs = (
+        state.get("documents")
+        or getattr(last_tool_message, "artifact", None)
+        or last_tool_message.content
+    )
     prompt = ChatPromptTemplate.from_template(
         """당신은 음식점 추천 전문가입니다. 아래 context 데이터를 분석하여 사용자에게 최적의 음식점을 추천해주세요.
 
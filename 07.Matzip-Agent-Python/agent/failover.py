@@ -0,0 +1,202 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from .filters import SearchFilter
+
+# (질의 벡터, k, 필터) → [(Document, 유사도)] — 모든 백엔드가 "높을수록 가까움"으로 반환합니다.
+SearchFn = Callable[[Sequence[float], int, Optional[SearchFilter]], List[Tuple[Document, float]]]
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번이면 열림(open) 상태가 되어 reset_timeout 동안 호출을 건너뜁니다.
+    그 뒤 한 번은 시험 호출(half-open)을 허용하고, 성공하면 다시 닫힙니다.
+    시험 호출이 결과를 알리기 전까지 다른 호출자는 계속 건너뜁니다 (시험 호출이 reset_timeout 넘게
+    돌아오지 않으면 멈춘 것으로 보고 다음 호출자에게 다시 시험을 맡깁니다).
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return True
+            if state == "open":
+                return False
+            if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+                return False
+            self._trial_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+            self._trial_at = None
+
+
+class LatencyTracker:
+    """최근 응답 시간(ms)으로 p95를 계산합니다."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency_ms: float) -> None:
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < 20:
+            return None
+        return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+
+class Backend:
+    """이름, 검색 함수, 회로 차단기, 지연 통계를 묶은 검색 백엔드."""
+
+    def __init__(self, name: str, search: SearchFn, breaker: Optional[CircuitBreaker] = None) -> None:
+        self.name = name
+        self.search = search
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+
+
+class FailoverRetriever:
+    """
+    primary를 먼저 호출하고, p95 지연(표본이 부족하면 hedge_ms)까지 응답이 없으면
+    secondary에 같은 질의를 보내 먼저 성공한 결과를 사용합니다 (hedged request).
+    회로가 열린 백엔드는 건너뛰고, 요청마다 어느 백엔드가 응답했는지 served에 집계합니다.
+    secondary가 없으면 primary 하나만 SLO 안에서 기다립니다.
+    """
+
+    def __init__(
+        self,
+        primary: Backend,
+        secondary: Optional[Backend] = None,
+        slo_ms: float = 3000.0,
+        hedge_ms: float = 800.0,
+        max_workers: int = 8,
+    ) -> None:
+        self.primary = primary
+        self.secondary = secondary
+        self.slo_ms = slo_ms
+        self.hedge_ms = hedge_ms
+        self.served: Counter = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="retriever")
+
+    def _hedge_delay_s(self) -> float:
+        p95 = self.primary.latency.percentile(0.95)
+        delay = self.hedge_ms if p95 is None else p95
+        return min(delay, self.slo_ms) / 1000.0
+
+    def _submit(self, backend: Backend, vector, k, search_filter) -> Future:
+        def call():
+            start = time.perf_counter()
+            try:
+                result = backend.search(vector, k, search_filter)
+            except Exception:
+                backend.breaker.record_failure()
+                raise
+            backend.latency.add((time.perf_counter() - start) * 1000.0)
+            backend.breaker.record_success()
+            return result
+
+        future = self._executor.submit(call)
+        future.backend = backend
+        return future
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int,
+        search_filter: Optional[SearchFilter] = None,
+    ) -> Tuple[List[Tuple[Document, float]], str]:
+        """(결과, 응답한 백엔드 이름)을 반환합니다. 모두 실패하면 마지막 오류를 다시 던집니다."""
+        deadline = time.monotonic() + self.slo_ms / 1000.0
+        pending = set()
+        last_error: Optional[BaseException] = None
+
+        if self.primary.breaker.allow():
+            pending.add(self._submit(self.primary, vector, k, search_filter))
+            done, _ = wait(pending, timeout=self._hedge_delay_s())
+            if done:
+                future = done.pop()
+                pending.discard(future)
+                if future.exception() is None:
+                    return self._served(future)
+                last_error = future.exception()
+
+        if self.secondary is not None and self.secondary.breaker.allow():
+            pending.add(self._submit(self.secondary, vector, k, search_filter))
+
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return self._served(future)
+                last_error = future.exception()
+
+        # SLO 안에 끝나지 않은 호출은 실패로 기록합니다 (스레드는 백그라운드에서 마저 끝납니다).
+        for future in pending:
+            future.backend.breaker.record_failure()
+        self.served["failed"] += 1
+        if last_error is not None:
+            raise last_error
+        raise TimeoutError(f"검색 백엔드가 {self.slo_ms:.0f}ms 안에 응답하지 않았습니다")
+
+    def _served(self, future: Future) -> Tuple[List[Tuple[Document, float]], str]:
+        name = future.backend.name
+        self.served[name] += 1
+        print(f"---검색 백엔드: {name}---")
+        return future.result(), name
+
+    def stats(self) -> Dict[str, Any]:
+        """백엔드별 응답 횟수, 회로 상태, p95 지연."""
+        return {
+            "served": dict(self.served),
+            "backends": {
+                backend.name: {
+                    "breaker": backend.breaker.state,
+                    "p95_ms": backend.latency.percentile(0.95),
+                }
+                for backend in (self.primary, self.secondary)
+                if backend is not None
+            },
+        }
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Optional, TypedDict
+
+from .prices import PriceRange
+
+
+class GeoConstraint(TypedDict):
+    """사용자 위치 기준 도보 반경."""
+    latitude: float
+    longitude: float
+    radius_m: float
+
+
+class SearchFilter(TypedDict, total=False):
+    """검색 단계에서 강제할 구조화된 조건."""
+    location_types: List[str]
+    category: str
+    min_review_count: int
+    # near는 검색 직전에 격자 인덱스로 restaurant_ids로 바뀝니다.
+    near: GeoConstraint
+    restaurant_ids: List[int]
+    # 가격 사이드 테이블이 있으면 검색 직전에 restaurant_ids로 바뀝니다 (없으면 min/max_price 메타데이터로 거름).
+    price_range: PriceRange
+
+
+LIST_KEYS = ("location_types", "restaurant_ids")
+# Pinecone의 $in 은 값 10,000개까지만 허용합니다.
+MAX_FILTER_IDS = 10_000
+
+
+def merge_filters(*filters: Optional[SearchFilter]) -> SearchFilter:
+    """
+    여러 필터를 하나로 합칩니다. 뒤에 오는 값이 우선합니다 (목록 조건은 교집합).
+    목록 조건의 빈 목록은 "해당 없음"이라는 조건이므로 버리지 않고, 한 번 비면 계속 비어 있습니다.
+    """
+    merged: SearchFilter = {}
+    for search_filter in filters:
+        if not search_filter:
+            continue
+        for key, value in search_filter.items():
+            if value is None or value == "":
+                continue
+            if key in LIST_KEYS:
+                if key in merged:
+                    allowed = set(value)
+                    merged[key] = [v for v in merged[key] if v in allowed]
+                else:
+                    merged[key] = list(value)
+                continue
+            merged[key] = value
+    return merged
+
+
+def is_unsatisfiable(search_filter: Optional[SearchFilter]) -> bool:
+    """목록 조건이 빈 목록이면 어떤 문서도 맞지 않습니다 (벡터 저장소에 빈 $in을 보내지 않도록 먼저 확인)."""
+    return bool(search_filter) and any(key in search_filter and not search_filter[key] for key in LIST_KEYS)
+
+
+def _conditions(search_filter: Optional[SearchFilter]) -> List[Dict[str, Any]]:
+    if not search_filter:
+        return []
+
+    conditions: List[Dict[str, Any]] = []
+    if "location_types" in search_filter:
+        conditions.append({"location_type": {"$in": list(search_filter["location_types"])}})
+    if search_filter.get("category"):
+        conditions.append({"category": {"$eq": search_filter["category"]}})
+    if "restaurant_ids" in search_filter:
+        conditions.append({"restaurant_id": {"$in": list(search_filter["restaurant_ids"])}})
+    if search_filter.get("min_review_count"):
+        conditions.append({"naver_review_count": {"$gte": int(search_filter["min_review_count"])}})
+    price_range = search_filter.get("price_range") or {}
+    # 메뉴 하나라도 범위 안 ≈ 최저가 ≤ 상한 그리고 최고가 ≥ 하한
+    if "max_price" in price_range:
+        conditions.append({"min_price": {"$lte": int(price_range["max_price"])}})
+    if "min_price" in price_range:
+        conditions.append({"max_price": {"$gte": int(price_range["min_price"])}})
+    return conditions
+
+
+def to_metadata_filter(search_filter: Optional[SearchFilter]) -> Optional[Dict[str, Any]]:
+    """
+    Pinecone/Chroma 공통 metadata filter 문법으로 변환합니다.
+    두 스토어 모두 조건이 여러 개면 $and로 묶어야 top-k 이전에 적용됩니다.
+    """
+    conditions = _conditions(search_filter)
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def matches_filter(metadata: Dict[str, Any], search_filter: Optional[SearchFilter]) -> bool:
+    """로컬 백엔드용: 메타데이터 한 건이 필터 조건을 만족하는지 확인합니다."""
+    if not search_filter:
+        return True
+    if "location_types" in search_filter and metadata.get("location_type") not in search_filter["location_types"]:
+        return False
+    if search_filter.get("category") and metadata.get("category") != search_filter["category"]:
+        return False
+    if "restaurant_ids" in search_filter and metadata.get("restaurant_id") not in search_filter["restaurant_ids"]:
+        return False
+    if search_filter.get("min_review_count"):
+        if (metadata.get("naver_review_count") or 0) < int(search_filter["min_review_count"]):
+            return False
+    price_range = search_filter.get("price_range") or {}
+    if "max_price" in price_range and not 0 <= metadata.get("min_price", -1) <= price_range["max_price"]:
+        return False
+    if "min_price" in price_range and metadata.get("max_price", -1) < price_range["min_price"]:
+        return False
+    return True
@@ -0,0 +1,39 @@
+from typing import Dict, List, Sequence
+
+from langchain_core.documents import Document
+
+# RRF 상수 (원 논문 기본값). 순위가 낮은 결과의 영향을 완만하게 줄입니다.
+RRF_K = 60
+
+
+def _doc_key(doc: Document):
+    restaurant_id = (doc.metadata or {}).get("restaurant_id")
+    if restaurant_id is not None:
+        return int(restaurant_id)
+    return hash(doc.page_content)
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[Sequence[Document]], rrf_k: int = RRF_K) -> List[Document]:
+    """
+    여러 검색 결과를 restaurant_id 기준으로 중복 제거하고 RRF 점수(Σ 1/(rrf_k + 순위))로 합칩니다.
+    similarity는 가장 높은 값을 남기고, 합친 점수는 metadata["rrf_score"]에 기록합니다.
+    재정렬(agent.rerank)은 rrf_score가 있으면 similarity 대신 이를 관련도 특징으로 씁니다.
+    """
+    fused: Dict[object, Document] = {}
+    scores: Dict[object, float] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            if key not in fused:
+                fused[key] = doc
+            else:
+                best = fused[key].metadata.get("similarity")
+                current = doc.metadata.get("similarity")
+                if current is not None and (best is None or current > best):
+                    fused[key].metadata["similarity"] = current
+
+    ordered = sorted(fused, key=lambda key: scores[key], reverse=True)
+    for key in ordered:
+        fused[key].metadata["rrf_score"] = round(scores[key], 6)
+    return [fused[key] for key in ordered]
@@ -0,0 +1,126 @@
+import math
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def haversine_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """기준점에서 여러 좌표까지의 거리(m)를 한 번에 계산합니다."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """
+    위도/경도 격자 인덱스.
+
+    좌표를 cell_size_m 크기의 격자로 나눠 (열, 행) 키로 정렬해 두고,
+    질의 시에는 반경을 덮는 격자 열마다 searchsorted로 연속 구간만 잘라낸 뒤
+    haversine 거리로 정밀하게 걸러냅니다.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[Any],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        cell_size_m: float = 250.0,
+    ) -> None:
+        lats = np.asarray(latitudes, dtype=np.float64)
+        lons = np.asarray(longitudes, dtype=np.float64)
+        if lats.shape != lons.shape or lats.shape[0] != len(ids):
+            raise ValueError("ids, latitudes, longitudes의 길이가 같아야 합니다")
+
+        self.cell_size_m = float(cell_size_m)
+        ref_lat = float(lats.mean()) if lats.size else 37.5
+        self._cell_lat = self.cell_size_m / METERS_PER_DEG_LAT
+        self._cell_lon = self.cell_size_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(ref_lat)), 1e-6))
+        self._lat0 = float(lats.min()) if lats.size else 0.0
+        self._lon0 = float(lons.min()) if lons.size else 0.0
+
+        rows = np.floor((lats - self._lat0) / self._cell_lat).astype(np.int64)
+        cols = np.floor((lons - self._lon0) / self._cell_lon).astype(np.int64)
+        self._n_rows = int(rows.max()) + 1 if rows.size else 1
+        keys = cols * self._n_rows + rows
+
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._lats = lats[order]
+        self._lons = lons[order]
+        self._ids = np.asarray(ids, dtype=object)[order]
+        self._max_col = int(cols.max()) if cols.size else 0
+
+    @classmethod
+    def from_metadatas(cls, metadatas: Iterable[Dict[str, Any]], cell_size_m: float = 250.0) -> "GeoIndex":
+        """Document metadata(restaurant_id, latitude, longitude)에서 인덱스를 만듭니다."""
+        ids, lats, lons = [], [], []
+        for meta in metadatas:
+            if meta.get("latitude") is None or meta.get("longitude") is None:
+                continue
+            ids.append(meta.get("restaurant_id"))
+            lats.append(float(meta["latitude"]))
+            lons.append(float(meta["longitude"]))
+        return cls(ids, lats, lons, cell_size_m=cell_size_m)
+
+    def __len__(self) -> int:
+        return int(self._ids.shape[0])
+
+    def _candidates(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        """반경을 덮는 격자 셀에 속한 점들의 위치(정렬 배열 기준)를 반환합니다."""
+        dlat = radius_m / METERS_PER_DEG_LAT
+        far_lat = min(max(abs(lat - dlat), abs(lat + dlat)), 89.9)
+        dlon = radius_m / (METERS_PER_DEG_LAT * math.cos(math.radians(far_lat)))
+
+        row_lo = max(int(math.floor((lat - dlat - self._lat0) / self._cell_lat)), 0)
+        row_hi = min(int(math.floor((lat + dlat - self._lat0) / self._cell_lat)), self._n_rows - 1)
+        col_lo = max(int(math.floor((lon - dlon - self._lon0) / self._cell_lon)), 0)
+        col_hi = min(int(math.floor((lon + dlon - self._lon0) / self._cell_lon)), self._max_col)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+
+        # 같은 열(col)에서 row_lo..row_hi 셀은 정렬된 키에서 연속 구간입니다.
+        cols = np.arange(col_lo, col_hi + 1, dtype=np.int64) * self._n_rows
+        starts = np.searchsorted(self._keys, cols + row_lo, side="left")
+        ends = np.searchsorted(self._keys, cols + row_hi, side="right")
+        spans = [np.arange(s, e) for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return spans[0] if len(spans) == 1 else np.concatenate(spans)
+
+    def within(self, lat: float, lon: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 radius_m 안의 (ids, 거리) 를 가까운 순으로 반환합니다."""
+        positions = self._candidates(lat, lon, radius_m)
+        if positions.size == 0:
+            return self._ids[:0], np.empty(0, dtype=np.float64)
+
+        dist = haversine_m(lat, lon, self._lats[positions], self._lons[positions])
+        mask = dist <= radius_m
+        positions, dist = positions[mask], dist[mask]
+        order = np.argsort(dist, kind="stable")
+        return self._ids[positions[order]], dist[order]
+
+    def nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """가장 가까운 k개의 (ids, 거리) 를 반환합니다."""
+        total = len(self)
+        k = min(k, total)
+        if k <= 0:
+            return self._ids[:0], np.empty(0, dtype=np.float64)
+
+        # 반경을 두 배씩 넓혀 k개 이상 잡히면, 그 안에 진짜 k-최근접이 모두 포함됩니다.
+        radius = self.cell_size_m
+        while True:
+            ids, dist = self.within(lat, lon, radius)
+            if ids.shape[0] >= k:
+                return ids[:k], dist[:k]
+            if ids.shape[0] == total or radius > 2 * math.pi * EARTH_RADIUS_M:
+                dist = haversine_m(lat, lon, self._lats, self._lons)
+                order = np.argsort(dist, kind="stable")[:k]
+                return self._ids[order], dist[order]
+            radius *= 2.0
@@ -9,6 +9,7 @@ from .edge import (
     check_question_relevance,
     decide_on_question_relevance,
     refuse_to_answer,
+    rerank,
 )
 from .tool import tool_node
 from .state import GraphState
@@ -21,6 +22,7 @@ builder.add_node("check_question_relevance", check_question_relevance)
 builder.add_node("refuse_to_answer", refuse_to_answer)
 builder.add_node("agent", agent)
 builder.add_node("retrieve", tool_node)
+builder.add_node("rerank", rerank)
 builder.add_node("grade_documents", grade_documents)
 builder.add_node("rewrite", rewrite)
 builder.add_node("generate", generate)
@@ -47,7 +49,9 @@ builder.add_conditional_edges(
     should_retrieve,
 )
 
-builder.add_edge("retrieve", "grade_documents")
+# 검색 후보(over-fetch)를 재정렬한 뒤 상위 문서만 평가합니다.
+builder.add_edge("retrieve", "rerank")
+builder.add_edge("rerank", "grade_documents")
 
 # grade_documents 노드 이후의 조건부 엣지
 builder.add_conditional_edges(
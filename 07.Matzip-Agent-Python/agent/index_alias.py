@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# 버전 디렉터리들의 부모에 두는 "현재 버전" 포인터 파일
+CURRENT_POINTER = "current.json"
+VERSIONS_DIR = "versions"
+# Pinecone은 alias 기능이 없어, 인덱스 안의 예약 네임스페이스에 포인터 레코드 하나를 둡니다.
+ALIAS_NAMESPACE = "__alias__"
+
+Target = Dict[str, Any]
+
+
+class FileAlias:
+    """
+    디렉터리 버전용 포인터. {"version", "directory", ...} JSON을 임시 파일에 쓴 뒤
+    os.replace로 바꿔치기하므로 읽는 쪽은 항상 이전 값 아니면 새 값만 봅니다.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.path = os.path.join(root, CURRENT_POINTER)
+
+    def read(self) -> Optional[Target]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write(self, target: Target) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(target, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class PineconeAlias:
+    """
+    네임스페이스 버전용 포인터. ALIAS_NAMESPACE의 레코드 하나(id=alias)의 metadata에
+    현재 네임스페이스를 적어 두어, 여러 호스트의 앱 프로세스가 같은 포인터를 봅니다.
+    """
+
+    def __init__(self, index: Any, alias: str, dimension: Optional[int] = None) -> None:
+        self.index = index
+        self.alias = alias
+        self.dimension = dimension
+
+    def read(self) -> Optional[Target]:
+        response = self.index.fetch(ids=[self.alias], namespace=ALIAS_NAMESPACE)
+        vectors = getattr(response, "vectors", None) or {}
+        record = vectors.get(self.alias)
+        if record is None:
+            return None
+        return dict(record.metadata or {})
+
+    def write(self, target: Target) -> None:
+        if not self.dimension:
+            raise ValueError("포인터를 쓰려면 인덱스 차원이 필요합니다")
+        # cosine 인덱스는 0 벡터를 받지 않으므로 첫 성분만 1인 벡터를 씁니다.
+        values = [1.0] + [0.0] * (self.dimension - 1)
+        self.index.upsert(
+            vectors=[{"id": self.alias, "values": values, "metadata": target}],
+            namespace=ALIAS_NAMESPACE,
+        )
+
+
+def resolve_directory(path: str) -> str:
+    """path가 버전 루트(current.json 보유)면 현재 버전 디렉터리를, 아니면 path 그대로 반환합니다."""
+    target = FileAlias(path).read()
+    if target and target.get("directory"):
+        return os.path.join(path, target["directory"])
+    return path
+
+
+class HotSwapStore:
+    """
+    포인터가 가리키는 버전의 검색 저장소를 들고 있다가, 포인터가 바뀌면
+    백그라운드 스레드에서 새 버전을 미리 연 뒤 참조만 교체합니다.
+    요청 경로에서는 get()이 현재 참조를 돌려줄 뿐이라 교체 중에도 지연이 늘지 않습니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        read_target: Callable[[], Optional[Target]],
+        open_target: Callable[[Optional[Target]], Any],
+        poll_interval: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.read_target = read_target
+        self.open_target = open_target
+        self.poll_interval = poll_interval
+        self._store: Any = None
+        self._target: Optional[Target] = None
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    def get(self) -> Any:
+        store = self._store
+        if store is None:
+            with self._lock:
+                if self._store is None:
+                    self._target = self.read_target()
+                    self._store = self.open_target(self._target)
+                    self._start_watcher()
+                store = self._store
+        return store
+
+    @property
+    def version(self) -> Optional[str]:
+        return (self._target or {}).get("version")
+
+    def refresh(self) -> bool:
+        """포인터를 다시 읽어 바뀌었으면 새 버전으로 교체합니다. 교체했으면 True."""
+        target = self.read_target()
+        if target is None or target == self._target:
+            return False
+        store = self.open_target(target)
+        with self._lock:
+            self._store, self._target = store, target
+        print(f"🔄 {self.name} 인덱스 교체: {target.get('version')}")
+        return True
+
+    def _start_watcher(self) -> None:
+        if self._watcher is not None or self.poll_interval <= 0:
+            return
+
+        def watch() -> None:
+            while True:
+                time.sleep(self.poll_interval)
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    # 포인터를 못 읽거나 새 버전을 못 열면 기존 버전으로 계속 응답합니다.
+                    print(f"⚠️  {self.name} 인덱스 포인터 확인 실패: {exc}")
+
+        self._watcher = threading.Thread(target=watch, name=f"alias-{self.name}", daemon=True)
+        self._watcher.start()
@@ -0,0 +1,92 @@
+import os
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 1에 가까울수록 관련도, 0에 가까울수록 다양성을 중시합니다 (1이면 MMR을 쓰지 않음).
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+# 벡터 외에 같은 값이면 비슷한 후보로 볼 metadata 필드 (쉼표 구분, 비우면 벡터만 사용)
+MMR_FIELDS = tuple(f.strip() for f in os.getenv("MMR_FIELDS", "category,location_type").split(",") if f.strip())
+# 필드 하나가 같을 때 더하는 유사도 (category와 location_type이 모두 같으면 2배, 최대 1)
+MMR_FIELD_WEIGHT = float(os.getenv("MMR_FIELD_WEIGHT", "0.5"))
+# 1이면 검색기가 후보 임베딩을 함께 받아 벡터 유사도로도 다양화합니다.
+# Pinecone은 후보마다 벡터 값이 응답에 실려 (50개 × 4096차원 ≈ 수 MB JSON) 검색 지연이 크게 늘므로,
+# 기본값 0은 필드만으로 다양화합니다.
+MMR_VECTORS = os.getenv("MMR_VECTORS", "0") == "1"
+# 검색기가 후보 벡터를 실어 보내는 metadata 키 (재정렬 단계에서 꺼내 쓰고 지웁니다)
+VECTOR_KEY = "_vector"
+
+MMR_ENABLED = MMR_LAMBDA < 1.0
+ATTACH_VECTORS = MMR_ENABLED and MMR_VECTORS
+
+
+def _group_codes(values: Sequence[Any]) -> np.ndarray:
+    """필드 값을 정수 코드로 바꿉니다. 빈 값은 서로 다른 값으로 봅니다 (음수 고유 코드)."""
+    index: Dict[Any, int] = {}
+    return np.array(
+        [index.setdefault(v, len(index)) if v not in (None, "") else -1 - i for i, v in enumerate(values)],
+        dtype=np.int64,
+    )
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    k: int,
+    vectors: Optional[np.ndarray] = None,
+    groups: Sequence[Sequence[Any]] = (),
+    lambda_mult: float = MMR_LAMBDA,
+    field_weight: float = MMR_FIELD_WEIGHT,
+    normalized: bool = False,
+) -> np.ndarray:
+    """
+    Maximal Marginal Relevance로 후보 k개를 고른 순서대로 행 번호를 반환합니다.
+
+        score_i = λ · relevance_i − (1 − λ) · max_{j∈선택됨} sim(i, j)
+
+    - relevance: 후보별 관련도 (후보 안에서 0~1로 맞춘 뒤 씁니다)
+    - vectors: (n, d) 후보 임베딩 블록. 유사도는 코사인이며, 없으면 필드만으로 다양화합니다.
+    - groups: category/location_type 처럼 같은 값이면 field_weight만큼 비슷하다고 볼 필드 값 목록들
+    - normalized: vectors가 이미 단위 벡터면 True (노름 계산 한 번을 건너뜁니다)
+
+    고를 때마다 새로 고른 후보와의 유사도 한 줄(행렬-벡터 곱 한 번)만 계산해
+    "선택된 문서와의 최대 유사도" 배열을 갱신하므로, 후보 간 전체 유사도 행렬을 만들지 않습니다.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    n = relevance.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    span = relevance.max() - relevance.min()
+    relevance = (relevance - relevance.min()) / span if span > 0 else np.zeros(n)
+
+    inv_norms = None
+    if vectors is not None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not normalized:
+            inv_norms = 1.0 / np.maximum(np.sqrt(np.einsum("ij,ij->i", vectors, vectors)), 1e-12)
+    codes = [_group_codes(values) for values in groups]
+
+    selected = np.empty(k, dtype=np.int64)
+    redundancy = np.zeros(n)
+    score = lambda_mult * relevance
+    for step in range(k):
+        best = int(np.argmax(score))
+        selected[step] = best
+        if step + 1 == k:
+            break
+        similarity = np.zeros(n)
+        if vectors is not None:
+            similarity = vectors @ vectors[best]
+            if inv_norms is not None:
+                similarity = similarity * (inv_norms * inv_norms[best])
+        if codes:
+            same = sum((c == c[best]).astype(np.float64) for c in codes) * field_weight
+            similarity = np.maximum(similarity, np.minimum(same, 1.0))
+        np.maximum(redundancy, similarity, out=redundancy)
+        score = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        score[selected[: step + 1]] = -np.inf
+    return selected
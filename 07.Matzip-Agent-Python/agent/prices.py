@@ -0,0 +1,148 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
+
+
+class PriceRange(TypedDict, total=False):
+    """메뉴 가격 조건 (원). 메뉴 하나라도 범위 안에 있으면 통과합니다."""
+    min_price: int
+    max_price: int
+
+
+# ==================== 질의에서 가격 조건 읽기 ====================
+_NUMERALS = {"일": 1, "이": 2, "삼": 3, "사": 4, "오": 5, "육": 6, "칠": 7, "팔": 8, "구": 9}
+_KO_DIGIT = "[일이삼사오육칠팔구]"
+# "만원", "1만5천원", "1.5만원", "만 오천원", "8천원", "15,000원", "12000원" (+ "대": 만원대/8천원대)
+# 한글 숫자는 조사와 헷갈리지 않게 "만/천"에 붙어 있을 때만 읽습니다 ("가격이 만원" ≠ 2만원).
+_AMOUNT = re.compile(
+    rf"(?:(?P<man>\d+(?:\.\d+)?\s*|{_KO_DIGIT})?만\s*(?:(?P<cheon>\d|{_KO_DIGIT})\s*천)?"
+    rf"|(?P<cheon_only>\d+|{_KO_DIGIT})\s*천"
+    r"|(?P<digits>\d{1,3}(?:,\d{3})+|\d{3,}))"
+    r"\s*원(?P<dae>대)?"
+)
+_RANGE_SEP = re.compile(r"\s*(?:~|-|–|에서|부터)\s*$")
+_UPPER = re.compile(r"\s*(이하|까지|이내|안쪽|안으로|아래|밑|미만)")
+_LOWER = re.compile(r"\s*(이상|넘는|넘게|부터|초과)")
+
+
+def _number(token: Optional[str]) -> Optional[float]:
+    if token is None:
+        return None
+    token = token.strip()
+    return float(_NUMERALS[token]) if token in _NUMERALS else float(token)
+
+
+def _won(match: "re.Match[str]") -> int:
+    if match.group("digits"):
+        return int(match.group("digits").replace(",", ""))
+    if match.group("cheon_only"):
+        return int(_number(match.group("cheon_only")) * 1000)
+    man = _number(match.group("man"))
+    cheon = _number(match.group("cheon")) or 0
+    return int((1 if man is None else man) * 10000 + cheon * 1000)
+
+
+def parse_price_range(text: str) -> Optional[PriceRange]:
+    """
+    질의의 가격 표현을 PriceRange로 바꿉니다. 읽을 수 있는 금액이 없으면 None.
+
+    예: "만원 이하" → max 10000, "1만5천원 미만" → max 14999, "2만원 이상" → min 20000,
+        "8천원대" → 8000~8999, "만원대" → 10000~19999, "7천원~1만원" → 7000~10000
+    """
+    matches = list(_AMOUNT.finditer(text))
+    if not matches:
+        return None
+
+    price_range: PriceRange = {}
+    for i, match in enumerate(matches):
+        amount = _won(match)
+        after = text[match.end():]
+        if match.group("dae"):
+            unit = 10000 if amount >= 10000 and amount % 10000 == 0 else 1000
+            price_range.update(min_price=amount, max_price=amount + unit - 1)
+            continue
+        if i + 1 < len(matches) and _RANGE_SEP.match(text[match.end():matches[i + 1].start()]):
+            # "A~B" 의 A: B는 다음 금액에서 상한으로 처리합니다.
+            price_range["min_price"] = amount
+            continue
+        if i > 0 and _RANGE_SEP.match(text[matches[i - 1].end():match.start()]):
+            price_range["max_price"] = amount
+            continue
+        upper = _UPPER.match(after)
+        lower = _LOWER.match(after)
+        if upper:
+            price_range["max_price"] = amount - 1 if upper.group(1) == "미만" else amount
+        elif lower:
+            price_range["min_price"] = amount + 1 if lower.group(1) == "초과" else amount
+        else:
+            # "만원 점심"처럼 조건 없이 금액만 있으면 그 금액까지로 봅니다.
+            price_range.setdefault("max_price", amount)
+    return price_range or None
+
+
+# ==================== 가격 사이드 테이블 ====================
+class PriceTable:
+    """
+    음식점별 메뉴 가격을 CSR 모양(ids, offsets, prices)으로 담은 열 지향 테이블.
+    음식점 i의 메뉴 가격은 prices[offsets[i]:offsets[i + 1]] (오름차순)이며,
+    최저/중앙/최고가는 미리 계산해 둡니다. 가격 조건은 반복문 없이 배열 연산으로 거릅니다.
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray, prices: np.ndarray) -> None:
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.int32)
+        counts = np.diff(self.offsets)
+        starts = self.offsets[:-1]
+        # 메뉴가 없는 음식점도 인덱싱할 수 있게 끝에 0을 하나 붙인 배열에서 읽고, 결과는 -1로 바꿉니다.
+        padded = np.append(self.prices, 0).astype(np.int64)
+        lower = padded[starts + np.maximum(counts - 1, 0) // 2]
+        upper = padded[starts + counts // 2]
+        has_menu = counts > 0
+        self.min_prices = np.where(has_menu, padded[starts], -1)
+        self.median_prices = np.where(has_menu, (lower + upper) // 2, -1)
+        self.max_prices = np.where(has_menu, padded[np.maximum(self.offsets[1:] - 1, 0)], -1)
+
+    @classmethod
+    def from_menus(cls, items: Iterable[Tuple[int, Sequence[int]]]) -> "PriceTable":
+        """(restaurant_id, 메뉴 가격 목록) 에서 테이블을 만듭니다."""
+        ids: List[int] = []
+        offsets = [0]
+        prices: List[int] = []
+        for restaurant_id, menu_prices in items:
+            ids.append(int(restaurant_id))
+            prices.extend(sorted(int(p) for p in menu_prices))
+            offsets.append(len(prices))
+        return cls(np.array(ids), np.array(offsets), np.array(prices))
+
+    def save(self, path: str) -> None:
+        np.savez(path, ids=self.ids, offsets=self.offsets, prices=self.prices)
+
+    @classmethod
+    def load(cls, path: str) -> "PriceTable":
+        with np.load(path) as data:
+            return cls(data["ids"], data["offsets"], data["prices"])
+
+    def matching_ids(self, price_range: PriceRange) -> np.ndarray:
+        """메뉴 하나라도 [min_price, max_price] 안에 있는 음식점 id."""
+        lo = price_range.get("min_price", 0)
+        hi = price_range.get("max_price", np.iinfo(np.int32).max)
+        in_range = (self.prices >= lo) & (self.prices <= hi)
+        # 구간 합(누적합 차)으로 음식점별 범위 안 메뉴 수를 셉니다.
+        cumulative = np.concatenate([[0], np.cumsum(in_range, dtype=np.int64)])
+        counts = cumulative[self.offsets[1:]] - cumulative[self.offsets[:-1]]
+        return self.ids[counts > 0]
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+
+def price_summary(menu_prices: Sequence[int]) -> Dict[str, int]:
+    """메뉴 가격 목록의 최저/중앙/최고가 (메타데이터용)."""
+    prices = sorted(int(p) for p in menu_prices)
+    if not prices:
+        return {}
+    n = len(prices)
+    median = (prices[(n - 1) // 2] + prices[n // 2]) // 2
+    return {"min_price": prices[0], "median_price": median, "max_price": prices[-1]}
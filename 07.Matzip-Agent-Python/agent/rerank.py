@@ -0,0 +1,195 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+from .geo import haversine_m
+from .mmr import MMR_FIELDS, MMR_LAMBDA, VECTOR_KEY, mmr_select
+
+load_dotenv()
+
+# 특징(feature) 순서는 가중치 벡터 순서와 같습니다. "similarity"는 RRF로 합친 후보면 rrf_score를 씁니다.
+FEATURES = ("similarity", "reviews", "distance", "weather", "price")
+DEFAULT_WEIGHTS = {
+    "similarity": 1.0,
+    "reviews": 0.35,
+    "distance": 0.3,
+    "weather": 0.25,
+    "price": 0.15,
+}
+
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "4"))
+RERANK_WEIGHTS_PATH = os.getenv("RERANK_WEIGHTS_PATH", "./rerank_weights.json")
+# 설정하면 재정렬 때마다 후보 특징을 JSONL로 남겨 오프라인 가중치 학습에 씁니다.
+RERANK_FEATURE_LOG = os.getenv("RERANK_FEATURE_LOG")
+# 직장인 점심 기준 선호 가격대 (원)
+PRICE_BAND = (
+    float(os.getenv("RERANK_PRICE_MIN", "8000")),
+    float(os.getenv("RERANK_PRICE_MAX", "15000")),
+)
+
+# 현재 날씨 조건 → weather_tags에서 찾을 키워드
+WEATHER_TAG_KEYWORDS = {
+    "rain": ["비", "우천"],
+    "snow": ["눈"],
+    "cold": ["추운", "쌀쌀"],
+    "hot": ["더운", "무더운"],
+    "dust": ["미세먼지"],
+    "clear": ["맑은", "화창"],
+}
+
+_PRICE_RE = re.compile(r":\s*(\d{3,6})(?:\.\d+)?")
+
+
+@lru_cache(maxsize=4)
+def load_weights(path: str = RERANK_WEIGHTS_PATH) -> np.ndarray:
+    """가중치 JSON이 있으면 읽고, 없으면 기본값을 사용합니다."""
+    weights = dict(DEFAULT_WEIGHTS)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            weights.update({k: float(v) for k, v in json.load(f).items() if k in weights})
+    return np.array([weights[name] for name in FEATURES], dtype=np.float64)
+
+
+def save_weights(weights: Sequence[float], path: str = RERANK_WEIGHTS_PATH) -> None:
+    """오프라인 학습 결과를 JSON으로 저장합니다."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: round(float(w), 6) for name, w in zip(FEATURES, weights)}, f, ensure_ascii=False, indent=2)
+
+
+def weather_conditions(weather: Optional[Dict[str, Any]]) -> List[str]:
+    """날씨 dict를 WEATHER_TAG_KEYWORDS 키 목록으로 요약합니다."""
+    if not weather:
+        return []
+    conditions = []
+    if (weather.get("precip_mm") or 0) > 0:
+        conditions.append("rain")
+    if (weather.get("snow_cm") or 0) > 0:
+        conditions.append("snow")
+    feels_like = weather.get("feels_like", weather.get("temperature"))
+    if feels_like is not None and feels_like <= 5:
+        conditions.append("cold")
+    if feels_like is not None and feels_like >= 28:
+        conditions.append("hot")
+    if (weather.get("pm25") or 0) >= 36 or (weather.get("pm10") or 0) >= 81:
+        conditions.append("dust")
+    if not conditions:
+        conditions.append("clear")
+    return conditions
+
+
+def _median_price(doc: Document) -> float:
+    meta = doc.metadata or {}
+    if meta.get("median_price"):
+        return float(meta["median_price"])
+    prices = [float(p) for p in _PRICE_RE.findall(doc.page_content or "")]
+    return float(np.median(prices)) if prices else np.nan
+
+
+def candidate_features(
+    docs: Sequence[Document],
+    user_location: Optional[Dict[str, float]] = None,
+    weather: Optional[Dict[str, Any]] = None,
+) -> np.ndarray:
+    """후보 문서들을 (n, len(FEATURES)) 원시 특징 행렬로 만듭니다. 값이 클수록 좋습니다."""
+    n = len(docs)
+    metas = [doc.metadata or {} for doc in docs]
+
+    # 여러 질의를 RRF로 합친 후보는 rrf_score가 관련도입니다 (similarity는 한 질의의 최고값일 뿐).
+    # 정규화가 후보 집합 안에서 이뤄지므로 모든 후보에 점수가 있을 때만 바꿔 씁니다.
+    relevance_key = "rrf_score" if metas and all(m.get("rrf_score") is not None for m in metas) else "similarity"
+    similarity = np.array([float(m.get(relevance_key) or 0.0) for m in metas])
+    reviews = np.log1p(np.array([float(m.get("naver_review_count") or 0) for m in metas]))
+
+    distance = np.full(n, np.nan)
+    if user_location:
+        lats = np.array([float(m.get("latitude") or np.nan) for m in metas])
+        lons = np.array([float(m.get("longitude") or np.nan) for m in metas])
+        distance = -haversine_m(user_location["latitude"], user_location["longitude"], lats, lons) / 1000.0
+
+    keywords = [kw for cond in weather_conditions(weather) for kw in WEATHER_TAG_KEYWORDS[cond]]
+    tags = [str(m.get("weather_tags") or "") for m in metas]
+    weather_match = np.array([sum(kw in tag for kw in keywords) for tag in tags], dtype=np.float64)
+
+    low, high = PRICE_BAND
+    prices = np.array([_median_price(doc) for doc in docs])
+    # 선호 가격대 안이면 0, 벗어난 만큼 (밴드 폭 단위로) 감점
+    price_fit = -np.maximum(np.maximum(low - prices, prices - high), 0.0) / max(high - low, 1.0)
+
+    return np.column_stack([similarity, reviews, distance, weather_match, price_fit])
+
+
+def normalize_features(features: np.ndarray) -> np.ndarray:
+    """후보 집합 안에서 열마다 0~1로 맞춥니다. 결측값은 열 평균, 상수 열은 0이 됩니다."""
+    features = np.asarray(features, dtype=np.float64)
+    if features.size == 0:
+        return features
+    missing = np.isnan(features)
+    counts = np.maximum((~missing).sum(axis=0), 1)
+    col_mean = np.where(missing, 0.0, features).sum(axis=0) / counts
+    filled = np.where(missing, col_mean, features)
+    low = filled.min(axis=0)
+    span = filled.max(axis=0) - low
+    return np.divide(filled - low, span, out=np.zeros_like(filled), where=span > 0)
+
+
+def rerank_documents(
+    docs: Sequence[Document],
+    user_location: Optional[Dict[str, float]] = None,
+    weather: Optional[Dict[str, Any]] = None,
+    top_n: int = RERANK_TOP_N,
+    weights: Optional[np.ndarray] = None,
+    mmr_lambda: Optional[float] = None,
+) -> List[Document]:
+    """
+    후보 전체를 한 번의 행렬 곱으로 점수화해 상위 top_n개를 반환합니다.
+    MMR이 켜져 있으면 (mmr_lambda < 1) 점수를 관련도로 삼아 후보 벡터/카테고리/장소 유형이
+    이미 고른 곳과 겹치는 후보를 덜 뽑습니다 (같은 건물의 국밥집 네 곳 대신 고를 거리가 생깁니다).
+    """
+    # 검색기가 MMR용으로 실어 보낸 벡터는 여기서 꺼내고, 이후 단계(state, 화면)로는 넘기지 않습니다.
+    vectors = [(doc.metadata or {}).pop(VECTOR_KEY, None) for doc in docs]
+    if not docs:
+        return []
+    weights = load_weights() if weights is None else np.asarray(weights, dtype=np.float64)
+    features = normalize_features(candidate_features(docs, user_location, weather))
+    scores = features @ weights
+    if RERANK_FEATURE_LOG:
+        log_features(docs, features, RERANK_FEATURE_LOG)
+
+    top_n = min(top_n, len(docs))
+    mmr_lambda = MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+    if mmr_lambda < 1.0:
+        block = np.stack(vectors) if all(v is not None for v in vectors) else None
+        metas = [doc.metadata or {} for doc in docs]
+        groups = [[m.get(field) for m in metas] for field in MMR_FIELDS]
+        top = mmr_select(scores, top_n, block, groups, lambda_mult=mmr_lambda, normalized=True)
+    else:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+    return [docs[i] for i in top.tolist()]
+
+
+def log_features(docs: Sequence[Document], features: np.ndarray, path: str) -> None:
+    """질의 1회분의 정규화된 후보 특징을 JSONL 한 줄로 추가합니다 (label은 나중에 채움)."""
+    record = {
+        "restaurant_ids": [(doc.metadata or {}).get("restaurant_id") for doc in docs],
+        "features": np.round(features, 6).tolist(),
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def fit_weights(features: np.ndarray, labels: np.ndarray, l2: float = 1.0) -> np.ndarray:
+    """
+    정답 라벨(선택=1, 미선택=0)로 ridge 회귀 가중치를 닫힌 해로 구합니다.
+    features는 질의별로 normalize_features를 거친 행렬을 이어 붙인 것입니다.
+    """
+    X = np.asarray(features, dtype=np.float64)
+    y = np.asarray(labels, dtype=np.float64)
+    gram = X.T @ X + l2 * np.eye(X.shape[1])
+    return np.linalg.solve(gram, X.T @ y)
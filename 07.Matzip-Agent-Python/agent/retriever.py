@@ -1,35 +1,314 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 from dotenv import load_dotenv
+from langchain_core.documents import Document
 from langchain_pinecone import PineconeVectorStore
 from langchain_upstage import UpstageEmbeddings
 from pinecone import Pinecone
 
+from .catalog import get_geo_index, get_price_table, representative_ids
+from .failover import Backend, CircuitBreaker, FailoverRetriever
+from .filters import MAX_FILTER_IDS, SearchFilter, is_unsatisfiable, merge_filters, to_metadata_filter
+from .fusion import reciprocal_rank_fusion
+from .index_alias import FileAlias, HotSwapStore, PineconeAlias, Target
+from .mmr import ATTACH_VECTORS, VECTOR_KEY
+
 load_dotenv()
 
 UPSTAGE_MODEL = os.getenv("UPSTAGE_EMBEDDING_MODEL", "solar-embedding-1-large")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-if not PINECONE_API_KEY:
-    raise ValueError("PINECONE_API_KEY가 .env 파일에 설정되지 않았습니다")
-
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "jamsil-restaurants-upstage")
 PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "public")
+# 지정하면 인덱스 조회 없이 이 data-plane 주소로 바로 붙습니다 (예: 로컬 가짜 Pinecone 서버).
+PINECONE_INDEX_HOST = os.getenv("PINECONE_INDEX_HOST")
+# 재정렬(+MMR) 단계가 고를 후보 수 (LLM에는 상위 몇 개만 전달됩니다)
+RETRIEVER_FETCH_K = int(os.getenv("RETRIEVER_FETCH_K", "50"))
+
+# Pinecone이 느리거나 죽었을 때 대신 응답할 로컬 스냅샷
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "./local_index")
+# float32가 가장 빠릅니다 (numpy에는 정수 BLAS가 없어 int8은 질의마다 코드를 float32로 바꾸느라 ~3배 느림).
+# int8은 메모리(page cache)가 빠듯할 때, binary는 재현율을 조금 내주고 더 빠르게 찾고 싶을 때 고릅니다.
+LOCAL_INDEX_MODE = os.getenv("LOCAL_INDEX_MODE", "float32")
+# 1이면 로드할 때 artifact 파일의 sha256을 manifest와 대조합니다 (배포 직후 한 번 확인용).
+LOCAL_INDEX_VERIFY = os.getenv("LOCAL_INDEX_VERIFY", "0") == "1"
+LOCAL_CHROMA_PATH = os.getenv("LOCAL_CHROMA_PATH", "./chroma_db_upstage")
+LOCAL_CHROMA_COLLECTION = os.getenv("LOCAL_CHROMA_COLLECTION", "jamsil_restaurants_upstage")
+RETRIEVER_SLO_MS = float(os.getenv("RETRIEVER_SLO_MS", "3000"))
+RETRIEVER_HEDGE_MS = float(os.getenv("RETRIEVER_HEDGE_MS", "800"))
+MULTI_QUERY_MAX_WORKERS = int(os.getenv("MULTI_QUERY_MAX_WORKERS", "4"))
+# pinecone: Pinecone 우선 + 로컬 스냅샷 failover, local: 배포된 로컬 artifact만 사용 (벡터 DB 네트워크 없음)
+RETRIEVER_BACKEND = os.getenv("RETRIEVER_BACKEND", "pinecone")
+# 인덱스 "현재 버전" 포인터를 다시 확인하는 주기 (초, 0이면 확인하지 않음)
+INDEX_ALIAS_POLL_S = float(os.getenv("INDEX_ALIAS_POLL_S", "30"))
 
 # UpstageEmbeddings requires an explicit model name; missing model raises a validation error.
 embeddings = UpstageEmbeddings(model=UPSTAGE_MODEL)
 
-pc = Pinecone(api_key=PINECONE_API_KEY)
-if PINECONE_INDEX_NAME not in pc.list_indexes().names():
-    raise ValueError(
-        f"Pinecone 인덱스 '{PINECONE_INDEX_NAME}'가 없습니다. "
-        "임베딩 스크립트를 먼저 실행해 주세요."
+
+@lru_cache(maxsize=1)
+def get_pinecone_index():
+    """
+    Pinecone 인덱스에 처음 사용할 때 연결합니다.
+    연결 실패는 import 시점이 아니라 검색 시점의 백엔드 오류가 되어 로컬 스냅샷으로 넘어갑니다.
+    """
+    if not PINECONE_API_KEY:
+        raise ValueError("PINECONE_API_KEY가 .env 파일에 설정되지 않았습니다")
+
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    if PINECONE_INDEX_HOST:
+        return pc.Index(host=PINECONE_INDEX_HOST)
+    if PINECONE_INDEX_NAME not in pc.list_indexes().names():
+        raise ValueError(
+            f"Pinecone 인덱스 '{PINECONE_INDEX_NAME}'가 없습니다. "
+            "임베딩 스크립트를 먼저 실행해 주세요."
+        )
+    return pc.Index(PINECONE_INDEX_NAME)
+
+
+def _open_pinecone(target: Optional[Target]) -> PineconeVectorStore:
+    # 포인터가 없으면 버전 관리 이전처럼 PINECONE_NAMESPACE를 그대로 씁니다.
+    namespace = (target or {}).get("namespace", PINECONE_NAMESPACE)
+    print(f"📦 Pinecone 네임스페이스: {namespace}")
+    return PineconeVectorStore(index=get_pinecone_index(), embedding=embeddings, namespace=namespace)
+
+
+def _read_local_target() -> Target:
+    root = LOCAL_INDEX_PATH if os.path.exists(LOCAL_INDEX_PATH) else LOCAL_CHROMA_PATH
+    return {"root": root, **(FileAlias(root).read() or {})}
+
+
+def _open_local(target: Target):
+    """내보낸 로컬 벡터 인덱스가 있으면 그것을, 없으면 Chroma 스냅샷을 엽니다 (버전 루트면 현재 버전)."""
+    root = target["root"]
+    directory = os.path.join(root, target["directory"]) if target.get("directory") else root
+    if root == LOCAL_INDEX_PATH:
+        from .vector_index import LocalVectorIndex
+
+        print(f"📦 로컬 벡터 인덱스 로드: {directory} ({LOCAL_INDEX_MODE})")
+        return LocalVectorIndex(
+            directory,
+            mode=LOCAL_INDEX_MODE,
+            embedding=embeddings,
+            expected_model=UPSTAGE_MODEL,
+            verify=LOCAL_INDEX_VERIFY,
+        )
+
+    # Chroma는 빈 디렉터리를 열면 새 DB를 만들어 버리므로, 스냅샷 파일이 있는지 먼저 확인합니다.
+    if not os.path.exists(os.path.join(directory, "chroma.sqlite3")):
+        raise FileNotFoundError(f"로컬 스냅샷이 없습니다: {LOCAL_INDEX_PATH}, {LOCAL_CHROMA_PATH}")
+    from langchain_chroma import Chroma
+
+    print(f"📦 Chroma 스냅샷 로드: {directory}")
+    return Chroma(
+        collection_name=LOCAL_CHROMA_COLLECTION,
+        embedding_function=embeddings,
+        persist_directory=directory,
     )
 
-vectorstore = PineconeVectorStore.from_existing_index(
-    index_name=PINECONE_INDEX_NAME,
-    embedding=embeddings,
-    namespace=PINECONE_NAMESPACE,
+
+# 재색인은 새 버전(네임스페이스/디렉터리)에 쓰고 "현재" 포인터만 바꿉니다.
+# 실행 중인 앱은 포인터를 주기적으로 확인해 재시작 없이 새 버전으로 갈아탑니다.
+pinecone_store = HotSwapStore(
+    "pinecone",
+    lambda: PineconeAlias(get_pinecone_index(), PINECONE_NAMESPACE).read(),
+    _open_pinecone,
+    poll_interval=INDEX_ALIAS_POLL_S,
 )
+local_store = HotSwapStore("local", _read_local_target, _open_local, poll_interval=INDEX_ALIAS_POLL_S)
+
+
+def get_vectorstore() -> PineconeVectorStore:
+    return pinecone_store.get()
+
+
+def get_local_store():
+    return local_store.get()
+
+
+def _search_pinecone(
+    vector: Sequence[float], k: int, search_filter: Optional[SearchFilter]
+) -> List[Tuple[Document, float]]:
+    store = get_vectorstore()
+    if ATTACH_VECTORS:
+        return _query_pinecone_with_vectors(store, vector, k, search_filter)
+    return store.similarity_search_by_vector_with_score(
+        list(vector), k=k, filter=to_metadata_filter(search_filter)
+    )
+
+
+def _query_pinecone_with_vectors(
+    store: PineconeVectorStore, vector: Sequence[float], k: int, search_filter: Optional[SearchFilter]
+) -> List[Tuple[Document, float]]:
+    """
+    similarity_search_by_vector_with_score와 같지만 후보 벡터 값도 받아 metadata[VECTOR_KEY]에 담습니다.
+    재정렬 단계의 MMR이 후보끼리의 유사도를 계산하는 데 씁니다.
+    """
+    response = store.index.query(
+        vector=list(vector),
+        top_k=k,
+        include_metadata=True,
+        include_values=True,
+        namespace=store._namespace,
+        filter=to_metadata_filter(search_filter),
+    )
+    results = []
+    for match in response["matches"]:
+        metadata = dict(match.get("metadata") or {})
+        if "text" not in metadata:
+            continue
+        text = metadata.pop("text")
+        values = np.asarray(match.get("values") or [], dtype=np.float32)
+        if values.size:
+            metadata[VECTOR_KEY] = values / max(float(np.linalg.norm(values)), 1e-12)
+        results.append((Document(id=match.get("id"), page_content=text, metadata=metadata), match["score"]))
+    return results
+
+
+def _search_local(
+    vector: Sequence[float], k: int, search_filter: Optional[SearchFilter]
+) -> List[Tuple[Document, float]]:
+    store = get_local_store()
+    if hasattr(store, "search_vector"):
+        return store.similarity_search_by_vector_with_score(
+            vector, k=k, filter=search_filter, vector_key=VECTOR_KEY if ATTACH_VECTORS else None
+        )
+    # Chroma의 이 메서드는 거리(낮을수록 가까움)를 돌려주므로, 컬렉션 거리 함수(l2/cosine/ip)에 맞는
+    # 관련도(높을수록 가까움)로 바꿔 Pinecone/로컬 인덱스와 같은 방향으로 맞춥니다.
+    relevance = store._select_relevance_score_fn()
+    results = store.similarity_search_by_vector_with_relevance_scores(
+        list(vector), k=k, filter=to_metadata_filter(search_filter)
+    )
+    return [(doc, relevance(distance)) for doc, distance in results]
+
+
+# 질의 변형별 검색을 동시에 보내는 풀 (failover 검색기 내부 풀과 분리해 교착을 막습니다)
+_query_executor = ThreadPoolExecutor(max_workers=MULTI_QUERY_MAX_WORKERS, thread_name_prefix="multi-query")
+
+if RETRIEVER_BACKEND == "local":
+    # artifact는 memory-map으로 열리므로 시작할 때 바로 열어 두고 Pinecone에는 붙지 않습니다.
+    get_local_store()
+    failover_retriever = FailoverRetriever(
+        primary=Backend("local", _search_local),
+        slo_ms=RETRIEVER_SLO_MS,
+        hedge_ms=RETRIEVER_HEDGE_MS,
+    )
+else:
+    failover_retriever = FailoverRetriever(
+        primary=Backend("pinecone", _search_pinecone),
+        # 로컬 스냅샷이 없으면 매번 실패하므로 더 오래 건너뜁니다.
+        secondary=Backend("local", _search_local, CircuitBreaker(failure_threshold=1, reset_timeout=300)),
+        slo_ms=RETRIEVER_SLO_MS,
+        hedge_ms=RETRIEVER_HEDGE_MS,
+    )
+
+
+def search_restaurants(
+    query: str,
+    search_filter: Optional[SearchFilter] = None,
+    k: int = RETRIEVER_FETCH_K,
+) -> List[Document]:
+    """
+    필터를 벡터 스토어 쿼리에 그대로 내려 보내 top-k 이전에 조건을 적용합니다.
+    질의는 한 번만 임베딩하고 Pinecone ↔ 로컬 스냅샷 failover 검색기에 넘깁니다.
+    """
+    search_filter = resolve_price_filter(resolve_geo_filter(search_filter, k))
+    if is_unsatisfiable(search_filter):
+        # 예: 도보 반경 안의 음식점과 가격 조건에 맞는 음식점이 겹치지 않음
+        return []
+    vector = embeddings.embed_query(query)
+    results, _backend = failover_retriever.search(vector, k, search_filter)
+    # 재정렬 단계에서 쓰도록 유사도를 metadata에 남깁니다.
+    for doc, score in results:
+        doc.metadata["similarity"] = float(score)
+    return [doc for doc, _score in results]
+
+
+def embed_queries(queries: Sequence[str]) -> List[List[float]]:
+    """질의 여러 개를 질의 풀에서 동시에 임베딩합니다 (순서 유지)."""
+    if len(queries) == 1:
+        return [embeddings.embed_query(queries[0])]
+    # embed_documents는 문서용(passage) 모델을 쓰는 임베딩이 있으므로, 공개 API인 embed_query를 질의마다 호출합니다.
+    return list(_query_executor.map(embeddings.embed_query, queries))
+
+
+def search_restaurants_multi(
+    queries: Sequence[str],
+    search_filter: Optional[SearchFilter] = None,
+    k: int = RETRIEVER_FETCH_K,
+) -> List[Document]:
+    """
+    여러 질의 변형을 한 번에 임베딩하고 동시에 검색한 뒤,
+    restaurant_id로 중복을 제거해 RRF로 합친 상위 k개를 반환합니다.
+    """
+    queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if len(queries) <= 1:
+        return search_restaurants(queries[0] if queries else "", search_filter, k)
+
+    search_filter = resolve_price_filter(resolve_geo_filter(search_filter, k))
+    if is_unsatisfiable(search_filter):
+        return []
+    vectors = embed_queries(queries)
+    futures = [
+        _query_executor.submit(failover_retriever.search, vector, k, search_filter)
+        for vector in vectors
+    ]
+
+    result_lists = []
+    for future in futures:
+        results, _backend = future.result()
+        for doc, score in results:
+            doc.metadata["similarity"] = float(score)
+        result_lists.append([doc for doc, _score in results])
+
+    print(f"---질의 {len(queries)}개 검색 후 RRF 병합---")
+    return reciprocal_rank_fusion(result_lists)[:k]
+
+
+def resolve_geo_filter(search_filter: Optional[SearchFilter], k: int = RETRIEVER_FETCH_K) -> Optional[SearchFilter]:
+    """
+    near(도보 반경) 조건을 격자 인덱스로 restaurant_id 목록으로 바꿉니다.
+    반경 안에 k개가 안 되면 가장 가까운 k곳으로 대신해 검색 결과가 비지 않게 합니다.
+    카탈로그를 열 수 없으면 near만 빼고 나머지 조건을 그대로 돌려줍니다.
+    """
+    if not search_filter or "near" not in search_filter:
+        return search_filter
+
+    resolved = {key: value for key, value in search_filter.items() if key != "near"}
+    near = search_filter["near"]
+    try:
+        geo_index = get_geo_index()
+    except (FileNotFoundError, ValueError) as exc:
+        # 카탈로그가 없으면 반경 조건 없이 검색합니다 (거리는 재정렬의 거리 특성이 반영).
+        print(f"⚠️  도보 반경 조건을 건너뜁니다: {exc}")
+        return resolved or None
+    ids, _dist = geo_index.within(near["latitude"], near["longitude"], near["radius_m"])
+    if ids.shape[0] < k:
+        ids, _dist = geo_index.nearest(near["latitude"], near["longitude"], k)
+
+    # Pinecone의 $in 은 값 10,000개까지만 허용하므로 가까운 순으로 자릅니다.
+    return merge_filters(resolved, {"restaurant_ids": representative_ids(ids)[:MAX_FILTER_IDS]})
+
+
+def resolve_price_filter(search_filter: Optional[SearchFilter]) -> Optional[SearchFilter]:
+    """
+    price_range 조건을 가격 사이드 테이블로 restaurant_id 목록으로 바꿉니다.
+    메뉴별 가격 배열을 보므로 "메뉴 하나라도 범위 안"을 정확히 거릅니다.
+    테이블이 없거나, 결과가 비었거나, $in 한도를 넘으면 min/max_price 메타데이터 조건으로 남겨 둡니다.
+    """
+    if not search_filter or "price_range" not in search_filter:
+        return search_filter
+    try:
+        table = get_price_table()
+    except FileNotFoundError:
+        return search_filter
 
-# 저장된 벡터 데이터베이스를 기반으로 검색기(retriever)를 만듭니다.
-retriever = vectorstore.as_retriever()
+    # 가격 테이블은 MySQL 전체로 만들므로, 중복 제거로 빠진 음식점은 대표 id로 바꿉니다.
+    ids = representative_ids(table.matching_ids(search_filter["price_range"]))
+    if not ids or len(ids) > MAX_FILTER_IDS:
+        return search_filter
+    resolved = {key: value for key, value in search_filter.items() if key != "price_range"}
+    return merge_filters(resolved, {"restaurant_ids": ids})
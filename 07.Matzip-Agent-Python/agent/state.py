@@ -1,9 +1,19 @@
-from typing import List, Annotated, TypedDict
+from typing import Any, Dict, List, Annotated, Optional, TypedDict
+from langchain_core.documents import Document
 from langchain_core.messages import BaseMessage
 import operator
 
+from .filters import SearchFilter
+
 # Annotated를 사용하여 상태의 각 필드에 대한 리듀서 함수를 정의합니다.
 # operator.add는 메시지를 리스트에 추가하는 역할을 합니다.
 # 이는 상태가 업데이트될 때 메시지가 누적되도록 합니다.
 class GraphState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
+    # 검색 도구가 벡터 스토어 쿼리에 그대로 적용하는 구조화된 필터 (예: 실내 장소만)
+    search_filter: Optional[SearchFilter]
+    # 재정렬 점수에 쓰는 사용자 위치와 현재 날씨
+    user_location: Optional[Dict[str, float]]
+    weather: Optional[Dict[str, Any]]
+    # rerank 노드가 고른 상위 문서 (grade_documents/generate가 사용)
+    documents: List[Document]
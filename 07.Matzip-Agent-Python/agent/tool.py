@@ -1,16 +1,57 @@
-from langchain_classic.tools.retriever import create_retriever_tool
-from langgraph.prebuilt import ToolNode
-from .retriever import retriever
+from typing import Annotated, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState, ToolNode
+
+from .filters import merge_filters
+from .prices import PriceRange, parse_price_range
+from .retriever import search_restaurants, search_restaurants_multi
+
 
 # 직장인들의 점심 메뉴 관련 정보를 검색합니다.
-tool = create_retriever_tool(
-    retriever,
-    "retrieve_restaurants",
-    "잠실 주변의 점심 메뉴를 검색하고 정보를 반환합니다.",
-)
+# 앱이 상태에 넣어 둔 search_filter(예: 실내 장소만)는 LLM을 거치지 않고 검색 쿼리에 바로 적용됩니다.
+@tool("retrieve_restaurants", response_format="content_and_artifact", parse_docstring=True)
+def retrieve_restaurants(
+    query: str,
+    state: Annotated[dict, InjectedState],
+    alternative_queries: Optional[List[str]] = None,
+    category: Optional[str] = None,
+    min_review_count: Optional[int] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+) -> Tuple[str, List[Document]]:
+    """잠실 주변의 점심 메뉴를 검색하고 정보를 반환합니다.
+
+    Args:
+        query: 검색할 메뉴, 음식 종류 또는 음식점 특징
+        alternative_queries: 같은 의도를 다른 표현(메뉴명, 음식 종류, 상황)으로 바꾼 검색어 2~4개. 함께 검색해 결과를 합칩니다.
+        category: 정확한 음식점 카테고리명을 알고 있을 때만 지정
+        min_review_count: 최소 네이버 리뷰수 (리뷰 많은 곳을 원할 때)
+        min_price: 메뉴 최저 가격(원). 사용자가 가격 하한을 말했을 때만 지정
+        max_price: 메뉴 최고 가격(원). "만원 이하"처럼 예산을 말했을 때 지정 (예: 10000)
+    """
+    price_range: PriceRange = {key: value for key, value in (("min_price", min_price), ("max_price", max_price)) if value}
+    # LLM이 가격 인자를 채우지 않았어도 질의에 금액이 있으면 직접 읽어 적용합니다.
+    price_range = price_range or parse_price_range(query) or {}
+    search_filter = merge_filters(
+        state.get("search_filter"),
+        {"category": category, "min_review_count": min_review_count, "price_range": price_range or None},
+    )
+    if alternative_queries:
+        docs = search_restaurants_multi([query, *alternative_queries], search_filter)
+    else:
+        docs = search_restaurants(query, search_filter)
+    # 후보 전체는 artifact로만 넘기고, LLM 대화에는 후보 이름 목록만 남깁니다.
+    # 본문은 rerank 노드가 고른 상위 문서만 grade_documents/generate에 전달됩니다.
+    summary = "\n".join(
+        f"- {doc.metadata.get('name', '')} ({doc.metadata.get('category', '')})" for doc in docs
+    )
+    return f"후보 음식점 {len(docs)}곳\n{summary}", docs
+
 
 # 사용 가능한 모든 도구를 배열로 내보냅니다.
-tools = [tool]
+tools = [retrieve_restaurants]
 
 # 도구들을 실행할 수 있는 노드를 생성합니다.
 # 이 노드는 그래프 상태를 관리하며 도구 호출을 처리합니다.
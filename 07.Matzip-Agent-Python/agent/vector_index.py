@@ -0,0 +1,360 @@
+import hashlib
+import json
+import os
+import time
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .filters import SearchFilter
+
+# 디렉터리 하나에 아래 파일들을 함께 저장합니다.
+VECTORS_F32 = "vectors.f32.npy"  # 정규화된 float32 원본 (재점수화용, mmap으로 읽음)
+VECTORS_I8 = "vectors.i8.npy"  # 벡터별 스케일 int8 양자화 코드
+SCALES_I8 = "scales.f32.npy"
+VECTORS_BIN = "vectors.bin.npy"  # 부호 비트를 8개씩 묶은 1-bit 코드
+RECORDS = "records.jsonl"  # page_content + metadata (pyarrow가 없을 때)
+METADATA_PARQUET = "metadata.parquet"  # page_content + metadata + 필터 컬럼 (pyarrow가 있을 때)
+INDEX_INFO = "index.json"  # 모델 id, 차원, 파일별 sha256 (artifact manifest)
+
+FORMAT_VERSION = 2
+# Parquet에 별도 컬럼으로 두어 metadata JSON을 풀지 않고 필터 마스크를 만드는 필드
+FILTER_COLUMNS = ("restaurant_id", "category", "location_type", "naver_review_count", "min_price", "max_price")
+
+MODES = ("float32", "int8", "binary")
+_BLOCK_ROWS = 4096
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_metadata_table(directory: str, records: Sequence[Dict[str, Any]]) -> str:
+    """pyarrow가 있으면 Parquet 테이블로, 없으면 JSONL로 레코드를 저장하고 파일명을 반환합니다."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        with open(os.path.join(directory, RECORDS), "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return RECORDS
+
+    metas = [record.get("metadata") or {} for record in records]
+    table = pa.table(
+        {
+            "page_content": [record.get("page_content", "") for record in records],
+            "metadata": [json.dumps(meta, ensure_ascii=False) for meta in metas],
+            "restaurant_id": pa.array([meta.get("restaurant_id") for meta in metas], type=pa.int64()),
+            "category": [meta.get("category") or "" for meta in metas],
+            "location_type": [meta.get("location_type") or "" for meta in metas],
+            "naver_review_count": pa.array([meta.get("naver_review_count") or 0 for meta in metas], type=pa.int64()),
+            # 메뉴 가격이 없으면 -1
+            "min_price": pa.array([meta.get("min_price", -1) for meta in metas], type=pa.int64()),
+            "max_price": pa.array([meta.get("max_price", -1) for meta in metas], type=pa.int64()),
+        }
+    )
+    # 압축하지 않아야 읽을 때 memory-map한 페이지를 그대로 씁니다.
+    pq.write_table(table, os.path.join(directory, METADATA_PARQUET), compression="none")
+    return METADATA_PARQUET
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """벡터마다 max|x|를 127로 맞추는 대칭 스칼라 양자화."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.maximum(scales, 1e-12).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """부호만 남긴 1-bit 코드 (차원 8개당 1바이트)."""
+    return np.packbits(vectors > 0, axis=1)
+
+
+class LocalVectorIndex:
+    """
+    네트워크 없이 쓰는 로컬 벡터 인덱스.
+
+    - float32: 정규화된 원본으로 전수 내적
+    - int8: 양자화 코드로 후보(shortlist)를 고른 뒤 float32로 재점수화
+      (메모리는 1/4이지만 블록마다 float32로 바꿔 곱하므로 float32 전수 내적보다 느립니다)
+    - binary: Hamming 거리로 후보를 고른 뒤 float32로 재점수화
+    재점수화용 float32 행렬은 memory-map으로 열어 후보 행만 디스크에서 읽습니다.
+
+    디렉터리는 CI에서 한 번 만들어 배포하는 읽기 전용 artifact입니다.
+    모든 배열과 Parquet 메타데이터를 memory-map으로 열기 때문에 로드가 즉시 끝나고,
+    같은 artifact를 여는 워커 프로세스들은 OS 페이지 캐시를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "float32",
+        embedding: Any = None,
+        rescore_multiplier: int = 10,
+        expected_model: Optional[str] = None,
+        verify: bool = False,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 모드: {mode} (가능: {', '.join(MODES)})")
+
+        self.directory = directory
+        self.mode = mode
+        self.embedding = embedding
+        self.rescore_multiplier = rescore_multiplier
+
+        with open(os.path.join(directory, INDEX_INFO), encoding="utf-8") as f:
+            self.info = json.load(f)
+        model = self.info.get("model")
+        if expected_model and model and model != expected_model:
+            raise ValueError(f"인덱스 모델({model})이 질의 임베딩 모델({expected_model})과 다릅니다")
+        if verify:
+            self.verify()
+
+        self.vectors = np.load(os.path.join(directory, VECTORS_F32), mmap_mode="r")
+        self.codes: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        if mode == "int8":
+            self.codes = np.load(os.path.join(directory, VECTORS_I8), mmap_mode="r")
+            self.scales = np.load(os.path.join(directory, SCALES_I8), mmap_mode="r")
+        elif mode == "binary":
+            self.codes = np.load(os.path.join(directory, VECTORS_BIN), mmap_mode="r")
+
+        self._table = None
+        if os.path.exists(os.path.join(directory, METADATA_PARQUET)):
+            import pyarrow.parquet as pq
+
+            self._table = pq.read_table(os.path.join(directory, METADATA_PARQUET), memory_map=True)
+        self._build_columns()
+
+    def verify(self) -> None:
+        """manifest에 기록된 크기와 sha256으로 artifact 파일이 손상되지 않았는지 확인합니다."""
+        for name, expected in (self.info.get("files") or {}).items():
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                raise ValueError(f"artifact 파일이 없습니다: {name}")
+            if os.path.getsize(path) != expected["bytes"] or file_sha256(path) != expected["sha256"]:
+                raise ValueError(f"artifact 체크섬이 맞지 않습니다: {name}")
+
+    @cached_property
+    def records(self) -> List[Dict[str, Any]]:
+        """page_content + metadata 목록. Parquet artifact는 처음 접근할 때 한 번만 풉니다."""
+        if self._table is None:
+            with open(os.path.join(self.directory, RECORDS), encoding="utf-8") as f:
+                return [json.loads(line) for line in f]
+        return [
+            {"page_content": content, "metadata": json.loads(meta)}
+            for content, meta in zip(
+                self._table.column("page_content").to_pylist(), self._table.column("metadata").to_pylist()
+            )
+        ]
+
+    def metadatas(self) -> List[Dict[str, Any]]:
+        """전체 metadata 목록. Parquet artifact는 page_content 열을 풀지 않고 metadata 열만 읽습니다."""
+        if self._table is None or "records" in self.__dict__:
+            return [record["metadata"] for record in self.records]
+        return [json.loads(meta) for meta in self._table.column("metadata").to_pylist()]
+
+    def record(self, idx: int) -> Dict[str, Any]:
+        """행 하나의 레코드. Parquet artifact는 전체 레코드를 풀지 않고 해당 행만 읽습니다."""
+        if self._table is None or "records" in self.__dict__:
+            return self.records[idx]
+        return {
+            "page_content": self._table.column("page_content")[idx].as_py(),
+            "metadata": json.loads(self._table.column("metadata")[idx].as_py()),
+        }
+
+    # ---------- 생성 ----------
+    @staticmethod
+    def build(
+        directory: str,
+        vectors: np.ndarray,
+        records: Sequence[Dict[str, Any]],
+        model: str = "",
+    ) -> Dict[str, Any]:
+        """
+        정규화된 float32 원본과 int8/binary 코드, 메타데이터 테이블을 저장하고
+        모델 id·차원·파일별 sha256을 담은 manifest(index.json)를 마지막에 씁니다.
+        """
+        vectors = _normalize(vectors)
+        if vectors.shape[0] != len(records):
+            raise ValueError("벡터 수와 레코드 수가 다릅니다")
+
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, VECTORS_F32), vectors)
+        codes, scales = quantize_int8(vectors)
+        np.save(os.path.join(directory, VECTORS_I8), codes)
+        np.save(os.path.join(directory, SCALES_I8), scales)
+        np.save(os.path.join(directory, VECTORS_BIN), quantize_binary(vectors))
+        metadata_file = _write_metadata_table(directory, records)
+
+        files = [VECTORS_F32, VECTORS_I8, SCALES_I8, VECTORS_BIN, metadata_file]
+        info = {
+            "format_version": FORMAT_VERSION,
+            "model": model,
+            "count": int(vectors.shape[0]),
+            "dimension": int(vectors.shape[1]),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "files": {
+                name: {
+                    "bytes": os.path.getsize(os.path.join(directory, name)),
+                    "sha256": file_sha256(os.path.join(directory, name)),
+                }
+                for name in files
+            },
+        }
+        with open(os.path.join(directory, INDEX_INFO), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+        return info
+
+    # ---------- 필터 ----------
+    def _build_columns(self) -> None:
+        if self._table is not None:
+            columns = {
+                name: self._table.column(name).to_numpy(zero_copy_only=False)
+                for name in FILTER_COLUMNS
+                if name in self._table.column_names
+            }
+            self._location_types = columns["location_type"].astype(object)
+            self._categories = columns["category"].astype(object)
+            self._review_counts = columns["naver_review_count"].astype(np.int64)
+            self._restaurant_ids = columns["restaurant_id"].astype(object)
+            # 가격 컬럼이 없던 이전 artifact는 가격 정보 없음(-1)으로 봅니다.
+            missing = np.full(len(self), -1, dtype=np.int64)
+            self._min_prices = columns.get("min_price", missing).astype(np.int64)
+            self._max_prices = columns.get("max_price", missing).astype(np.int64)
+            return
+        metas = [record.get("metadata") or {} for record in self.records]
+        self._min_prices = np.array([m.get("min_price", -1) for m in metas], dtype=np.int64)
+        self._max_prices = np.array([m.get("max_price", -1) for m in metas], dtype=np.int64)
+        self._location_types = np.array([m.get("location_type") or "" for m in metas], dtype=object)
+        self._categories = np.array([m.get("category") or "" for m in metas], dtype=object)
+        self._review_counts = np.array([m.get("naver_review_count") or 0 for m in metas], dtype=np.int64)
+        self._restaurant_ids = np.array([m.get("restaurant_id") for m in metas], dtype=object)
+
+    def filter_mask(self, search_filter: Optional[SearchFilter]) -> Optional[np.ndarray]:
+        """SearchFilter를 행 단위 bool 마스크로 바꿉니다. 조건이 없으면 None."""
+        if not search_filter:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        if "location_types" in search_filter:
+            mask &= np.isin(self._location_types, list(search_filter["location_types"]))
+        if search_filter.get("category"):
+            mask &= self._categories == search_filter["category"]
+        if "restaurant_ids" in search_filter:
+            mask &= np.isin(self._restaurant_ids, list(search_filter["restaurant_ids"]))
+        if search_filter.get("min_review_count"):
+            mask &= self._review_counts >= int(search_filter["min_review_count"])
+        price_range = search_filter.get("price_range") or {}
+        if "max_price" in price_range:
+            mask &= (self._min_prices >= 0) & (self._min_prices <= int(price_range["max_price"]))
+        if "min_price" in price_range:
+            mask &= self._max_prices >= int(price_range["min_price"])
+        return mask
+
+    # ---------- 검색 ----------
+    def _coarse_scores(self, query: np.ndarray) -> np.ndarray:
+        """모드별 1차 점수 (클수록 가까움)."""
+        if self.mode == "binary":
+            q_code = quantize_binary(query[None, :])[0]
+            hamming = np.bitwise_count(self.codes ^ q_code).sum(axis=1, dtype=np.int32)
+            return -hamming.astype(np.float32)
+
+        source = self.codes if self.mode == "int8" else self.vectors
+        scores = np.empty(source.shape[0], dtype=np.float32)
+        # 블록 단위로 float32 변환해 임시 메모리를 제한합니다.
+        for start in range(0, source.shape[0], _BLOCK_ROWS):
+            block = np.asarray(source[start:start + _BLOCK_ROWS], dtype=np.float32)
+            scores[start:start + block.shape[0]] = block @ query
+        if self.mode == "int8":
+            scores *= self.scales
+        return scores
+
+    def search_vector(
+        self,
+        query_vector: Sequence[float],
+        k: int = 4,
+        search_filter: Optional[SearchFilter] = None,
+    ) -> List[Tuple[int, float]]:
+        """질의 벡터로 (행 번호, 코사인 유사도) 상위 k개를 반환합니다. 필터는 top-k 이전에 적용됩니다."""
+        query = _normalize(np.asarray(query_vector, dtype=np.float32)[None, :])[0]
+        scores = self._coarse_scores(query)
+
+        mask = self.filter_mask(search_filter)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            available = int(mask.sum())
+        else:
+            available = scores.shape[0]
+        k = min(k, available)
+        if k <= 0:
+            return []
+
+        shortlist_size = k if self.mode == "float32" else min(k * self.rescore_multiplier, available)
+        shortlist = np.argpartition(-scores, shortlist_size - 1)[:shortlist_size]
+
+        if self.mode != "float32":
+            # 정렬된 행 번호로 읽어야 mmap 접근이 순차적이 됩니다.
+            shortlist = np.sort(shortlist)
+            scores_short = np.asarray(self.vectors[shortlist], dtype=np.float32) @ query
+        else:
+            scores_short = scores[shortlist]
+
+        order = np.argsort(-scores_short, kind="stable")[:k]
+        return [(int(shortlist[i]), float(scores_short[i])) for i in order]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[SearchFilter] = None,
+    ) -> List[Tuple[Document, float]]:
+        """VectorStore와 같은 모양의 API. 질의 임베딩에는 생성 시 받은 embedding을 씁니다."""
+        if self.embedding is None:
+            raise ValueError("질의 임베딩 모델이 설정되지 않았습니다")
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        filter: Optional[SearchFilter] = None,
+        vector_key: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """
+        이미 계산된 질의 벡터로 검색해 (Document, 유사도) 목록을 반환합니다.
+        vector_key를 주면 정규화된 float32 후보 벡터를 metadata[vector_key]에 함께 담습니다 (MMR용).
+        """
+        results = []
+        for idx, score in self.search_vector(embedding, k=k, search_filter=filter):
+            record = self.record(idx)
+            metadata = dict(record.get("metadata") or {})
+            if vector_key:
+                metadata[vector_key] = np.array(self.vectors[idx], dtype=np.float32)
+            results.append((Document(page_content=record.get("page_content", ""), metadata=metadata), score))
+        return results
+
+    def memory_bytes(self) -> int:
+        """검색 시 RAM에 상주하는 벡터 데이터 크기 (float32 모드는 전수 스캔이라 원본 전체)."""
+        if self.mode == "float32":
+            return int(self.vectors.nbytes)
+        size = int(self.codes.nbytes)
+        if self.scales is not None:
+            size += int(self.scales.nbytes)
+        return size
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
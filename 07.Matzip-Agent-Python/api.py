@@ -0,0 +1,519 @@
+"""
+Streamlit 없이 같은 LangGraph 그래프를 HTTP로 제공하는 ASGI 앱 (프레임워크 없이 ASGI 규약만 사용).
+
+    POST /recommend         {"question": ..., "search_filter"?, "location"?, "weather"?} → {"answer", "sources"}
+    GET  /recommend/stream  ?question=...&latitude=...&longitude=...  → server-sent events
+                            event: node  {"node", "elapsed_ms"}   노드 하나가 끝날 때마다
+                            event: token {"text"}                  답변 생성 토큰
+                            event: done  {"answer", "sources", "elapsed_ms"}
+                            event: error {"error", "status"}
+    GET  /healthz           프로세스가 살아 있으면 200
+    GET  /readyz            검색기 준비(warmup)가 끝났고 종료 중이 아니면 200, 아니면 503
+
+그래프는 동기 코드라 프로세스당 API_MAX_CONCURRENCY개의 작업 스레드에서 돌립니다.
+빈 자리를 API_QUEUE_TIMEOUT_S 안에 얻지 못하면 503(Retry-After), API_REQUEST_TIMEOUT_S를 넘기면 504를 돌려줍니다.
+시간이 초과돼도 실행 중인 그래프 스레드는 끝날 때까지 자리를 차지하므로 동시 실행 수는 한도를 넘지 않습니다.
+스트리밍은 클라이언트가 끊거나 시간이 초과되면 다음 노드/토큰에서 그래프 실행을 멈춥니다.
+
+예시:
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 2
+    curl -s localhost:8000/recommend -d '{"question": "잠실역 근처 국밥 맛집"}'
+    curl -N 'localhost:8000/recommend/stream?question=비 오는 날 실내 맛집'
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from dotenv import load_dotenv
+
+from agent.filters import MAX_FILTER_IDS
+
+load_dotenv()
+
+# ==================== 설정 ====================
+API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "4"))  # 프로세스당 동시에 도는 그래프 수
+API_QUEUE_TIMEOUT_S = float(os.getenv("API_QUEUE_TIMEOUT_S", "5"))  # 빈 자리를 기다리는 최대 시간
+API_REQUEST_TIMEOUT_S = float(os.getenv("API_REQUEST_TIMEOUT_S", "60"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(64 * 1024)))
+API_MAX_QUESTION_CHARS = int(os.getenv("API_MAX_QUESTION_CHARS", "1000"))
+API_KEEPALIVE_S = float(os.getenv("API_KEEPALIVE_S", "15"))  # 스트림이 조용할 때 보낼 주석 간격 (프록시 유휴 끊김 방지)
+API_WARMUP_RETRY_S = float(os.getenv("API_WARMUP_RETRY_S", "30"))
+API_WARMUP_QUERY = os.getenv("API_WARMUP_QUERY", "")  # 설정하면 준비 단계에서 한 번 검색해 임베딩/검색 연결까지 데움
+# 토큰을 스트리밍할 노드 (나머지 노드의 LLM 호출은 관련성 판단/질의 재작성이라 내보내지 않음)
+STREAM_TOKEN_NODES = ("generate",)
+
+API_MAX_FILTER_VALUES = int(os.getenv("API_MAX_FILTER_VALUES", "50"))  # location_types 최대 개수
+API_MAX_RADIUS_M = float(os.getenv("API_MAX_RADIUS_M", "5000"))  # near.radius_m 상한
+
+SEARCH_FILTER_KEYS = ("location_types", "category", "min_review_count", "near", "restaurant_ids", "price_range")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[List[Tuple[str, str]]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or []
+
+
+# ==================== 준비 상태 ====================
+class Readiness:
+    """
+    검색기 준비 상태. 시작할 때 백그라운드 스레드에서 그래프를 불러오고 검색 저장소를 연 뒤 ready가 됩니다.
+    실패하면 API_WARMUP_RETRY_S마다 다시 시도하며, 그동안 /readyz와 추천 요청은 503입니다.
+    """
+
+    def __init__(self) -> None:
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.backend: Optional[str] = None
+        self.warmup_ms: Optional[float] = None
+        self.draining = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready" and not self.draining
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="api-warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self.draining:
+            self.state = "warming"
+            start = time.perf_counter()
+            try:
+                self.backend = warm_up()
+            except Exception as exc:
+                self.state, self.error = "error", str(exc)
+                print(f"⚠️  검색기 준비 실패 ({API_WARMUP_RETRY_S:.0f}초 뒤 재시도): {exc}")
+                time.sleep(API_WARMUP_RETRY_S)
+                continue
+            self.warmup_ms = (time.perf_counter() - start) * 1000
+            self.state, self.error = "ready", None
+            print(f"✅ 검색기 준비 완료: {self.backend} ({self.warmup_ms:.0f}ms)")
+            return
+
+
+def warm_up() -> str:
+    """그래프/검색기 모듈을 불러오고 검색 저장소를 엽니다. 연 백엔드 이름을 반환합니다."""
+    import main  # noqa: F401  (그래프 컴파일, 임베딩 클라이언트 생성)
+    from agent import retriever
+
+    if retriever.RETRIEVER_BACKEND == "local":
+        retriever.get_local_store()
+        backend = "local"
+    else:
+        try:
+            retriever.get_vectorstore()
+            backend = "pinecone"
+        except Exception as exc:
+            # Pinecone이 안 되면 검색기가 로컬 스냅샷으로 넘어가므로 그것만 열려도 응답할 수 있습니다.
+            print(f"⚠️  Pinecone 연결 실패, 로컬 스냅샷 확인: {exc}")
+            retriever.get_local_store()
+            backend = "local (failover)"
+    if API_WARMUP_QUERY:
+        retriever.search_restaurants(API_WARMUP_QUERY, k=1)
+    return backend
+
+
+# ==================== 동시 실행 제한 ====================
+class GraphRunner:
+    """그래프 실행용 스레드 풀과 빈 자리 수. 자리는 스레드가 실제로 끝날 때 반납합니다."""
+
+    def __init__(
+        self,
+        max_concurrency: int = API_MAX_CONCURRENCY,
+        queue_timeout_s: float = API_QUEUE_TIMEOUT_S,
+        request_timeout_s: float = API_REQUEST_TIMEOUT_S,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.queue_timeout_s = queue_timeout_s
+        self.request_timeout_s = request_timeout_s
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="graph")
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def submit(self, fn, *args) -> "asyncio.Future":
+        """빈 자리를 얻어 fn을 작업 스레드에서 시작합니다. 자리가 없으면 HTTPError(503)."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPError(503, "요청이 많아 처리할 수 없습니다", [("retry-after", "5")])
+        self.in_flight += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    async def run(self, fn, *args) -> Any:
+        future = await self.submit(fn, *args)
+        try:
+            # shield: 시간 초과로 future를 취소하면 스레드가 도는 중에 자리가 반납되므로 막습니다.
+            return await asyncio.wait_for(asyncio.shield(future), self.request_timeout_s)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPError(504, f"{self.request_timeout_s:g}초 안에 답변을 만들지 못했습니다")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "capacity": self.max_concurrency,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+readiness = Readiness()
+runner = GraphRunner()
+
+
+# ==================== 요청 해석 ====================
+def _parse_location(raw: Any) -> Optional[Dict[str, float]]:
+    if raw is None:
+        return None
+    try:
+        location = {"latitude": float(raw["latitude"]), "longitude": float(raw["longitude"])}
+    except (KeyError, TypeError, ValueError):
+        raise HTTPError(400, "location은 {latitude, longitude} 숫자여야 합니다")
+    if not (-90 <= location["latitude"] <= 90 and -180 <= location["longitude"] <= 180):
+        raise HTTPError(400, "location 좌표 범위가 잘못되었습니다")
+    return location
+
+
+def _int(value: Any, name: str, minimum: int = 0) -> int:
+    # bool은 int의 하위 타입이라 따로 막습니다.
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise HTTPError(400, f"{name}은 {minimum} 이상의 정수여야 합니다")
+    return value
+
+
+def _list(value: Any, name: str, max_items: int) -> list:
+    if not isinstance(value, list):
+        raise HTTPError(400, f"{name}은 목록이어야 합니다")
+    if len(value) > max_items:
+        raise HTTPError(400, f"{name}은 {max_items}개 이하여야 합니다")
+    return value
+
+
+def parse_search_filter(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """search_filter의 키와 값 형식/범위를 검사해 agent.filters.SearchFilter로 만듭니다."""
+    unknown = set(raw) - set(SEARCH_FILTER_KEYS)
+    if unknown:
+        raise HTTPError(400, f"알 수 없는 search_filter 키: {', '.join(sorted(unknown))}")
+
+    search_filter: Dict[str, Any] = {}
+    if raw.get("location_types") is not None:
+        location_types = _list(raw["location_types"], "location_types", API_MAX_FILTER_VALUES)
+        if not all(isinstance(value, str) and value for value in location_types):
+            raise HTTPError(400, "location_types는 문자열 목록이어야 합니다")
+        search_filter["location_types"] = location_types
+    if raw.get("category") is not None:
+        if not isinstance(raw["category"], str) or not 0 < len(raw["category"]) <= 100:
+            raise HTTPError(400, "category는 100자 이하의 문자열이어야 합니다")
+        search_filter["category"] = raw["category"]
+    if raw.get("min_review_count") is not None:
+        search_filter["min_review_count"] = _int(raw["min_review_count"], "min_review_count")
+    if raw.get("restaurant_ids") is not None:
+        ids = _list(raw["restaurant_ids"], "restaurant_ids", MAX_FILTER_IDS)
+        search_filter["restaurant_ids"] = [_int(value, "restaurant_ids 값") for value in ids]
+    if raw.get("near") is not None:
+        near = raw["near"]
+        if not isinstance(near, dict):
+            raise HTTPError(400, "near는 {latitude, longitude, radius_m} 객체여야 합니다")
+        radius_m = near.get("radius_m")
+        if isinstance(radius_m, bool) or not isinstance(radius_m, (int, float)) or not 0 < radius_m <= API_MAX_RADIUS_M:
+            raise HTTPError(400, f"near.radius_m은 0보다 크고 {API_MAX_RADIUS_M:g} 이하인 숫자여야 합니다")
+        search_filter["near"] = {**_parse_location(near), "radius_m": float(radius_m)}
+    if raw.get("price_range") is not None:
+        price_range = raw["price_range"]
+        if not isinstance(price_range, dict) or not price_range or set(price_range) - {"min_price", "max_price"}:
+            raise HTTPError(400, "price_range는 {min_price?, max_price?} 객체여야 합니다")
+        price_range = {key: _int(value, f"price_range.{key}") for key, value in price_range.items()}
+        if price_range.get("min_price", 0) > price_range.get("max_price", float("inf")):
+            raise HTTPError(400, "price_range.min_price가 max_price보다 큽니다")
+        search_filter["price_range"] = price_range
+    return search_filter or None
+
+
+def parse_recommend_request(payload: Any) -> Dict[str, Any]:
+    """요청 JSON을 main.build_initial_state 인자로 바꿉니다."""
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "JSON 객체를 보내 주세요")
+    question = payload.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise HTTPError(400, "question이 필요합니다")
+    if len(question) > API_MAX_QUESTION_CHARS:
+        raise HTTPError(400, f"question은 {API_MAX_QUESTION_CHARS}자 이하여야 합니다")
+
+    search_filter = payload.get("search_filter")
+    if search_filter is not None:
+        if not isinstance(search_filter, dict):
+            raise HTTPError(400, "search_filter는 객체여야 합니다")
+        search_filter = parse_search_filter(search_filter)
+    weather = payload.get("weather")
+    if weather is not None and not isinstance(weather, dict):
+        raise HTTPError(400, "weather는 객체여야 합니다")
+
+    return {
+        "message": question.strip(),
+        "search_filter": search_filter or None,
+        "user_location": _parse_location(payload.get("location")),
+        "weather": weather,
+    }
+
+
+def parse_stream_query(query_string: bytes) -> Dict[str, Any]:
+    """GET 쿼리(question, latitude, longitude, search_filter=JSON)를 POST 본문 형태로 바꿉니다."""
+    query = {key: values[-1] for key, values in parse_qs(query_string.decode("utf-8", "replace")).items()}
+    payload: Dict[str, Any] = {"question": query.get("question")}
+    if "latitude" in query or "longitude" in query:
+        payload["location"] = {"latitude": query.get("latitude"), "longitude": query.get("longitude")}
+    if "search_filter" in query:
+        try:
+            payload["search_filter"] = json.loads(query["search_filter"])
+        except ValueError:
+            raise HTTPError(400, "search_filter는 JSON이어야 합니다")
+    return parse_recommend_request(payload)
+
+
+# ==================== 그래프 실행 ====================
+def invoke_graph(request: Dict[str, Any]) -> Dict[str, Any]:
+    import main
+
+    result = main.graph.invoke(main.build_initial_state(**request))
+    return main.build_response(result)
+
+
+def stream_graph(request: Dict[str, Any], emit, cancelled: threading.Event) -> None:
+    """
+    작업 스레드에서 그래프를 스트리밍하며 ("node"|"token"|"done"|"error", 데이터)를 emit합니다.
+    cancelled가 설정되면 다음 청크에서 멈춥니다 (제너레이터를 닫아 이후 노드를 실행하지 않음).
+    """
+    import main
+
+    start = time.perf_counter()
+    final_state: Optional[Dict[str, Any]] = None
+    stream = main.graph.stream(
+        main.build_initial_state(**request), stream_mode=["updates", "messages", "values"]
+    )
+    try:
+        for mode, chunk in stream:
+            if cancelled.is_set():
+                return
+            if mode == "updates":
+                for node in chunk:
+                    emit("node", {"node": node, "elapsed_ms": round((time.perf_counter() - start) * 1000)})
+            elif mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") in STREAM_TOKEN_NODES and isinstance(message.content, str) and message.content:
+                    emit("token", {"text": message.content})
+            else:
+                final_state = chunk
+        if final_state is None:
+            raise RuntimeError("그래프가 상태를 반환하지 않았습니다")
+        emit("done", {**main.build_response(final_state), "elapsed_ms": round((time.perf_counter() - start) * 1000)})
+    except Exception as exc:
+        print(f"Error: {exc}")
+        emit("error", {"error": str(exc), "status": 500})
+    finally:
+        stream.close()
+
+
+# ==================== ASGI ====================
+async def _read_body(receive) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "요청 본문을 받는 중 연결이 끊겼습니다")
+        body.extend(message.get("body", b""))
+        if len(body) > API_MAX_BODY_BYTES:
+            raise HTTPError(413, f"요청 본문은 {API_MAX_BODY_BYTES} bytes 이하여야 합니다")
+        if not message.get("more_body"):
+            return bytes(body)
+
+
+async def _send_json(send, status: int, payload: Any, headers: Optional[List[Tuple[str, str]]] = None) -> None:
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    raw_headers = [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+    raw_headers += [(key.encode(), value.encode()) for key, value in headers or []]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+
+
+def _require_ready() -> None:
+    if not readiness.ready:
+        raise HTTPError(503, "서버가 아직 준비되지 않았습니다", [("retry-after", "5")])
+
+
+async def recommend(scope, receive, send) -> None:
+    _require_ready()
+    try:
+        payload = json.loads(await _read_body(receive) or b"null")
+    except ValueError:
+        raise HTTPError(400, "JSON 본문을 해석할 수 없습니다")
+    request = parse_recommend_request(payload)
+    await _send_json(send, 200, await runner.run(invoke_graph, request))
+
+
+async def recommend_stream(scope, receive, send) -> None:
+    _require_ready()
+    request = parse_stream_query(scope.get("query_string", b""))
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def emit(event: str, data: Any) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    # 자리를 얻은 뒤에야 200 헤더를 보내므로 붐빌 때는 일반 503 응답이 됩니다.
+    future = await runner.submit(stream_graph, request, emit, cancelled)
+    future.add_done_callback(lambda _f: queue.put_nowait(None))
+
+    async def watch_disconnect() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        cancelled.set()
+        queue.put_nowait(None)
+
+    watcher = asyncio.create_task(watch_disconnect())
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        }
+    )
+    deadline = loop.time() + runner.request_timeout_s
+    try:
+        while not cancelled.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                runner.timed_out += 1
+                cancelled.set()
+                await send({"type": "http.response.body", "body": _sse("error", {"error": "시간 초과", "status": 504}), "more_body": True})
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), min(remaining, API_KEEPALIVE_S))
+            except asyncio.TimeoutError:
+                await send({"type": "http.response.body", "body": b": keepalive\n\n", "more_body": True})
+                continue
+            if item is None:
+                break
+            await send({"type": "http.response.body", "body": _sse(*item), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        cancelled.set()
+        watcher.cancel()
+
+
+async def healthz(scope, receive, send) -> None:
+    await _send_json(send, 200, {"status": "ok"})
+
+
+async def readyz(scope, receive, send) -> None:
+    payload: Dict[str, Any] = {
+        "status": "draining" if readiness.draining else readiness.state,
+        "backend": readiness.backend,
+        "warmup_ms": readiness.warmup_ms,
+        "error": readiness.error,
+        "workers": runner.stats(),
+    }
+    if readiness.state == "ready":
+        from agent.retriever import failover_retriever
+
+        payload["retriever"] = failover_retriever.stats()
+    await _send_json(send, 200 if readiness.ready else 503, payload)
+
+
+ROUTES = {
+    ("POST", "/recommend"): recommend,
+    ("GET", "/recommend/stream"): recommend_stream,
+    ("GET", "/healthz"): healthz,
+    ("GET", "/readyz"): readyz,
+}
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            readiness.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            readiness.draining = True
+            runner.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    # lifespan을 지원하지 않는 서버에서도 첫 요청 때 준비를 시작합니다.
+    readiness.start()
+    path = scope["path"].rstrip("/") or "/"
+    handler = ROUTES.get((scope["method"], path))
+    # 응답 헤더를 이미 보냈으면 (스트리밍 중 연결 끊김 등) 오류 응답을 또 보낼 수 없으므로 기록만 합니다.
+    started = False
+
+    async def tracked_send(message) -> None:
+        nonlocal started
+        if message["type"] == "http.response.start":
+            started = True
+        await send(message)
+
+    try:
+        if handler is None:
+            allowed = [method for method, route in ROUTES if route == path]
+            if allowed:
+                raise HTTPError(405, "허용되지 않는 메서드입니다", [("allow", ", ".join(allowed))])
+            raise HTTPError(404, "없는 경로입니다")
+        await handler(scope, receive, tracked_send)
+    except HTTPError as exc:
+        if started:
+            print(f"Error: {exc.message}")
+        else:
+            await _send_json(send, exc.status, {"error": exc.message}, exc.headers)
+    except Exception as exc:
+        print(f"Error: {exc}")
+        if not started:
+            await _send_json(send, 500, {"error": str(exc)})
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", "8000")))
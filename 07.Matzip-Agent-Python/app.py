@@ -1,13 +1,20 @@
+from typing import Optional
+
 import streamlit as st
 from dotenv import load_dotenv
 
+from agent.filters import SearchFilter
+
+from app_utils.history import SessionHistory
 from app_utils.location import get_user_location, is_lotte_tower_worker
+from app_utils.thumbnails import thumbnail_images
 from app_utils.weather import (
     colored_label,
     combine_pm,
     fetch_weather,
     needs_indoor,
     precip_status,
+    weather_status,
     wind_status,
 )
 from main import get_agent_response
@@ -28,6 +35,9 @@ ALLOWED_INDOOR_LOCATION_TYPES = [
     "캐슬플라자(실내)",
 ]
 
+# 점심시간에 걸어서 다녀올 수 있는 거리 (m)
+WALKING_RADIUS_M = 1000
+
 
 def build_weather_question(weather) -> str:
     """날씨 정보와 근무자 여부에 맞춘 초깃값 질문을 생성."""
@@ -122,6 +132,30 @@ def build_weather_question(weather) -> str:
 
     return question
 
+
+def build_search_filter(weather, location=None) -> Optional[SearchFilter]:
+    """
+    실내 이동이 필요한 날씨면 실내 장소만, 위치가 확인되면 도보 반경 안의 음식점만
+    검색 단계에서 남기도록 필터를 만든다.
+    """
+    search_filter: SearchFilter = {}
+    if needs_indoor(weather):
+        search_filter["location_types"] = ALLOWED_INDOOR_LOCATION_TYPES
+    location = rounded_location(location)
+    if location:
+        search_filter["near"] = {**location, "radius_m": WALKING_RADIUS_M}
+    return search_filter or None
+
+
+def rounded_location(location) -> Optional[dict]:
+    """좌표를 약 100m 단위로 반올림해 같은 건물 사용자끼리 응답 캐시를 공유한다."""
+    if not location:
+        return None
+    return {
+        "latitude": round(location["latitude"], 3),
+        "longitude": round(location["longitude"], 3),
+    }
+
 location, location_error = get_user_location()
 weather, weather_error = fetch_weather()
 
@@ -131,6 +165,8 @@ def render_sources(sources):
     if not sources:
         return
 
+    # 원본 대신 줄여서 캐시한 썸네일을 씁니다 (처음 보는 이미지만 동시에 받아 줄임).
+    images = thumbnail_images(src.get("thumbnail") for src in sources)
     for src in sources:
         has_thumbnail = bool(src.get("thumbnail"))
         cols = st.columns([1, 2]) if has_thumbnail else [st.container()]
@@ -138,7 +174,7 @@ def render_sources(sources):
         if has_thumbnail:
             with cols[0]:
                 st.image(
-                    src["thumbnail"],
+                    images.get(src["thumbnail"]) or src["thumbnail"],
                     caption=src.get("name") or "",
                     use_column_width=True,
                 )
@@ -151,9 +187,14 @@ def render_sources(sources):
 
 
 @st.cache_data(ttl=1800)  # 30분 캐시
-def get_cached_agent_response(question: str):
+def get_cached_agent_response(
+    question: str,
+    search_filter: Optional[SearchFilter] = None,
+    user_location: Optional[dict] = None,
+    weather: Optional[dict] = None,
+):
     """질문에 대한 AI 응답을 캐시합니다. 오류 응답은 캐시하지 않습니다."""
-    response = get_agent_response(question)
+    response = get_agent_response(question, search_filter, user_location, weather)
     # 응답이 dictionary 형태이고 'answer' 키가 있을 때만 정상으로 간주
     if not isinstance(response, dict) or "answer" not in response:
         # Streamlit은 예외가 발생한 실행은 캐시하지 않음
@@ -219,14 +260,18 @@ with st.container():
             )
             if weather.get("description"):
                 st.caption(weather["description"])
+            status = weather_status()
+            if status["stale"] and status["age_s"] is not None:
+                st.caption(f"⏱️ {status['age_s'] / 60:.0f}분 전 날씨입니다 (최신 정보를 가져오지 못했습니다)")
 
             if needs_indoor(weather):
                 st.error("실내 이동 권장 (롯데월드 타워 근무자 기준)")
         else:
             st.info("날씨 정보를 불러오는 중입니다...")
 
-if "message_list" not in st.session_state:
-    st.session_state.message_list = []
+if "history" not in st.session_state:
+    st.session_state.history = SessionHistory()
+history = st.session_state.history
 if "initial_weather_suggestion_done" not in st.session_state:
     st.session_state.initial_weather_suggestion_done = False
 
@@ -236,12 +281,15 @@ if (
     and not weather_error
 ):
     weather_question = build_weather_question(weather)
-    st.session_state.message_list.append(
-        {"role": "user", "content": weather_question}
-    )
+    history.append("user", weather_question)
     with st.spinner("날씨와 위치에 맞춰 맛집을 추천 중입니다"):
         try:
-            ai_response = get_cached_agent_response(weather_question)
+            ai_response = get_cached_agent_response(
+                weather_question,
+                build_search_filter(weather, location),
+                rounded_location(location),
+                weather,
+            )
         except ValueError:
             ai_response = {
                 "answer": "앗! 죄송합니다. API 할당량을 다 써버렸어요. 초기화 될때까지 좀 기다려주세요 🙏",
@@ -251,25 +299,35 @@ if (
         answer = ai_response.get("answer", "")
         sources = ai_response.get("sources") or []
 
-        st.session_state.message_list.append(
-            {"role": "ai", "content": answer, "sources": sources}
-        )
+        history.append("ai", answer, sources)
     st.session_state.initial_weather_suggestion_done = True
 
-for message in st.session_state.message_list:
+# 최근 메시지와 펼친 이전 페이지만 그립니다 (오래된 메시지는 서버의 SQLite에 보관).
+if history.hidden_count:
+    st.button(
+        f"⬆️ 이전 대화 더 보기 ({history.hidden_count}개)",
+        on_click=history.show_more,
+    )
+if history.older_pages:
+    st.button("이전 대화 접기", on_click=history.collapse)
+
+for message in history.visible():
     with st.chat_message(message["role"]):
         st.write(message["content"])
-        sources = message.get("sources") or []
-        print(message.get("sources"))
-        render_sources(sources)
+        render_sources(message.get("sources") or [])
 
 if user_question := st.chat_input(placeholder="잠실 맛집에 관련된 궁금한 내용들을 말씀해주세요!"):
     with st.chat_message("user"):
         st.write(user_question)
-    st.session_state.message_list.append({"role": "user", "content": user_question})
+    history.append("user", user_question)
 
     with st.spinner("답변을 생성하는 중입니다"):
-        ai_response = get_agent_response(user_question)
+        ai_response = get_agent_response(
+            user_question,
+            build_search_filter(weather, location),
+            rounded_location(location),
+            weather,
+        )
         with st.chat_message("ai"):
             if isinstance(ai_response, dict):
                 answer = ai_response.get("answer", "")
@@ -282,6 +340,4 @@ if user_question := st.chat_input(placeholder="잠실 맛집에 관련된 궁금
 
             render_sources(sources)
 
-            st.session_state.message_list.append(
-                {"role": "ai", "content": answer, "sources": sources}
-            )
+            history.append("ai", answer, sources)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ==================== 설정 ====================
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "./chat_history.sqlite")
+HISTORY_MAX_MESSAGES = int(os.getenv("HISTORY_MAX_MESSAGES", "20"))  # 세션 메모리에 두고 매번 그리는 최근 메시지 수
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "10"))  # "이전 대화 더 보기" 한 번에 불러올 메시지 수
+HISTORY_TTL_DAYS = float(os.getenv("HISTORY_TTL_DAYS", "7"))  # 이보다 오래된 (버려진 세션의) 대화는 삭제
+HISTORY_GC_INTERVAL_S = float(os.getenv("HISTORY_GC_INTERVAL_S", "3600"))  # 저장할 때 오래된 대화를 정리하는 최소 간격
+
+
+class ConversationStore:
+    """
+    모든 세션이 함께 쓰는 SQLite 대화 저장소.
+
+    messages(session_id, seq, role, content, sources, created_at) 테이블에
+    세션 메모리에서 밀려난 오래된 메시지만 저장하고, 페이지 단위로 다시 읽어 옵니다.
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_DB_PATH,
+        ttl_s: float = HISTORY_TTL_DAYS * 86400,
+        gc_interval_s: float = HISTORY_GC_INTERVAL_S,
+    ) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self.gc_interval_s = gc_interval_s
+        self._last_gc = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.gc()
+
+    def spill(self, session_id: str, messages: List[Dict]) -> None:
+        now = time.time()
+        rows = [
+            (
+                session_id,
+                message["seq"],
+                message["role"],
+                message["content"],
+                json.dumps(message.get("sources") or [], ensure_ascii=False),
+                now,
+            )
+            for message in messages
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+        # 프로세스가 오래 떠 있어도 버려진 세션이 쌓이지 않도록 주기적으로도 정리합니다.
+        if now - self._last_gc >= self.gc_interval_s:
+            self.gc()
+
+    def page(self, session_id: str, before_seq: int, limit: int) -> List[Dict]:
+        """before_seq 바로 앞의 메시지 limit개 (오래된 것부터)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, role, content, sources FROM messages "
+                "WHERE session_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+                (session_id, before_seq, limit),
+            ).fetchall()
+        return [
+            {"seq": seq, "role": role, "content": content, "sources": json.loads(sources)}
+            for seq, role, content, sources in reversed(rows)
+        ]
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def gc(self) -> int:
+        """ttl_s보다 오래된 메시지를 지웁니다 (브라우저를 닫아 버려진 세션 정리)."""
+        with self._lock:
+            self._last_gc = time.time()
+            cur = self._conn.execute("DELETE FROM messages WHERE created_at < ?", (self._last_gc - self.ttl_s,))
+            self._conn.commit()
+        if cur.rowcount:
+            print(f"🧹 오래된 대화 {cur.rowcount}개를 정리했습니다.")
+        return cur.rowcount
+
+
+_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """프로세스에 하나뿐인 ConversationStore (모든 Streamlit 세션이 공유)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConversationStore()
+        return _store
+
+
+class SessionHistory:
+    """
+    st.session_state 에 두는 세션별 대화 기록.
+
+    최근 max_messages개만 메모리에 두고 그보다 오래된 메시지는 ConversationStore로 내보냅니다.
+    화면에는 최근 메시지와 사용자가 펼친 이전 페이지만 그리므로, 재실행 비용은 대화 길이가 아니라
+    보이는 메시지 수에 비례합니다. 펼친 이전 페이지는 메모리에 들고 있지 않고 그릴 때마다 SQLite에서 읽습니다.
+    """
+
+    def __init__(self, max_messages: int = HISTORY_MAX_MESSAGES, page_size: int = HISTORY_PAGE_SIZE) -> None:
+        self.session_id = uuid.uuid4().hex
+        self.max_messages = max_messages
+        self.page_size = page_size
+        self.recent: List[Dict] = []
+        self.next_seq = 0
+        self.spilled = 0
+        self.older_pages = 0
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.recent)
+
+    def append(self, role: str, content: str, sources: Optional[List[Dict]] = None) -> None:
+        self.recent.append({"seq": self.next_seq, "role": role, "content": content, "sources": sources or []})
+        self.next_seq += 1
+        overflow = len(self.recent) - self.max_messages
+        if overflow > 0:
+            get_conversation_store().spill(self.session_id, self.recent[:overflow])
+            del self.recent[:overflow]
+            self.spilled += overflow
+
+    @property
+    def hidden_count(self) -> int:
+        """아직 펼치지 않은 이전 메시지 수."""
+        return max(self.spilled - self.older_pages * self.page_size, 0)
+
+    def show_more(self) -> None:
+        if self.hidden_count:
+            self.older_pages += 1
+
+    def collapse(self) -> None:
+        self.older_pages = 0
+
+    def visible(self) -> List[Dict]:
+        """화면에 그릴 메시지 (펼친 이전 페이지 + 최근 메시지)."""
+        if not self.older_pages or not self.spilled:
+            return self.recent
+        before = self.recent[0]["seq"] if self.recent else self.next_seq
+        older = get_conversation_store().page(self.session_id, before, self.older_pages * self.page_size)
+        return older + self.recent
+
+    def clear(self) -> None:
+        if self.spilled:
+            get_conversation_store().clear(self.session_id)
+        self.recent = []
+        self.spilled = 0
+        self.older_pages = 0
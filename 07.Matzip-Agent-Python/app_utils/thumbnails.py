@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ==================== 설정 ====================
+THUMBNAIL_CACHE_DIR = os.getenv("THUMBNAIL_CACHE_DIR", "./thumbnail_cache")
+THUMBNAIL_CACHE_MAX_MB = float(os.getenv("THUMBNAIL_CACHE_MAX_MB", "200"))  # 디스크 캐시 상한 (넘으면 LRU 삭제)
+THUMBNAIL_MEMORY_MAX_MB = float(os.getenv("THUMBNAIL_MEMORY_MAX_MB", "16"))  # 재실행마다 디스크를 읽지 않게 둘 메모리 캐시
+THUMBNAIL_MAX_SIZE = int(os.getenv("THUMBNAIL_MAX_SIZE", "320"))  # 긴 변 픽셀
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "WEBP").upper()  # WEBP 또는 JPEG
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "75"))
+THUMBNAIL_TIMEOUT_S = float(os.getenv("THUMBNAIL_TIMEOUT_S", "5"))
+THUMBNAIL_MAX_SOURCE_MB = float(os.getenv("THUMBNAIL_MAX_SOURCE_MB", "10"))  # 이보다 큰 원본은 받지 않음
+THUMBNAIL_RETRY_S = float(os.getenv("THUMBNAIL_RETRY_S", "600"))  # 실패한 주소를 다시 시도할 때까지
+THUMBNAIL_MAX_WORKERS = int(os.getenv("THUMBNAIL_MAX_WORKERS", "8"))
+
+
+def resize_image(data: bytes, max_size: int, fmt: str, quality: int) -> Tuple[bytes, str]:
+    """긴 변이 max_size 이하가 되게 줄여 (바이트, 형식)으로 다시 인코딩합니다. Pillow가 없으면 원본 그대로."""
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError:
+        return data, "ORIGINAL"
+
+    if fmt == "WEBP" and not features.check("webp"):
+        fmt = "JPEG"
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        if fmt == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB" if fmt == "JPEG" else "RGBA")
+        out = io.BytesIO()
+        image.save(out, format=fmt, quality=quality, optimize=True)
+    return out.getvalue(), fmt
+
+
+class ThumbnailCache:
+    """
+    음식점 썸네일을 한 번만 받아 작게 줄인 뒤 디스크에 캐시합니다.
+
+    - 파일은 줄인 이미지 바이트의 sha256으로 저장합니다 (content-addressed, 같은 이미지는 한 벌만).
+      index.sqlite 의 sources(원본 주소 → digest)와 blobs(digest, 크기, last_used) 테이블이 주소와 파일을 잇습니다.
+    - 디스크 사용량이 max_bytes를 넘으면 가장 오래 쓰이지 않은 파일부터 지웁니다 (LRU).
+    - 프로세스 안에서는 바이트를 메모리 LRU에도 두어 Streamlit 재실행 때 디스크/DB를 건드리지 않습니다.
+    - 받지 못한 주소는 retry_s 동안 다시 받지 않고 None을 돌려줍니다 (화면은 원본 주소로 대신 그림).
+    """
+
+    def __init__(
+        self,
+        directory: str = THUMBNAIL_CACHE_DIR,
+        max_bytes: int = int(THUMBNAIL_CACHE_MAX_MB * 1024 * 1024),
+        memory_bytes: int = int(THUMBNAIL_MEMORY_MAX_MB * 1024 * 1024),
+        max_size: int = THUMBNAIL_MAX_SIZE,
+        fmt: str = THUMBNAIL_FORMAT,
+        quality: int = THUMBNAIL_QUALITY,
+        timeout_s: float = THUMBNAIL_TIMEOUT_S,
+        max_source_bytes: int = int(THUMBNAIL_MAX_SOURCE_MB * 1024 * 1024),
+        retry_s: float = THUMBNAIL_RETRY_S,
+        max_workers: int = THUMBNAIL_MAX_WORKERS,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.max_size = max_size
+        self.fmt = fmt
+        self.quality = quality
+        self.timeout_s = timeout_s
+        self.max_source_bytes = max_source_bytes
+        self.retry_s = retry_s
+
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                source_key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._failed: Dict[str, float] = {}
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self.downloaded_bytes = 0
+        self.stored_bytes = 0
+
+    def _source_key(self, url: str) -> str:
+        # 크기/형식 설정이 바뀌면 다른 썸네일이 되도록 설정도 키에 넣습니다.
+        return hashlib.sha256(f"{url}|{self.max_size}|{self.fmt}|{self.quality}".encode("utf-8")).hexdigest()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename[:2], filename)
+
+    # ---------- 메모리 LRU ----------
+    def _remember(self, key: str, data: bytes) -> None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+                _key, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _recall(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    # ---------- 디스크 ----------
+    def _load(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.digest, b.filename FROM sources s JOIN blobs b ON b.digest = s.digest WHERE s.source_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), row[0]))
+            self._conn.commit()
+        try:
+            with open(self._path(row[1]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key: str, data: bytes, fmt: str) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{digest}.{fmt.lower()}"
+        path = self._path(filename)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?)", (digest, filename, len(data), time.time())
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (key, digest))
+            self._conn.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """디스크 사용량이 상한을 넘으면 오래 쓰이지 않은 파일부터 상한의 90%까지 지웁니다."""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            expired = []
+            for digest, filename, size in self._conn.execute(
+                "SELECT digest, filename, bytes FROM blobs ORDER BY last_used"
+            ):
+                if total <= self.max_bytes * 0.9:
+                    break
+                expired.append((digest, filename))
+                total -= size
+            self._conn.executemany("DELETE FROM blobs WHERE digest = ?", [(d,) for d, _f in expired])
+            self._conn.executemany("DELETE FROM sources WHERE digest = ?", [(d,) for d, _f in expired])
+            self._conn.commit()
+        for _digest, filename in expired:
+            try:
+                os.remove(self._path(filename))
+            except OSError:
+                pass
+        return len(expired)
+
+    # ---------- 조회 ----------
+    def _download(self, url: str) -> bytes:
+        with requests.get(url, timeout=self.timeout_s, stream=True) as resp:
+            resp.raise_for_status()
+            chunks, size = [], 0
+            for chunk in resp.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > self.max_source_bytes:
+                    raise ValueError(f"원본 이미지가 너무 큽니다 (> {self.max_source_bytes} bytes)")
+                chunks.append(chunk)
+        self.downloaded_bytes += size
+        return b"".join(chunks)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """줄인 썸네일 바이트. 처음 보는 주소면 받아서 줄이고 캐시하며, 실패하면 None."""
+        if not url:
+            return None
+        key = self._source_key(url)
+        data = self._recall(key)
+        if data is not None:
+            return data
+        if time.time() - self._failed.get(key, 0.0) < self.retry_s:
+            return None
+
+        # 같은 주소를 여러 세션이 동시에 처음 볼 때 한 번만 받습니다.
+        with self._lock:
+            inflight = self._inflight.setdefault(key, threading.Lock())
+        with inflight:
+            data = self._recall(key) or self._load(key)
+            if data is None:
+                try:
+                    data, fmt = resize_image(self._download(url), self.max_size, self.fmt, self.quality)
+                    self._store(key, data, fmt)
+                    self.stored_bytes += len(data)
+                except Exception as exc:
+                    print(f"⚠️  썸네일을 만들지 못했습니다 ({url}): {exc}")
+                    self._failed[key] = time.time()
+                    data = None
+            if data is not None:
+                self._remember(key, data)
+        with self._lock:
+            self._inflight.pop(key, None)
+        return data
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """여러 썸네일을 동시에 준비합니다 (이미 캐시된 것은 바로 반환)."""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        return dict(zip(urls, self._pool.map(self.get, urls)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM blobs").fetchone()
+        return {
+            "files": count,
+            "disk_bytes": total,
+            "memory_bytes": self._memory_size,
+            "downloaded_bytes": self.downloaded_bytes,
+            "stored_bytes": self.stored_bytes,
+        }
+
+
+_cache: Optional[ThumbnailCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """프로세스에 하나뿐인 ThumbnailCache (Streamlit 세션/재실행 사이에서 공유)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache()
+        return _cache
+
+
+def thumbnail_images(urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+    """원본 썸네일 주소 → 줄인 이미지 바이트 (실패하면 None)."""
+    return get_thumbnail_cache().get_many(urls)
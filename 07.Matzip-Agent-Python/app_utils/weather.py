@@ -1,40 +1,164 @@
 from __future__ import annotations
 
+import json
+import os
 import re
-from typing import Dict, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
-import streamlit as st
+from bs4 import BeautifulSoup, SoupStrainer
+from dotenv import load_dotenv
 
+load_dotenv()
+
+# ==================== 설정 ====================
+WEATHER_URL = os.getenv("WEATHER_URL", "https://www.weather.go.kr/w/wnuri-fct2021/ext/current-weather.do")
+# 한국기상청 잠실 코드
+WEATHER_PARAMS = {"code": "1171071000", "unit": "m/s", "aws": "Y"}
+# 지정하면 대기질(ul.air-wrap)을 이 주소에서 날씨와 동시에 받아 PM2.5/PM10을 덮어씁니다.
+# 비워 두면 날씨 페이지에 함께 실린 대기질을 씁니다.
+AIR_QUALITY_URL = os.getenv("AIR_QUALITY_URL", "")
+WEATHER_REFRESH_S = float(os.getenv("WEATHER_REFRESH_S", "300"))  # 정상 갱신 주기
+WEATHER_RETRY_S = float(os.getenv("WEATHER_RETRY_S", "60"))  # 실패했을 때 다시 시도할 때까지
+WEATHER_TIMEOUT_S = float(os.getenv("WEATHER_TIMEOUT_S", "10"))
+WEATHER_STALE_S = float(os.getenv("WEATHER_STALE_S", "900"))  # 이보다 오래된 스냅샷은 화면에 표시
+WEATHER_FIRST_WAIT_S = float(os.getenv("WEATHER_FIRST_WAIT_S", "3"))  # 스냅샷이 하나도 없을 때만 기다림
+# 재시작 직후에도 바로 보여 줄 마지막 정상 스냅샷
+WEATHER_CACHE_PATH = os.getenv("WEATHER_CACHE_PATH", "./weather_cache.json")
+# HTML 파싱 방식
+# - scan: 태그 스캐너로 .wthema-a / ul.air-wrap 구간만 잘라 그 조각만 파싱 (기본값, 못 찾으면 full로 다시 파싱)
+# - strainer: 전체를 토큰화하되 SoupStrainer로 두 구간의 트리만 만듦
+# - full: 페이지 전체 트리를 만듦 (이전 방식)
+WEATHER_PARSER = os.getenv("WEATHER_PARSER", "scan")
+PARSERS = ("scan", "strainer", "full")
+
+
+# ==================== HTML 파싱 ====================
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_TAG_NAME = r"[a-zA-Z][\w:-]*"
+
+
+def _first_number(text: str) -> Optional[float]:
+    if not text:
+        return None
+    match = _NUMBER.search(text.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def _open_tag(class_name: str, tag: str = _TAG_NAME) -> "re.Pattern[str]":
+    """class 속성에 class_name 토큰이 있는 여는 태그."""
+    return re.compile(
+        rf"<({tag})\b[^>]*?\bclass\s*=\s*([\"'])(?:[^\"']*\s)?{re.escape(class_name)}(?:\s[^\"']*)?\2[^>]*>",
+        re.IGNORECASE,
+    )
+
+
+_CONTAINER_OPEN = _open_tag("wthema-a")
+_AIR_WRAP_OPEN = _open_tag("air-wrap", tag="ul")
+_WANTED_CLASSES = frozenset(("wthema-a", "air-wrap"))
+
+
+def _wanted_class(value: Optional[str]) -> bool:
+    # SoupStrainer는 class 속성을 나누기 전 문자열 그대로 넘기므로 직접 토큰으로 나눕니다.
+    return value is not None and not _WANTED_CLASSES.isdisjoint(value.split())
+
+
+_STRAINER = SoupStrainer(class_=_wanted_class)
+_AIR_STRAINER = SoupStrainer("ul", class_=lambda value: value is not None and "air-wrap" in value.split())
+
+
+@lru_cache(maxsize=8)
+def _tag_pattern(tag: str) -> "re.Pattern[str]":
+    return re.compile(rf"<(/?){re.escape(tag)}\b[^>]*>", re.IGNORECASE)
+
+
+def _element_span(html: str, open_pattern: "re.Pattern[str]") -> Optional[Tuple[int, int]]:
+    """
+    open_pattern에 맞는 첫 요소의 (시작, 끝) 위치 (같은 이름 태그의 깊이를 세어 닫는 태그를 찾음).
+    닫는 태그가 없으면 html.parser처럼 문서 끝까지를 요소로 봅니다.
+    """
+    match = open_pattern.search(html)
+    if not match:
+        return None
+    depth = 1
+    for tag in _tag_pattern(match.group(1).lower()).finditer(html, match.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return match.start(), tag.end()
+    return match.start(), len(html)
+
+
+def _scan_fragment(html: str, *patterns: "re.Pattern[str]") -> Optional[str]:
+    """
+    패턴별 첫 요소만 문서 순서대로 이어 붙인 HTML 조각. 다른 조각 안에 든 요소는 한 번만 넣습니다.
+    첫 번째 패턴의 요소가 없으면 None.
+    """
+    spans = [_element_span(html, pattern) for pattern in patterns]
+    if spans[0] is None:
+        return None
+    kept: List[Tuple[int, int]] = []
+    for start, end in sorted(span for span in spans if span is not None):
+        if kept and start < kept[-1][1]:
+            continue
+        kept.append((start, end))
+    return "".join(html[start:end] for start, end in kept)
+
+
+def parse_air_quality(soup: Any) -> Tuple[Optional[float], Optional[float]]:
+    """ul.air-wrap 에서 (PM2.5, PM10)을 읽습니다."""
+    pm25 = None
+    pm10 = None
+    air_wrap = soup.select_one("ul.air-wrap")
+    if air_wrap:
+        for item in air_wrap.find_all("li"):
+            label_el = item.find("span", class_="lbl")
+            label = label_el.get_text(" ", strip=True) if label_el else ""
+            value_el = item.select_one(".air-lvv")
+            value = _first_number(value_el.get_text(" ", strip=True) if value_el else "")
+            if "PM2.5" in label:
+                pm25 = value
+            elif "PM10" in label:
+                pm10 = value
+    return pm25, pm10
+
+
+def _parse_trees(html: str, parser: str) -> Tuple[Any, Any]:
+    """(.wthema-a 요소, ul.air-wrap을 찾을 루트)를 parser 방식대로 만듭니다."""
+    if parser == "scan":
+        fragment = _scan_fragment(html, _CONTAINER_OPEN, _AIR_WRAP_OPEN)
+        if fragment is not None:
+            soup = BeautifulSoup(fragment, "html.parser")
+            return soup.select_one(".wthema-a"), soup
+        # 속성 표기가 예상과 달라 못 찾았을 수 있으므로 전체 파싱으로 한 번 더 확인합니다.
+        parser = "full"
+    if parser == "strainer":
+        soup = BeautifulSoup(html, "html.parser", parse_only=_STRAINER)
+    elif parser == "full":
+        soup = BeautifulSoup(html, "html.parser")
+    else:
+        raise ValueError(f"알 수 없는 파싱 방식: {parser} ({', '.join(PARSERS)})")
+    return soup.select_one(".wthema-a"), soup
+
+
+def parse_air_quality_html(html: str, parser: str = WEATHER_PARSER) -> Tuple[Optional[float], Optional[float]]:
+    """대기질 HTML에서 (PM2.5, PM10)을 읽습니다."""
+    if parser == "scan":
+        return parse_air_quality(BeautifulSoup(_scan_fragment(html, _AIR_WRAP_OPEN) or "", "html.parser"))
+    if parser == "strainer":
+        return parse_air_quality(BeautifulSoup(html, "html.parser", parse_only=_AIR_STRAINER))
+    return parse_air_quality(BeautifulSoup(html, "html.parser"))
 
-@st.cache_data(ttl=300, show_spinner=False)
-def fetch_weather() -> Tuple[Optional[Dict], Optional[str]]:
-    """한국기상청(잠실 코드) HTML을 파싱해 현재 날씨 정보를 만든다."""
-    jamsil_weather_code = "1171071000"
-    params = {
-        "code": jamsil_weather_code,
-        "unit": "m/s",
-        "aws": "Y",
-    }
-    url = "https://www.weather.go.kr/w/wnuri-fct2021/ext/current-weather.do"
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-    except Exception as exc:
-        return None, f"날씨 API 호출 실패: {exc}"
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    container = soup.select_one(".wthema-a")
+def parse_weather_html(html: str, parser: str = WEATHER_PARSER) -> Tuple[Optional[Dict], Optional[str]]:
+    """한국기상청 현재 날씨 HTML을 파싱해 날씨 정보를 만든다."""
+    container, air_root = _parse_trees(html, parser)
     if not container:
         return None, "날씨 데이터를 찾지 못했습니다 (.wthema-a)."
 
-    def _first_number(text: str) -> Optional[float]:
-        if not text:
-            return None
-        match = re.search(r"-?\d+(?:\.\d+)?", text.replace(",", ""))
-        return float(match.group()) if match else None
-
     temp_el = container.select_one(".tmp")
     temp = _first_number(temp_el.get_text(" ", strip=True) if temp_el else "")
 
@@ -63,19 +187,7 @@ def fetch_weather() -> Tuple[Optional[Dict], Optional[str]]:
     description_el = container.select_one(".w-txt")
     description = description_el.get_text(" ", strip=True) if description_el else ""
 
-    pm25 = None
-    pm10 = None
-    air_wrap = soup.select_one("ul.air-wrap")
-    if air_wrap:
-        for item in air_wrap.find_all("li"):
-            label_el = item.find("span", class_="lbl")
-            label = label_el.get_text(" ", strip=True) if label_el else ""
-            value_el = item.select_one(".air-lvv")
-            value = _first_number(value_el.get_text(" ", strip=True) if value_el else "")
-            if "PM2.5" in label:
-                pm25 = value
-            elif "PM10" in label:
-                pm10 = value
+    pm25, pm10 = parse_air_quality(air_root)
 
     if temp is None:
         return None, "기온 정보를 파싱하지 못했습니다."
@@ -96,6 +208,188 @@ def fetch_weather() -> Tuple[Optional[Dict], Optional[str]]:
     return weather, None
 
 
+# ==================== 날씨 서비스 ====================
+class WeatherService:
+    """
+    프로세스 전체가 함께 쓰는 날씨 스냅샷 (stale-while-revalidate).
+
+    - 백그라운드 스레드가 refresh_s마다 날씨(와 AIR_QUALITY_URL이 있으면 대기질)를 동시에 받아 갱신하고,
+      실패하면 retry_s 뒤에 다시 시도합니다. 실패하는 동안에도 마지막 정상 스냅샷을 계속 씁니다.
+    - get()은 네트워크를 기다리지 않고 바로 스냅샷을 돌려줍니다.
+      스냅샷이 하나도 없을 때(첫 실행)만 첫 갱신을 최대 first_wait_s 기다립니다.
+    - 정상 스냅샷은 cache_path에 저장해 재시작 직후에도 바로 보여 줍니다.
+    """
+
+    def __init__(
+        self,
+        weather_url: str = WEATHER_URL,
+        air_quality_url: str = AIR_QUALITY_URL,
+        refresh_s: float = WEATHER_REFRESH_S,
+        retry_s: float = WEATHER_RETRY_S,
+        timeout_s: float = WEATHER_TIMEOUT_S,
+        stale_s: float = WEATHER_STALE_S,
+        first_wait_s: float = WEATHER_FIRST_WAIT_S,
+        cache_path: Optional[str] = WEATHER_CACHE_PATH,
+    ) -> None:
+        self.weather_url = weather_url
+        self.air_quality_url = air_quality_url
+        self.refresh_s = refresh_s
+        self.retry_s = retry_s
+        self.timeout_s = timeout_s
+        self.stale_s = stale_s
+        self.first_wait_s = first_wait_s
+        self.cache_path = cache_path
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None  # {"weather": {...}, "fetched_at": epoch 초}
+        self.last_error: Optional[str] = None
+        self.last_attempt_at: Optional[float] = None
+        self._attempted = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-fetch")
+        self._load()
+
+    # ---------- 디스크 ----------
+    def _load(self) -> None:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("weather") and snapshot.get("fetched_at"):
+                self._snapshot = snapshot
+                print(f"🌤️  저장된 날씨 스냅샷 사용 ({self.age_s():.0f}초 전)")
+        except (OSError, ValueError) as exc:
+            print(f"⚠️  날씨 스냅샷을 읽지 못했습니다: {exc}")
+
+    def _persist(self, snapshot: Dict[str, Any]) -> None:
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as exc:
+            print(f"⚠️  날씨 스냅샷을 저장하지 못했습니다: {exc}")
+
+    # ---------- 갱신 ----------
+    def _get(self, url: str, params: Optional[Dict[str, str]] = None) -> str:
+        resp = requests.get(url, params=params, timeout=self.timeout_s)
+        resp.raise_for_status()
+        return resp.text
+
+    def refresh(self) -> bool:
+        """날씨와 대기질을 동시에 받아 스냅샷을 바꿉니다. 실패하면 이전 스냅샷을 그대로 둡니다."""
+        with self._refresh_lock:
+            weather_future = self._pool.submit(self._get, self.weather_url, WEATHER_PARAMS)
+            air_future = self._pool.submit(self._get, self.air_quality_url) if self.air_quality_url else None
+
+            weather, error = None, None
+            try:
+                weather, error = parse_weather_html(weather_future.result())
+            except Exception as exc:
+                error = f"날씨 API 호출 실패: {exc}"
+            if weather and air_future is not None:
+                try:
+                    pm25, pm10 = parse_air_quality_html(air_future.result())
+                    weather["pm25"] = pm25 if pm25 is not None else weather["pm25"]
+                    weather["pm10"] = pm10 if pm10 is not None else weather["pm10"]
+                except Exception as exc:
+                    # 대기질만 실패하면 날씨 페이지의 값으로 갱신합니다.
+                    print(f"⚠️  대기질 조회 실패: {exc}")
+
+            now = time.time()
+            with self._lock:
+                self.last_attempt_at = now
+                self.last_error = error
+                if weather:
+                    self._snapshot = {"weather": weather, "fetched_at": now}
+            if weather:
+                self._persist(self._snapshot)
+            else:
+                print(f"⚠️  {error}")
+            self._attempted.set()
+            return weather is not None
+
+    def _run(self) -> None:
+        # 재시작 직후 디스크 스냅샷이 아직 신선하면 남은 주기만큼 기다렸다가 갱신합니다.
+        delay = max(self.refresh_s - self.age_s(), 0.0) if self._snapshot else 0.0
+        while not self._stop.wait(delay):
+            try:
+                ok = self.refresh()
+            except Exception as exc:
+                print(f"⚠️  날씨 갱신 오류: {exc}")
+                ok = False
+            delay = self.refresh_s if ok else self.retry_s
+
+    def start(self) -> "WeatherService":
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="weather-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout_s + 1)
+        self._pool.shutdown(wait=False)
+
+    # ---------- 조회 ----------
+    def age_s(self) -> Optional[float]:
+        snapshot = self._snapshot
+        return time.time() - snapshot["fetched_at"] if snapshot else None
+
+    def get(self) -> Tuple[Optional[Dict], Optional[str]]:
+        """마지막 정상 스냅샷을 (weather, None)으로, 없으면 (None, 오류 메시지)로 바로 돌려줍니다."""
+        self.start()
+        if self._snapshot is None and not self._attempted.is_set():
+            self._attempted.wait(self.first_wait_s)
+        with self._lock:
+            snapshot, error = self._snapshot, self.last_error
+        if snapshot is None:
+            return None, error or "날씨 정보를 불러오는 중입니다."
+        return dict(snapshot["weather"]), None
+
+    def status(self) -> Dict[str, Any]:
+        """스냅샷 시각/경과 시간/신선도와 마지막 갱신 오류."""
+        age = self.age_s()
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                "fetched_at": snapshot["fetched_at"] if snapshot else None,
+                "age_s": age,
+                "stale": age is None or age > self.stale_s,
+                "last_attempt_at": self.last_attempt_at,
+                "last_error": self.last_error,
+            }
+
+
+_service: Optional[WeatherService] = None
+_service_lock = threading.Lock()
+
+
+def get_weather_service() -> WeatherService:
+    """프로세스에 하나뿐인 WeatherService (Streamlit 세션/재실행 사이에서 공유)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = WeatherService().start()
+        return _service
+
+
+def fetch_weather() -> Tuple[Optional[Dict], Optional[str]]:
+    """현재 날씨 스냅샷을 바로 돌려준다 (갱신은 백그라운드 스레드가 맡는다)."""
+    return get_weather_service().get()
+
+
+def weather_status() -> Dict[str, Any]:
+    return get_weather_service().status()
+
+
 def needs_indoor(weather: Optional[Dict]) -> bool:
     """롯데타워 근무자가 실내 이동을 권장해야 하는지 여부."""
     if not (weather):
@@ -0,0 +1,61 @@
+"""
+로컬 임베딩 모델 CPU 인코딩 벤치마크: 단일 프로세스 고정 배치(batch_size 8) vs CPUEncodingEngine (워커 수별).
+작은 로컬 모델(기본 sentence-transformers/all-MiniLM-L6-v2, 미리 받아 둔 캐시 경로도 가능)로 texts/s를 잽니다.
+sentence-transformers(torch)가 설치되어 있어야 합니다.
+
+예시:
+    python -m bench.cpu_encoding --model sentence-transformers/all-MiniLM-L6-v2 --texts 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from store.pipeline.cpu_encoder import CPUEncodingEngine
+from store.pipeline.local_embedder import load_local_model
+
+
+def _texts(n: int):
+    """짧은 메뉴명부터 긴 설명까지 길이가 섞인 음식점 텍스트"""
+    rng = np.random.default_rng(3)
+    words = ["국밥", "냉면", "돈까스", "초밥", "짬뽕", "샐러드", "쌀국수", "김치찌개", "가성비", "점심", "비 오는 날", "혼밥"]
+    return [" ".join(rng.choice(words, int(rng.integers(3, 120)))) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU 인코딩 벤치마크")
+    parser.add_argument("--model", default=os.getenv("BENCH_LOCAL_MODEL", "sentence-transformers/all-MiniLM-L6-v2"))
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--max-batch-tokens", type=int, default=8192)
+    args = parser.parse_args()
+
+    texts = _texts(args.texts)
+    print(f"모델 {args.model}, 텍스트 {len(texts)}개, 코어 {os.cpu_count()}개")
+
+    # 기준: 지금 embedding_qwen.py와 같은 단일 프로세스, 정렬 없는 batch_size 8
+    model = load_local_model(args.model)
+    start = time.perf_counter()
+    baseline = model.encode(texts, batch_size=8, normalize_embeddings=True, convert_to_numpy=True)
+    baseline_rate = len(texts) / (time.perf_counter() - start)
+    print(f"단일 프로세스 (batch 8): {baseline_rate:,.1f} texts/s")
+    del model
+
+    for workers in args.workers:
+        engine = CPUEncodingEngine(args.model, workers=workers, max_batch_tokens=args.max_batch_tokens)
+        engine.embed_documents(texts[: workers * 2])  # 워커 모델 로딩은 측정에서 뺍니다
+        start = time.perf_counter()
+        vectors = np.asarray(engine.embed_documents(texts), dtype=np.float32)
+        rate = len(texts) / (time.perf_counter() - start)
+        agreement = float(np.min(np.sum(vectors * baseline, axis=1)))
+        print(
+            f"워커 {workers:>2}개 × 스레드 {engine.threads_per_worker:>2}: {rate:,.1f} texts/s "
+            f"(×{rate / baseline_rate:.2f}, 기준과 최소 코사인 {agreement:.5f})"
+        )
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+임베딩 처리량 벤치마크: LangChain 기본 순차 배치 vs ConcurrentEmbedder.
+가짜 임베딩 서버(bench.fake_embedding_server)를 같은 프로세스에서 띄워 OpenAIEmbeddings로 호출합니다.
+
+예시:
+    python -m bench.embedding_throughput --texts 2000 --concurrency 8 --rpm 600 --fail-rate 0.05
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from bench.fake_embedding_server import build_parser, make_server
+from store.pipeline.executor import ConcurrentEmbedder
+
+
+def _texts(n: int):
+    rng = np.random.default_rng(7)
+    menus = ["국밥", "냉면", "돈까스", "초밥", "짬뽕", "샐러드", "쌀국수", "김치찌개"]
+    return [
+        f"# 식당{i} 한식\n## 메뉴\n" + "\n".join(f"  - {m}:{rng.integers(7, 20) * 1000}" for m in rng.choice(menus, 4))
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = build_parser()
+    parser.description = "임베딩 처리량 벤치마크"
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--client-rpm", type=float, default=None, help="실행기에 알려 줄 RPM (기본: 서버 --rpm)")
+    args = parser.parse_args()
+
+    server = make_server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    embeddings = OpenAIEmbeddings(
+        model="fake-embedding",
+        base_url=f"http://127.0.0.1:{args.port}/v1",
+        api_key="fake",
+        chunk_size=args.batch_size,
+        check_embedding_ctx_length=False,
+        max_retries=0,
+    )
+    texts = _texts(args.texts)
+    print(f"텍스트 {len(texts)}개, 배치 {args.batch_size}, 서버 지연 {args.latency_ms}ms + {args.per_item_ms}ms/개")
+
+    # 1) LangChain 기본: chunk_size 단위로 순차 요청 (한도/오류 시 실패하므로 작은 표본으로 잼)
+    sample = texts[: min(len(texts), args.batch_size * 8)]
+    start = time.perf_counter()
+    try:
+        expected = embeddings.embed_documents(sample)
+        sequential = len(sample) / (time.perf_counter() - start)
+        print(f"순차 (LangChain 기본): {sequential:,.1f} embeddings/s  ({len(sample)}개 표본)")
+    except Exception as exc:
+        expected = None
+        print(f"순차 (LangChain 기본): 실패 - {exc}")
+
+    # 2) ConcurrentEmbedder
+    executor = ConcurrentEmbedder.from_langchain(
+        embeddings,
+        max_concurrency=args.concurrency,
+        rpm=args.client_rpm or args.rpm or None,
+        max_batch_size=args.batch_size,
+    )
+    vectors = executor.embed_documents(texts)
+    executor.report()
+
+    if expected is not None:
+        ok = np.allclose(np.asarray(vectors[: len(expected)]), np.asarray(expected), atol=1e-6)
+        print(f"순서 보존: {'✅' if ok else '❌'}")
+    stats = server.RequestHandlerClass.stats
+    print(f"서버: 요청 {stats['requests']}회, 429 {stats['rate_limited']}회, 503 {stats['failed']}회")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
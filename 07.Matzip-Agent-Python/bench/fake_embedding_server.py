@@ -0,0 +1,134 @@
+"""
+OpenAI 호환 가짜 임베딩 서버 (POST /v1/embeddings).
+
+같은 텍스트에는 항상 같은 벡터를 돌려주고, 지연(--latency-ms, --per-item-ms)·
+분당 요청 한도(--rpm, 넘으면 429 + Retry-After)·오류율(--fail-rate, 503)을 흉내 냅니다.
+
+예시:
+    python -m bench.fake_embedding_server --port 5082 --latency-ms 300 --rpm 600
+    OPENAI_BASE_URL=http://127.0.0.1:5082/v1 OPENAI_API_KEY=x python -m store.embedding
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+def fake_vector(text: str, dim: int) -> np.ndarray:
+    """텍스트 해시로 시드를 정한 정규화 벡터."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def make_handler(args):
+    window: deque = deque()
+    lock = threading.Lock()
+    counters = {"requests": 0, "rate_limited": 0, "failed": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        stats = counters
+
+        def _send(self, status: int, body: dict, headers: dict = None) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            with lock:
+                counters["requests"] += 1
+                now = time.monotonic()
+                while window and now - window[0] > 60:
+                    window.popleft()
+                limited = bool(args.rpm) and len(window) >= args.rpm
+                if limited:
+                    counters["rate_limited"] += 1
+                    retry_after = 60 - (now - window[0])
+                else:
+                    window.append(now)
+            if limited:
+                self._send(
+                    429,
+                    {"error": {"message": "rate limit exceeded", "type": "rate_limit_error"}},
+                    {"Retry-After": f"{retry_after:.2f}"},
+                )
+                return
+            if random.random() < args.fail_rate:
+                with lock:
+                    counters["failed"] += 1
+                self._send(503, {"error": {"message": "fake embedding server overloaded"}})
+                return
+
+            texts = body.get("input") or []
+            if isinstance(texts, str):
+                texts = [texts]
+            time.sleep((args.latency_ms + args.per_item_ms * len(texts)) / 1000.0)
+
+            use_base64 = body.get("encoding_format") == "base64"
+            data = []
+            for idx, text in enumerate(texts):
+                vector = fake_vector(str(text), args.dim)
+                embedding = base64.b64encode(vector.tobytes()).decode() if use_base64 else vector.tolist()
+                data.append({"object": "embedding", "index": idx, "embedding": embedding})
+            tokens = sum(len(str(text)) for text in texts)
+            self._send(
+                200,
+                {
+                    "object": "list",
+                    "data": data,
+                    "model": body.get("model", "fake"),
+                    "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+                },
+            )
+
+        def log_message(self, format, *log_args) -> None:
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return Handler
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="가짜 임베딩 서버")
+    parser.add_argument("--port", type=int, default=5082)
+    parser.add_argument("--dim", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="요청당 기본 지연")
+    parser.add_argument("--per-item-ms", type=float, default=2.0, help="텍스트 1개당 추가 지연")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 한도 (0이면 무제한)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503 오류 비율 (0~1)")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def make_server(args) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args))
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    server = make_server(args)
+    print(f"🧪 가짜 임베딩 서버: http://127.0.0.1:{args.port}/v1 (latency {args.latency_ms}ms, rpm {args.rpm or '∞'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+장애 재현용 가짜 Pinecone data-plane 서버.
+
+POST /query 만 구현하며, 지연(--delay-ms)·오류율(--fail-rate)·다운(--down)을 흉내 냅니다.
+--index 를 주면 로컬 벡터 인덱스(agent.vector_index)로 실제 검색 결과를 돌려줍니다 (metadata 필터는 무시).
+
+예시:
+    python -m bench.fake_pinecone --port 5081 --delay-ms 1500 --index ./local_index
+    PINECONE_INDEX_HOST=http://127.0.0.1:5081 streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from agent.vector_index import LocalVectorIndex
+
+
+def make_handler(args, index):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _fault(self) -> bool:
+            """지연을 더하고, 다운/오류를 흉내 냈으면 True."""
+            if args.down:
+                self._send(503, {"error": {"code": "UNAVAILABLE", "message": "fake pinecone down"}})
+                return True
+            time.sleep(args.delay_ms / 1000.0)
+            if random.random() < args.fail_rate:
+                self._send(500, {"error": {"code": "INTERNAL", "message": "fake pinecone error"}})
+                return True
+            return False
+
+        def do_GET(self) -> None:
+            # /vectors/fetch (인덱스 별칭 포인터 조회): 포인터가 없는 인덱스처럼 빈 결과
+            if not self._fault():
+                self._send(200, {"vectors": {}, "namespace": "", "usage": {"readUnits": 1}})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            if self._fault():
+                return
+            if self.path.rstrip("/") != "/query":
+                self._send(200, {})
+                return
+
+            top_k = int(body.get("topK", 4))
+            matches = []
+            if index is not None and body.get("vector"):
+                for idx, score in index.search_vector(body["vector"], k=top_k):
+                    record = index.record(idx)
+                    metadata = dict(record.get("metadata") or {})
+                    metadata["text"] = record.get("page_content", "")
+                    match = {"id": str(metadata.get("restaurant_id", idx)), "score": score, "metadata": metadata}
+                    if body.get("includeValues"):
+                        match["values"] = np.asarray(index.vectors[idx], dtype=np.float32).tolist()
+                    matches.append(match)
+            self._send(200, {"matches": matches, "namespace": body.get("namespace", ""), "usage": {"readUnits": 1}})
+
+        def log_message(self, format, *log_args) -> None:
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 Pinecone 서버")
+    parser.add_argument("--port", type=int, default=5081)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="모든 요청에 더할 지연")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--down", action="store_true", help="항상 503 응답")
+    parser.add_argument("--index", help="결과를 돌려줄 로컬 벡터 인덱스 디렉터리")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    index = LocalVectorIndex(args.index, mode="float32") if args.index else None
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args, index))
+    print(f"🧪 가짜 Pinecone 서버: http://127.0.0.1:{args.port} (delay {args.delay_ms}ms, fail {args.fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+날씨 서비스(app_utils.weather.WeatherService) 재현용 가짜 기상청 서버.
+
+저장해 둔 HTML(bench/fixtures/kma)을 돌려주며, 지연(--delay-ms)·오류율(--fail-rate)·다운(--down)을 흉내 냅니다.
+  GET /current-weather.do  → --weather-html
+  GET /air-quality.do      → --air-html
+
+예시:
+    python -m bench.fake_weather_server --port 5082 --delay-ms 8000
+    WEATHER_URL=http://127.0.0.1:5082/current-weather.do streamlit run app.py
+    python -m bench.fake_weather_server --check --delay-ms 3000 --fail-rate 0.5
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "kma")
+
+
+def make_handler(args, pages):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if args.delay_ms:
+                time.sleep(args.delay_ms / 1000.0)
+            if args.down or random.random() < args.fail_rate:
+                self._send(503, b"service unavailable")
+                return
+            body = pages.get(self.path.split("?", 1)[0].rstrip("/"))
+            if body is None:
+                self._send(404, b"not found")
+                return
+            self._send(200, body)
+
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *log_args) -> None:
+            if args.verbose:
+                super().log_message(format, *log_args)
+
+    return Handler
+
+
+def check(port: int, rounds: int) -> None:
+    """서버를 띄운 채로 WeatherService를 돌려 get() 지연과 스냅샷 신선도를 출력합니다."""
+    from app_utils.weather import WeatherService
+
+    service = WeatherService(
+        weather_url=f"http://127.0.0.1:{port}/current-weather.do",
+        air_quality_url=f"http://127.0.0.1:{port}/air-quality.do",
+        refresh_s=1.0,
+        retry_s=0.5,
+        timeout_s=5.0,
+        stale_s=3.0,
+        cache_path=None,
+    )
+    for i in range(rounds):
+        start = time.perf_counter()
+        weather, error = service.get()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = service.status()
+        summary = f"{weather['temperature']}℃ PM2.5 {weather['pm25']}" if weather else error
+        age = f"{status['age_s']:.1f}s" if status["age_s"] is not None else "-"
+        print(f"{i:>3}  get {elapsed_ms:7.2f}ms  나이 {age:>6}  stale {status['stale']!s:<5}  {summary}")
+        time.sleep(0.5)
+    service.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 기상청 서버")
+    parser.add_argument("--port", type=int, default=5082)
+    parser.add_argument("--weather-html", default=os.path.join(FIXTURES_DIR, "current-weather.html"))
+    parser.add_argument("--air-html", default=os.path.join(FIXTURES_DIR, "air-quality.html"))
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="모든 요청에 더할 지연")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503 오류 비율 (0~1)")
+    parser.add_argument("--down", action="store_true", help="항상 503 응답")
+    parser.add_argument("--check", action="store_true", help="서버를 띄우고 WeatherService 동작을 출력한 뒤 종료")
+    parser.add_argument("--rounds", type=int, default=20, help="--check 조회 횟수")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    pages = {}
+    for path, file in (("/current-weather.do", args.weather_html), ("/air-quality.do", args.air_html)):
+        with open(file, "rb") as f:
+            pages[path] = f.read()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args, pages))
+    print(f"🌦️  가짜 기상청 서버: http://127.0.0.1:{args.port}/current-weather.do")
+    if not args.check:
+        server.serve_forever()
+        return
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    check(args.port, args.rounds)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+격자 GeoIndex 벤치마크 (반경 / k-최근접 질의 vs 전수 haversine).
+
+예시:
+    python -m bench.geo_index --points 10000 100000 --radius 500 --k 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agent.geo import GeoIndex, haversine_m
+
+# 롯데월드 타워 좌표 (app_utils.location 과 동일)
+JAMSIL_CENTER = (37.51246909198778, 127.10282686146004)
+
+
+def _random_points(n: int, spread_m: float, rng: np.random.Generator):
+    """잠실 중심으로 spread_m 반경 안에 무작위 좌표를 만듭니다."""
+    lat0, lon0 = JAMSIL_CENTER
+    dlat = spread_m / 111_195.0
+    dlon = dlat / np.cos(np.radians(lat0))
+    lats = lat0 + rng.uniform(-dlat, dlat, n)
+    lons = lon0 + rng.uniform(-dlon, dlon, n)
+    return lats, lons
+
+
+def _time_us(fn, queries) -> float:
+    start = time.perf_counter()
+    for lat, lon in queries:
+        fn(lat, lon)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(n: int, radius: float, k: int, n_queries: int, spread_m: float) -> None:
+    rng = np.random.default_rng(42)
+    lats, lons = _random_points(n, spread_m, rng)
+    q_lats, q_lons = _random_points(n_queries, spread_m * 0.8, rng)
+    queries = list(zip(q_lats.tolist(), q_lons.tolist()))
+
+    start = time.perf_counter()
+    index = GeoIndex(list(range(n)), lats, lons)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    def brute_within(lat, lon):
+        dist = haversine_m(lat, lon, lats, lons)
+        return np.nonzero(dist <= radius)[0]
+
+    def brute_nearest(lat, lon):
+        dist = haversine_m(lat, lon, lats, lons)
+        return np.argpartition(dist, k)[:k]
+
+    # 정확도 검증: 격자 결과가 전수 계산과 같아야 합니다.
+    for lat, lon in queries[:50]:
+        ids, _ = index.within(lat, lon, radius)
+        assert set(ids.tolist()) == set(brute_within(lat, lon).tolist())
+        ids, _ = index.nearest(lat, lon, k)
+        assert set(ids.tolist()) == set(brute_nearest(lat, lon).tolist())
+
+    within_us = _time_us(lambda lat, lon: index.within(lat, lon, radius), queries)
+    nearest_us = _time_us(lambda lat, lon: index.nearest(lat, lon, k), queries)
+    brute_within_us = _time_us(brute_within, queries)
+    brute_nearest_us = _time_us(brute_nearest, queries)
+
+    print(f"--- points={n:,} (spread {spread_m:.0f} m) ---")
+    print(f"build: {build_ms:.1f} ms")
+    print(f"within({radius:.0f} m): {within_us:.1f} µs  (brute {brute_within_us:.1f} µs)")
+    print(f"nearest(k={k}): {nearest_us:.1f} µs  (brute {brute_nearest_us:.1f} µs)")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GeoIndex 벤치마크")
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--radius", type=float, default=500.0, help="반경 질의 거리 (m)")
+    parser.add_argument("--k", type=int, default=10, help="k-최근접 개수")
+    parser.add_argument("--queries", type=int, default=1000, help="질의 횟수")
+    parser.add_argument("--spread", type=float, default=5000.0, help="점 분포 반경 (m)")
+    args = parser.parse_args()
+
+    for n in args.points:
+        run(n, args.radius, args.k, args.queries, args.spread)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+세션 대화 기록(app_utils.history.SessionHistory) 벤치마크: 대화 길이별 세션 메모리와 재실행 시 그릴 메시지.
+
+날씨 질문(수 KB)과 출처 카드가 붙은 답변을 --turns 만큼 주고받은 세션을 만들어,
+예전 방식(session_state에 전체 목록)과 SessionHistory의 세션 메모리 크기(pickle 바이트),
+재실행 때 그리는 메시지 수와 visible() 시간을 비교합니다. --sessions 개 세션을 동시에 띄운 합계도 출력합니다.
+
+예시:
+    python -m bench.history
+    python -m bench.history --turns 10 100 500 --sessions 300
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+import app_utils.history as history_module
+from app_utils.history import ConversationStore, SessionHistory
+
+WEATHER_QUESTION = "지금 잠실 날씨는 기온 4℃, 체감 -1℃, 습도 40%, 강수 없음, 바람 강함, 미세먼지 나쁨입니다. " * 40
+SOURCES = [
+    {
+        "name": f"잠실 맛집 {i}",
+        "map_link": f"https://map.naver.com/p/entry/place/{1000 + i}",
+        "thumbnail": f"https://search.pstatic.net/common/?src=https%3A%2F%2Fldb-phinf.pstatic.net%2F{i}.jpg",
+    }
+    for i in range(4)
+]
+ANSWER = "오늘처럼 쌀쌀한 날에는 따뜻한 국물 요리를 추천드려요. " * 12
+
+
+def build(turns: int):
+    legacy, history = [], SessionHistory()
+    for turn in range(turns):
+        question = WEATHER_QUESTION if turn == 0 else f"{turn}번째 질문: 근처에 다른 곳도 있나요?"
+        legacy.append({"role": "user", "content": question})
+        legacy.append({"role": "ai", "content": ANSWER, "sources": SOURCES})
+        history.append("user", question)
+        history.append("ai", ANSWER, SOURCES)
+    return legacy, history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="세션 대화 기록 벤치마크")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--sessions", type=int, default=300, help="동시 세션 수 (합계 메모리 추정용)")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        history_module._store = ConversationStore(os.path.join(directory, "history.sqlite"))
+        for turns in args.turns:
+            legacy, history = build(turns)
+            legacy_kb = len(pickle.dumps(legacy)) / 1024
+            session_kb = len(pickle.dumps(history)) / 1024
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                visible = history.visible()
+                timings.append(time.perf_counter() - start)
+            history.show_more()
+            start = time.perf_counter()
+            expanded = history.visible()
+            expanded_ms = (time.perf_counter() - start) * 1000
+            print(
+                f"💬 {turns:>4}턴  세션 메모리 {legacy_kb:8.1f} KB → {session_kb:6.1f} KB  "
+                f"({args.sessions}세션 {legacy_kb * args.sessions / 1024:7.1f} MB → {session_kb * args.sessions / 1024:5.1f} MB)  "
+                f"그리는 메시지 {len(legacy):>4} → {len(visible):>3}  "
+                f"visible p50 {np.percentile(np.array(timings) * 1000, 50):.4f}ms  "
+                f"한 페이지 펼침 {len(expanded)}개 {expanded_ms:.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+MMR 다양화(agent.mmr.mmr_select) 벤치마크: 후보 수/차원/선택 수별 호출 시간과 다양성.
+
+같은 카테고리·장소 유형에 거의 같은 벡터를 가진 "같은 건물 국밥집" 묶음을 섞은 후보에서
+점수순 상위 k개와 MMR 상위 k개가 각각 몇 개의 서로 다른 (카테고리, 장소 유형)을 담는지 비교합니다.
+
+예시:
+    python -m bench.mmr --candidates 200 --dims 4096 1024 --k 4 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agent.mmr import mmr_select
+
+CATEGORIES = ["국밥", "한식", "중식", "일식", "양식", "분식", "카페", "마라탕"]
+LOCATIONS = ["잠실역 지하", "롯데월드몰", "송리단길", "방이동 먹자골목"]
+
+
+def synthetic_candidates(n: int, dim: int, rng: np.random.Generator):
+    """(관련도, 정규화된 벡터, 카테고리, 장소 유형). 관련도 상위권에 같은 건물 국밥집 묶음을 둡니다."""
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    categories = rng.choice(CATEGORIES, n).tolist()
+    locations = rng.choice(LOCATIONS, n).tolist()
+    relevance = rng.random(n)
+
+    cluster = np.argsort(-relevance)[: max(n // 20, 4)]
+    base = vectors[cluster[0]]
+    vectors[cluster] = base + 0.1 * rng.standard_normal((cluster.shape[0], dim)).astype(np.float32)
+    for i in cluster.tolist():
+        categories[i], locations[i] = "국밥", "잠실역 지하"
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return relevance, vectors, categories, locations
+
+
+def _distinct(indices, categories, locations) -> int:
+    return len({(categories[i], locations[i]) for i in indices})
+
+
+def run(n: int, dim: int, k: int, lambda_mult: float, repeats: int) -> None:
+    rng = np.random.default_rng(42)
+    relevance, vectors, categories, locations = synthetic_candidates(n, dim, rng)
+    groups = (categories, locations)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        selected = mmr_select(relevance, k, vectors, groups, lambda_mult=lambda_mult, normalized=True)
+        timings.append(time.perf_counter() - start)
+    timings_ms = np.array(timings) * 1000
+
+    top = np.argsort(-relevance)[:k]
+    print(
+        f"{n:>5}개 x {dim:>5}차원  k={k:<3} p50 {np.percentile(timings_ms, 50):6.3f}ms  "
+        f"p95 {np.percentile(timings_ms, 95):6.3f}ms  "
+        f"서로 다른 (카테고리, 장소) 점수순 {_distinct(top, categories, locations)} → MMR {_distinct(selected, categories, locations)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MMR 다양화 벤치마크")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--dims", type=int, nargs="+", default=[4096, 1024])
+    parser.add_argument("--k", type=int, nargs="+", default=[4, 10])
+    parser.add_argument("--lambda-mult", type=float, default=0.7)
+    parser.add_argument("--repeats", type=int, default=500)
+    args = parser.parse_args()
+    for n in args.candidates:
+        for dim in args.dims:
+            for k in args.k:
+                run(n, dim, k, args.lambda_mult, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
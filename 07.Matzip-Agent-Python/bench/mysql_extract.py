@@ -0,0 +1,137 @@
+"""
+음식점 추출 벤치마크: GROUP BY + GROUP_CONCAT + fetchall() 한 방 조회 vs id 키셋 페이지 조회.
+MySQL 대신 SQLite 파일 DB를 같은 스키마로 만들어 비교합니다 (메뉴 행 수 기준).
+
+예시:
+    python -m bench.mysql_extract --menus 10000 100000 1000000 --page-size 1000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from store.pipeline.sources import ConnectionPool, KeysetRestaurantSource
+
+MENUS_PER_RESTAURANT = 10
+TAGS = ["비 오는 날", "추운 날", "더운 날", "맑은 날", "미세먼지"]
+
+GROUP_CONCAT_SQL = """
+    SELECT
+        r.id, r.name, r.category, r.signature_menu, r.description,
+        r.naver_review_count, r.phone, r.latitude, r.longitude,
+        r.location_type, r.naver_id, r.homepage_url, r.main_thumbnail_url,
+        (SELECT group_concat(m.menu_name || ':' || m.price, ' | ')
+           FROM (SELECT menu_name, price FROM menus
+                  WHERE restaurant_id = r.id AND price >= 7000 AND price <= 20000
+                  ORDER BY price) m) AS menus,
+        (SELECT group_concat(wt.tag_name, ', ')
+           FROM restaurant_weather_tags rwt JOIN weather_tags wt ON rwt.weather_tag_id = wt.id
+          WHERE rwt.restaurant_id = r.id) AS weather_tags
+    FROM restaurants r
+    ORDER BY r.id
+"""
+
+
+def build_db(path: str, n_menus: int) -> None:
+    """restaurants / menus / weather_tags 스키마와 인덱스를 만들고 무작위 데이터를 채웁니다."""
+    rng = random.Random(42)
+    n_restaurants = max(n_menus // MENUS_PER_RESTAURANT, 1)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE restaurants (
+            id INTEGER PRIMARY KEY, name TEXT, category TEXT, signature_menu TEXT,
+            description TEXT, naver_review_count INTEGER, phone TEXT,
+            latitude REAL, longitude REAL, location_type TEXT, naver_id TEXT,
+            homepage_url TEXT, main_thumbnail_url TEXT
+        );
+        CREATE TABLE menus (id INTEGER PRIMARY KEY, restaurant_id INTEGER, menu_name TEXT, price INTEGER);
+        CREATE TABLE weather_tags (id INTEGER PRIMARY KEY, tag_name TEXT);
+        CREATE TABLE restaurant_weather_tags (restaurant_id INTEGER, weather_tag_id INTEGER);
+        CREATE INDEX idx_menus_restaurant_price ON menus (restaurant_id, price);
+        CREATE INDEX idx_rwt_restaurant ON restaurant_weather_tags (restaurant_id);
+        """
+    )
+    conn.executemany("INSERT INTO weather_tags VALUES (?, ?)", list(enumerate(TAGS, start=1)))
+    conn.executemany(
+        "INSERT INTO restaurants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (i, f"식당{i}", "한식", "국밥", "설명 " * 20, rng.randint(0, 5000), "02-000-0000",
+             37.51 + rng.random() / 100, 127.10 + rng.random() / 100, "실내", str(i), "", "")
+            for i in range(1, n_restaurants + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO menus (restaurant_id, menu_name, price) VALUES (?, ?, ?)",
+        (
+            (i // MENUS_PER_RESTAURANT + 1, f"메뉴{i}", rng.randrange(5000, 25000, 500))
+            for i in range(n_restaurants * MENUS_PER_RESTAURANT)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO restaurant_weather_tags VALUES (?, ?)",
+        ((i, t) for i in range(1, n_restaurants + 1) for t in rng.sample(range(1, len(TAGS) + 1), 2)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _measure(fn):
+    """시간과 최대 메모리를 따로 잽니다 (tracemalloc은 파이썬 코드 쪽을 더 느리게 만듭니다)."""
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak / 1e6
+
+
+def run(n_menus: int, page_size: int, directory: str) -> None:
+    path = os.path.join(directory, f"bench_{n_menus}.db")
+    start = time.perf_counter()
+    build_db(path, n_menus)
+    print(f"--- menus={n_menus:,} (DB 생성 {time.perf_counter() - start:.1f}s) ---")
+
+    def fetchall_once() -> int:
+        conn = sqlite3.connect(path)
+        rows = conn.execute(GROUP_CONCAT_SQL).fetchall()
+        conn.close()
+        return len(rows)
+
+    pool = ConnectionPool(lambda: sqlite3.connect(path), size=2)
+
+    def keyset() -> int:
+        # GROUP_CONCAT 쿼리와 같은 가격 구간으로 비교합니다.
+        source = KeysetRestaurantSource(pool, page_size=page_size, min_price=7000, max_price=20000, placeholder="?")
+        count = 0
+        for _row in source.rows():
+            count += 1
+        return count
+
+    rows, elapsed, peak = _measure(fetchall_once)
+    print(f"GROUP_CONCAT + fetchall: {rows:,}행  {elapsed:.2f}s  {rows / elapsed:,.0f} rows/s  최대 메모리 {peak:.1f} MB")
+    rows, elapsed, peak = _measure(keyset)
+    print(f"keyset (page {page_size}):  {rows:,}행  {elapsed:.2f}s  {rows / elapsed:,.0f} rows/s  최대 메모리 {peak:.1f} MB")
+    pool.close()
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MySQL 추출 방식 벤치마크 (SQLite 대체 DB)")
+    parser.add_argument("--menus", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--page-size", type=int, default=1000, help="키셋 페이지당 음식점 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.menus:
+            run(n, args.page_size, directory)
+
+
+if __name__ == "__main__":
+    main()
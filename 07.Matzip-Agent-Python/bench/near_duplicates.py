@@ -0,0 +1,81 @@
+"""
+근접 중복 제거(store.pipeline.dedup) 벤치마크: 행 수별 처리 시간과 정밀도/재현율.
+
+합성 카탈로그에 일부러 지점/재등록 복제(본문 일부 변경 + 근처 좌표)와
+멀리 떨어진 같은 체인점(본문 같음, 좌표 멂)을 섞어 넣고 정답과 비교합니다.
+
+예시:
+    python -m bench.near_duplicates --rows 10000 50000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from store.pipeline.dedup import NearDuplicateIndex
+
+# 롯데월드 타워 좌표 (app_utils.location 과 동일)
+JAMSIL_CENTER = (37.51246909198778, 127.10282686146004)
+CATEGORIES = ["한식", "중식", "일식", "양식", "분식", "카페", "국밥", "마라탕"]
+MENUS = ["김치찌개", "된장찌개", "제육볶음", "짜장면", "짬뽕", "초밥", "돈카츠", "파스타", "떡볶이", "순대국", "마라탕", "라멘"]
+
+
+def _restaurant_text(rng: np.random.Generator, name: str) -> str:
+    menus = rng.choice(len(MENUS), size=6, replace=False)
+    lines = "\n".join(f"- {MENUS[m]}: {int(rng.integers(6, 20)) * 1000}원" for m in menus)
+    return f"{name}\n카테고리: {CATEGORIES[int(rng.integers(len(CATEGORIES)))]}\n리뷰 {int(rng.integers(0, 5000))}개\n메뉴\n{lines}"
+
+
+def synthetic_catalog(n: int, dup_rate: float, seed: int = 42):
+    """(id, 본문, 위도, 경도) 목록과 정답 중복 id 집합."""
+    rng = np.random.default_rng(seed)
+    lat0, lon0 = JAMSIL_CENTER
+    rows, duplicates = [], set()
+    base = []
+    for i in range(n):
+        if base and rng.random() < dup_rate:
+            text, lat, lon = base[int(rng.integers(len(base)))]
+            if rng.random() < 0.2:
+                # 멀리 떨어진 같은 체인점: 본문은 같지만 중복이 아닙니다.
+                rows.append((str(i), text, lat + 0.02, lon + 0.02))
+                continue
+            # 지점/재등록: 가격 하나만 바뀌고 수십 m 안
+            text = text.replace("000원", "500원", 1)
+            rows.append((str(i), text, lat + rng.normal(0, 0.0002), lon + rng.normal(0, 0.0002)))
+            duplicates.add(str(i))
+            continue
+        text = _restaurant_text(rng, f"음식점{i}")
+        lat, lon = lat0 + rng.uniform(-0.03, 0.03), lon0 + rng.uniform(-0.03, 0.03)
+        base.append((text, lat, lon))
+        rows.append((str(i), text, lat, lon))
+    return rows, duplicates
+
+
+def run(n: int, dup_rate: float) -> None:
+    rows, truth = synthetic_catalog(n, dup_rate)
+    index = NearDuplicateIndex()
+    start = time.perf_counter()
+    found = {doc_id for doc_id, text, lat, lon in rows if index.add(doc_id, text, lat, lon) is not None}
+    elapsed = time.perf_counter() - start
+
+    hits = len(found & truth)
+    precision = hits / max(len(found), 1)
+    recall = hits / max(len(truth), 1)
+    print(
+        f"{n:>8}행  {elapsed:6.2f}s  {n / elapsed:8.0f} rows/s  "
+        f"제외 {len(found):>6} (정답 {len(truth):>6})  precision {precision:.3f}  recall {recall:.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="근접 중복 제거 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="복제 행 비율")
+    args = parser.parse_args()
+    for n in args.rows:
+        run(n, args.dup_rate)
+
+
+if __name__ == "__main__":
+    main()
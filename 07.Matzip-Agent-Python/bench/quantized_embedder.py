@@ -0,0 +1,118 @@
+"""
+로컬 임베딩 모델 양자화 벤치마크: float32 vs int8(동적 양자화) vs ONNX.
+
+모드마다 새 프로세스에서 모델을 올려 질의 1개 지연(p50/p95), 모델 로딩 후 RSS 증가량,
+float32 벡터와의 코사인 일치도, 검색 recall@k(문서는 float32 인덱스, 질의만 양자화 모델)를 잽니다.
+recall@k가 --min-recall 보다 낮은 모드가 있으면 종료 코드 1로 끝납니다.
+
+예시:
+    HF_HUB_OFFLINE=1 python -m bench.quantized_embedder --model BAAI/bge-m3 --modes int8 onnx --min-recall 0.95
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+from store.pipeline.local_embedder import load_local_model, local_files_only_from_env
+
+
+def _corpus(n_docs: int, n_queries: int):
+    rng = np.random.default_rng(11)
+    menus = ["국밥", "냉면", "돈까스", "초밥", "짬뽕", "샐러드", "쌀국수", "김치찌개", "파스타", "버거", "우동", "비빔밥"]
+    moods = ["비 오는 날", "추운 날", "더운 날", "혼밥", "회식", "가성비", "데이트", "해장"]
+    docs = [
+        f"식당{i} {' '.join(rng.choice(menus, 3))} 전문점. {rng.choice(moods)}에 좋은 곳, 리뷰 {rng.integers(10, 3000)}개"
+        for i in range(n_docs)
+    ]
+    queries = [f"{rng.choice(moods)} {rng.choice(menus)} 맛집" for _ in range(n_queries)]
+    return docs, queries
+
+
+def _rss_mb() -> float:
+    # 리눅스 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _run_mode(model_name: str, quantize: str, docs, queries, local_files_only: bool, out) -> None:
+    before = _rss_mb()
+    model = load_local_model(model_name, quantize=quantize, local_files_only=local_files_only)
+    encode = lambda texts: np.asarray(  # noqa: E731
+        model.encode(texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False),
+        dtype=np.float32,
+    )
+    encode(queries[:2])  # 첫 호출 준비 비용 제외
+    loaded = _rss_mb()
+
+    latencies = []
+    query_vectors = []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(encode([query])[0])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    doc_vectors = encode(docs) if quantize == "none" else None
+    out.put((quantize, np.asarray(query_vectors), doc_vectors, latencies, loaded - before))
+
+
+def _measure(model_name: str, quantize: str, docs, queries, local_files_only: bool):
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_mode, args=(model_name, quantize, docs, queries, local_files_only, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def _recall_at_k(doc_vectors: np.ndarray, reference: np.ndarray, candidate: np.ndarray, k: int) -> float:
+    """float32 질의의 top-k를 정답으로 두고, 양자화 질의 top-k가 얼마나 겹치는지."""
+    ref_top = np.argsort(-(reference @ doc_vectors.T), axis=1)[:, :k]
+    cand_top = np.argsort(-(candidate @ doc_vectors.T), axis=1)[:, :k]
+    hits = [len(set(r) & set(c)) / k for r, c in zip(ref_top.tolist(), cand_top.tolist())]
+    return float(np.mean(hits))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 임베딩 양자화 벤치마크")
+    parser.add_argument("--model", default=os.getenv("HUGGINGFACE_MODEL", "BAAI/bge-m3"))
+    parser.add_argument("--modes", nargs="+", default=["int8", "onnx"], choices=["int8", "onnx"])
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.95, help="recall@k 통과 기준")
+    args = parser.parse_args()
+
+    docs, queries = _corpus(args.docs, args.queries)
+    local_only = local_files_only_from_env()
+    print(f"모델 {args.model}, 문서 {len(docs)}개, 질의 {len(queries)}개, recall@{args.k} 기준 {args.min_recall}")
+
+    _, ref_queries, doc_vectors, ref_latencies, ref_rss = _measure(args.model, "none", docs, queries, local_only)
+    print(
+        f"- float32: p50 {np.percentile(ref_latencies, 50):.1f}ms, p95 {np.percentile(ref_latencies, 95):.1f}ms, "
+        f"RSS +{ref_rss:.0f}MB"
+    )
+
+    failed = False
+    for mode in args.modes:
+        _, vectors, _, latencies, rss = _measure(args.model, mode, docs, queries, local_only)
+        cosine = np.sum(vectors * ref_queries, axis=1)
+        recall = _recall_at_k(doc_vectors, ref_queries, vectors, args.k)
+        passed = recall >= args.min_recall
+        failed |= not passed
+        print(
+            f"- {mode}: p50 {np.percentile(latencies, 50):.1f}ms "
+            f"(×{np.percentile(ref_latencies, 50) / np.percentile(latencies, 50):.2f}), "
+            f"p95 {np.percentile(latencies, 95):.1f}ms, RSS +{rss:.0f}MB, "
+            f"코사인 평균 {cosine.mean():.4f}/최소 {cosine.min():.4f}, recall@{args.k} {recall:.3f} "
+            f"{'✅ 통과' if passed else '❌ 실패'}"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+LocalVectorIndex 모드별(float32 / int8 / binary) 메모리·QPS·recall@10 벤치마크.
+
+solar-embedding-1-large와 같은 4096차원 합성 벡터(군집 구조)를 사용합니다.
+
+예시:
+    python -m bench.quantized_index --count 20000 --dim 4096 --queries 200
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from agent.vector_index import MODES, LocalVectorIndex
+
+
+def _synthetic(count: int, dim: int, n_queries: int, rng: np.random.Generator):
+    """군집 중심 주변에 흩어진 벡터와, 같은 분포에서 뽑은 질의 벡터."""
+    centers = rng.standard_normal((max(count // 50, 1), dim)).astype(np.float32)
+    labels = rng.integers(0, centers.shape[0], count)
+    vectors = centers[labels] + 0.8 * rng.standard_normal((count, dim)).astype(np.float32)
+    q_labels = rng.integers(0, centers.shape[0], n_queries)
+    queries = centers[q_labels] + 0.8 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+    return vectors, queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="양자화 로컬 인덱스 벤치마크")
+    parser.add_argument("--count", type=int, default=20_000, help="벡터 수")
+    parser.add_argument("--dim", type=int, default=4096, help="차원")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=10, help="shortlist = k × rescore")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors, queries = _synthetic(args.count, args.dim, args.queries, rng)
+    records = [{"page_content": "", "metadata": {"restaurant_id": i}} for i in range(args.count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        LocalVectorIndex.build(directory, vectors, records)
+        print(f"build: {time.perf_counter() - start:.1f}s ({args.count:,} × {args.dim})\n")
+
+        exact = None
+        for mode in MODES:
+            index = LocalVectorIndex(directory, mode=mode, rescore_multiplier=args.rescore)
+            start = time.perf_counter()
+            results = [
+                {idx for idx, _ in index.search_vector(q, k=args.k)} for q in queries
+            ]
+            elapsed = time.perf_counter() - start
+
+            if exact is None:
+                exact = results  # float32 전수 검색을 정답으로 사용
+            recall = np.mean([len(r & e) / args.k for r, e in zip(results, exact)])
+
+            print(f"--- {mode} ---")
+            print(f"memory: {index.memory_bytes() / 2**20:.1f} MiB")
+            print(f"QPS: {len(queries) / elapsed:.1f}")
+            print(f"recall@{args.k}: {recall:.3f}\n")
+
+
+if __name__ == "__main__":
+    main()
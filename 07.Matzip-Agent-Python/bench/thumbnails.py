@@ -0,0 +1,109 @@
+"""
+썸네일 캐시(app_utils.thumbnails.ThumbnailCache) 벤치마크: 페이지당 전송량과 첫 화면/재방문 준비 시간.
+
+Pillow로 만든 원본 크기 사진(--width x --height JPEG)을 로컬 HTTP 서버에서 내려주고,
+출처 카드 한 페이지(--per-page 장)를 처음 볼 때(받아서 줄임), 다시 볼 때(메모리), 프로세스를 새로 띄운 뒤(디스크)
+준비 시간과 바이트 수를 원본과 비교합니다. --cache-mb 를 작게 주면 LRU 삭제도 확인할 수 있습니다.
+
+예시:
+    python -m bench.thumbnails
+    python -m bench.thumbnails --pages 20 --per-page 4 --cache-mb 0.2
+"""
+
+import argparse
+import io
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from app_utils.thumbnails import ThumbnailCache
+
+
+def make_photo(width: int, height: int, seed: int) -> bytes:
+    """음식 사진처럼 결이 있는 원본 JPEG (단색보다 압축이 덜 되도록 잡음을 섞음)."""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    pixels = gradient * rng.random(3, dtype=np.float32) + rng.normal(0, 24, (height, width, 3))
+    out = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def serve(photos, delay_ms: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(delay_ms / 1000.0)
+            body = photos.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, format, *log_args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_pages(cache: ThumbnailCache, pages):
+    timings, sizes = [], []
+    for urls in pages:
+        start = time.perf_counter()
+        images = cache.get_many(urls)
+        timings.append(time.perf_counter() - start)
+        sizes.append(sum(len(data or b"") for data in images.values()))
+    return np.array(timings) * 1000, np.array(sizes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="썸네일 캐시 벤치마크")
+    parser.add_argument("--pages", type=int, default=10, help="출처 카드 페이지 수")
+    parser.add_argument("--per-page", type=int, default=4, help="페이지당 썸네일 수")
+    parser.add_argument("--width", type=int, default=1200)
+    parser.add_argument("--height", type=int, default=900)
+    parser.add_argument("--delay-ms", type=float, default=80.0, help="원본 서버 응답 지연")
+    parser.add_argument("--cache-mb", type=float, default=200.0)
+    parser.add_argument("--format", default="WEBP")
+    args = parser.parse_args()
+
+    count = args.pages * args.per_page
+    photos = {f"/photo/{i}.jpg": make_photo(args.width, args.height, i) for i in range(count)}
+    server = serve(photos, args.delay_ms)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    paths = list(photos)
+    pages = [[base + path for path in paths[i : i + args.per_page]] for i in range(0, count, args.per_page)]
+    original = np.array([sum(len(photos[p]) for p in paths[i : i + args.per_page]) for i in range(0, count, args.per_page)])
+
+    directory = tempfile.mkdtemp(prefix="thumbnail_bench_")
+    options = dict(directory=directory, max_bytes=int(args.cache_mb * 1024 * 1024), fmt=args.format.upper())
+    try:
+        cache = ThumbnailCache(**options)
+        cold_ms, sizes = run_pages(cache, pages)
+        warm_ms, _ = run_pages(cache, pages)
+        disk_ms, _ = run_pages(ThumbnailCache(**options), pages)  # 새 프로세스처럼 메모리 캐시 없이
+        stats = cache.stats()
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"🖼️  {args.pages}페이지 x {args.per_page}장, 원본 {args.width}x{args.height} JPEG")
+    print(
+        f"   - 페이지당 전송량: 원본 {original.mean() / 1024:8.1f} KB → 썸네일 {sizes.mean() / 1024:6.1f} KB "
+        f"({original.mean() / max(sizes.mean(), 1):.1f}x 감소)"
+    )
+    for label, timings in (("첫 화면 (받아서 줄임)", cold_ms), ("재실행 (메모리)", warm_ms), ("재시작 후 (디스크)", disk_ms)):
+        print(f"   - {label:<16} p50 {np.percentile(timings, 50):8.3f}ms  p95 {np.percentile(timings, 95):8.3f}ms")
+    print(f"   - 디스크 캐시: 파일 {stats['files']}개, {stats['disk_bytes'] / 1024:.1f} KB (상한 {args.cache_mb} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+기상청 HTML 파싱 방식(app_utils.weather.PARSERS) 벤치마크: 결과 일치 검사, 파싱 시간, 최대 메모리.
+
+저장해 둔 페이지(기본값 bench/fixtures/kma/*.html)마다 scan/strainer 결과가 full(전체 트리) 결과와
+같은지 먼저 확인한 뒤, 방식별 p50 파싱 시간과 tracemalloc 최대 할당량(페이지별 중앙값/최댓값)을 비교합니다.
+.wthema-a가 없는 페이지(점검 페이지 등)는 scan도 전체 파싱으로 다시 확인하므로 최댓값은 full과 비슷합니다.
+실제 페이지는 머리말/메뉴/스크립트가 더 붙어 있으므로 --pad-kb 로 앞뒤에 그만큼 다른 마크업을 덧붙여 봅니다.
+
+예시:
+    python -m bench.weather_parse
+    python -m bench.weather_parse --pad-kb 0 64 256
+    python -m bench.weather_parse --save bench/fixtures/kma   # 지금 기상청 페이지를 코퍼스에 추가
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app_utils.weather import PARSERS, WEATHER_PARAMS, WEATHER_URL, parse_air_quality_html, parse_weather_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "kma")
+
+
+def padding(kb: int) -> str:
+    """메뉴/예보 표 모양의 관련 없는 마크업 약 kb KB."""
+    row = (
+        '<li class="gnb-item"><a href="/w/weather/forecast/short-term.do" class="link">단기예보</a>'
+        '<ul class="sub"><li><span class="tmp">12℃</span><span class="val">30 %</span></li></ul></li>\n'
+    )
+    return '<ul class="gnb">\n' + row * (kb * 1024 // len(row.encode())) + "</ul>\n"
+
+
+def pad_page(html: str, kb: int) -> str:
+    if kb <= 0:
+        return html
+    extra = padding(kb // 2)
+    body = html.find("<body>")
+    if body < 0:
+        return extra + html + extra
+    body += len("<body>")
+    end = html.rfind("</body>")
+    end = end if end > body else len(html)
+    return html[:body] + extra + html[body:end] + extra + html[end:]
+
+
+def parse_all(html: str, parser: str):
+    return parse_weather_html(html, parser=parser), parse_air_quality_html(html, parser=parser)
+
+
+def check_identical(pages) -> bool:
+    ok = True
+    for name, html in pages:
+        expected = parse_all(html, "full")
+        for parser in PARSERS:
+            got = parse_all(html, parser)
+            if got != expected:
+                ok = False
+                print(f"❌ {name}: {parser} 결과가 다릅니다\n   full   {expected}\n   {parser:<6} {got}")
+    return ok
+
+
+def measure(pages, parser: str, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        for _name, html in pages:
+            start = time.perf_counter()
+            parse_weather_html(html, parser=parser)
+            timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    peaks = []
+    for _name, html in pages:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        parse_weather_html(html, parser=parser)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return np.percentile(np.array(timings) * 1000, 50), np.array(peaks)
+
+
+def save_page(directory: str) -> None:
+    import requests
+
+    resp = requests.get(WEATHER_URL, params=WEATHER_PARAMS, timeout=10)
+    resp.raise_for_status()
+    path = os.path.join(directory, time.strftime("kma-%Y%m%d-%H%M%S.html"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(resp.text)
+    print(f"💾 저장: {path} ({len(resp.text) / 1024:.1f} KB)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="기상청 HTML 파싱 벤치마크")
+    parser.add_argument("--corpus", default=os.path.join(FIXTURES_DIR, "*.html"), help="페이지 glob")
+    parser.add_argument("--pad-kb", type=int, nargs="+", default=[0, 64])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--save", metavar="DIR", help="현재 기상청 페이지를 DIR에 저장하고 종료")
+    args = parser.parse_args()
+
+    if args.save:
+        save_page(args.save)
+        return
+
+    corpus = []
+    for path in sorted(glob.glob(args.corpus)):
+        with open(path, encoding="utf-8") as f:
+            corpus.append((os.path.basename(path), f.read()))
+    if not corpus:
+        print(f"⚠️ 페이지가 없습니다: {args.corpus}")
+        sys.exit(1)
+
+    for kb in args.pad_kb:
+        pages = [(name, pad_page(html, kb)) for name, html in corpus]
+        size_kb = np.mean([len(html.encode()) for _name, html in pages]) / 1024
+        identical = check_identical(pages)
+        print(f"\n📄 {len(pages)}개 페이지 (평균 {size_kb:.1f} KB) 결과 일치: {'✅' if identical else '❌'}")
+        baseline = None
+        for name in ("full", "strainer", "scan"):
+            p50_ms, peaks = measure(pages, name, args.repeats)
+            baseline = baseline or p50_ms
+            print(
+                f"   - {name:<8} p50 {p50_ms:8.3f}ms  ({baseline / p50_ms:5.1f}x)  "
+                f"최대 메모리 p50 {np.median(peaks) / 1024:8.1f} KB / max {peaks.max() / 1024:8.1f} KB"
+            )
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
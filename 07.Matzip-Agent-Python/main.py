@@ -2,6 +2,7 @@ import ast
 import re
 from typing import Any, Dict, List, Optional
 
+from agent.filters import SearchFilter
 from agent.graph import graph
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.documents import Document
@@ -77,25 +78,51 @@ def _extract_sources_from_result(docs: Any) -> List[Dict[str, str]]:
 
     return sources
 
-def get_agent_response(message: str):
-    initial_state = {
+def build_initial_state(
+    message: str,
+    search_filter: Optional[SearchFilter] = None,
+    user_location: Optional[Dict[str, float]] = None,
+    weather: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    return {
         "messages": [HumanMessage(content=message)],
+        "search_filter": search_filter,
+        "user_location": user_location,
+        "weather": weather,
     }
+
+
+def build_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """그래프 최종 상태에서 답변과 출처(지도 링크/썸네일)를 뽑습니다."""
+    # The final response is in the last AIMessage of the 'messages' list
+    final_response = next(
+        (m.content for m in reversed(result["messages"]) if isinstance(m, AIMessage) and m.content),
+        "Sorry, I couldn't find an answer.",
+    )
+    # 재정렬된 문서(없으면 마지막 도구 호출)에서 메타데이터를 추출해 지도 링크/썸네일을 함께 반환
+    last_tool_message = next(
+        (m for m in reversed(result["messages"]) if getattr(m, "type", "") == "tool"),
+        None,
+    )
+    sources = _extract_sources_from_result(
+        result.get("documents")
+        or getattr(last_tool_message, "artifact", None)
+        or getattr(last_tool_message, "content", None)
+    )
+
+    return {"answer": final_response, "sources": sources}
+
+
+def get_agent_response(
+    message: str,
+    search_filter: Optional[SearchFilter] = None,
+    user_location: Optional[Dict[str, float]] = None,
+    weather: Optional[Dict[str, Any]] = None,
+):
+    initial_state = build_initial_state(message, search_filter, user_location, weather)
     try:
         result = graph.invoke(initial_state)
-        # The final response is in the last AIMessage of the 'messages' list
-        final_response = next(
-            (m.content for m in reversed(result["messages"]) if isinstance(m, AIMessage) and m.content),
-            "Sorry, I couldn't find an answer.",
-        )
-        # 마지막 도구 호출에서 메타데이터를 추출해 지도 링크/썸네일을 함께 반환
-        last_tool_message = next(
-            (m for m in reversed(result["messages"]) if getattr(m, "type", "") == "tool"),
-            None,
-        )
-        sources = _extract_sources_from_result(getattr(last_tool_message, "content", None))
-
-        return {"answer": final_response, "sources": sources}
+        return build_response(result)
     except Exception as e:
         print(f"Error: {e}")
         return f"An error occurred: {e}"
@@ -1,220 +1,49 @@
 """
 MySQL 데이터를 Markdown으로 만들어 ChromaDB에 임베딩하는 스크립트.
-블로그 로더 대신 DB에서 불러온 레스토랑 데이터를 사용합니다.
+
+예시:
+    python -m store.embedding
 """
 
 import os
-from typing import Dict, List
 
-import pymysql
 from dotenv import load_dotenv
-from langchain_core.documents import Document
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+
+from store.pipeline import (
+    ChromaSink,
+    DirectoryVersions,
+    IndexManifest,
+    KeysetRestaurantSource,
+    dedup_template,
+    document_template,
+    load_concurrent_embedder,
+    mysql_pool,
+    new_version,
+    optimized_text,
+    run_pipeline,
+    test_search,
+)
 
 load_dotenv()
 
 # ==================== 설정 ====================
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다")
-
-MYSQL_CONFIG = {
-    "host": os.getenv("MYSQL_HOST", "localhost"),
-    "user": os.getenv("MYSQL_USER", "root"),
-    "password": os.getenv("MYSQL_PASSWORD"),
-    "database": os.getenv("MYSQL_DATABASE"),
-    "charset": "utf8mb4",
-    "cursorclass": pymysql.cursors.DictCursor,
-}
-
-if not MYSQL_CONFIG["password"]:
-    raise ValueError("MYSQL_PASSWORD가 .env 파일에 설정되지 않았습니다")
-if not MYSQL_CONFIG["database"]:
-    raise ValueError("MYSQL_DATABASE가 .env 파일에 설정되지 않았습니다")
-
 CHROMA_DB_PATH = "./chroma_db"
 COLLECTION_NAME = "jamsil_restaurants"
 EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))  # 파이프라인 배치 (요청 단위는 EMBEDDING_REQUEST_SIZE)
 
+# 바뀐 음식점만 다시 임베딩하기 위한 내용 해시 기록 (REINDEX_FULL=1 이면 전체 재임베딩)
+INDEX_MANIFEST_PATH = os.getenv("INDEX_MANIFEST_PATH", os.path.join(CHROMA_DB_PATH, "index_manifest.json"))
+REINDEX_FULL = os.getenv("REINDEX_FULL", "0") == "1"
 
-# ==================== 함수 정의 ====================
-def get_mysql_connection() -> pymysql.connections.Connection:
-    """MySQL 연결 생성"""
-    try:
-        connection = pymysql.connect(**MYSQL_CONFIG)
-        print("✅ MySQL 연결 성공")
-        return connection
-    except Exception as exc:
-        print(f"❌ MySQL 연결 실패: {exc}")
-        raise
-
-
-def fetch_restaurants_data(connection: pymysql.connections.Connection) -> List[Dict]:
-    """음식점과 메뉴/날씨 태그를 조인하여 조회"""
-    query = """
-        SELECT
-            r.id,
-            r.name,
-            r.category,
-            r.signature_menu,
-            r.description,
-            r.naver_review_count,
-            r.phone,
-            r.latitude,
-            r.longitude,
-            r.location_type,
-            r.naver_id,
-            r.homepage_url,
-            r.main_thumbnail_url,
-            GROUP_CONCAT(DISTINCT m.menu_name, ':', m.price ORDER BY m.price SEPARATOR ' | ') AS menus,
-            GROUP_CONCAT(DISTINCT wt.tag_name SEPARATOR ', ') AS weather_tags
-        FROM restaurants r
-        LEFT JOIN menus m ON r.id = m.restaurant_id 
-            AND m.price >= 7000 
-            AND m.price <= 20000
-        LEFT JOIN restaurant_weather_tags rwt ON r.id = rwt.restaurant_id
-        LEFT JOIN weather_tags wt ON rwt.weather_tag_id = wt.id
-        GROUP BY r.id
-        ORDER BY r.id
-    """
-
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            print(f"✅ {len(results)}개의 음식점 데이터 조회 완료")
-            return results
-    except Exception as exc:
-        print(f"❌ 데이터 조회 실패: {exc}")
-        raise
-
-
-
-def create_optimized_embedding_text(restaurant: Dict) -> str:
-    """검색 최적화된 텍스트 생성"""
-    
-    # 핵심 정보를 반복하여 가중치 부여
-    core_info = f"{restaurant['name']} {restaurant['category']}"
-    
-    # 메뉴 정보 강조
-    menus_text = ""
-    if restaurant.get("menus"):
-        menu_list = restaurant["menus"].split(" | ")
-        menus_text = "\n".join(f"  - {menu}" for menu in menu_list)
-    
-    
-    # 최적화된 순서로 조합
-    optimized_text = f"""
-# {core_info}
-
-## 메뉴
-{menus_text}
-
-## 특징:
-{restaurant.get('description', '')}
-위치: {restaurant.get('location_type', '')}
-날씨태그: {restaurant.get('weather_tags', '')}
-    """.strip()
-    
-    return optimized_text
-
-
-def create_markdown_document(restaurant: Dict) -> str:
-    """음식점 데이터를 Markdown 문자열로 변환"""
-    menus_text = ""
-    if restaurant.get("menus"):
-        menu_list = restaurant["menus"].split(" | ")
-        menus_text = "\n".join(f"  - {menu}" for menu in menu_list)
-
-    markdown = f"""# {restaurant['name']}
-
-## 기본 정보
-- **카테고리**: {restaurant['category']}
-- **대표메뉴**: {restaurant.get('signature_menu') or '정보 없음'}
-- **위치 타입**: {restaurant.get('location_type') or '일반 음식점'}
-- **네이버 리뷰수**: {restaurant.get('naver_review_count')}
-
-## 메뉴
-{menus_text or '  - 메뉴 정보 없음'}
+# 1이면 CHROMA_DB_PATH/versions/<버전>/ 에 새로 만들고 다 끝난 뒤 CHROMA_DB_PATH/current.json 포인터만 바꿉니다.
+# 앱은 포인터를 보고 재시작 없이 갈아타며, 바뀌지 않은 음식점은 임베딩 캐시(EMBEDDING_CACHE_PATH)로 재사용하세요.
+INDEX_VERSIONED = os.getenv("INDEX_VERSIONED", "0") == "1"
+INDEX_KEEP_VERSIONS = int(os.getenv("INDEX_KEEP_VERSIONS", "2"))
 
-## 설명
-{restaurant.get('description') or '설명 없음'}
-
-## 날씨 태그
-{restaurant.get('weather_tags') or '태그 없음'}
-
-## 위치 정보
-- 위도: {restaurant.get('latitude')}
-- 경도: {restaurant.get('longitude')}
-"""
-    return markdown.strip()
-
-
-def convert_to_langchain_documents(restaurants: List[Dict]) -> List[Document]:
-    """MySQL 데이터를 LangChain Document 객체로 변환"""
-    documents: List[Document] = []
-
-    for restaurant in restaurants:
-        content = create_optimized_embedding_text(restaurant)
-        metadata = {
-            "restaurant_id": restaurant["id"],
-            "name": restaurant["name"],
-            "category": restaurant["category"],
-            "location_type": restaurant.get("location_type") or "",
-            "latitude": float(restaurant["latitude"]),
-            "longitude": float(restaurant["longitude"]),
-            "main_thumbnail_url": restaurant.get("main_thumbnail_url") or "",
-            "homepage_url": restaurant.get("homepage_url") or "",
-            "naver_review_count": restaurant["naver_review_count"],
-            "naver_id": restaurant.get("naver_id") or "",
-            "phone": restaurant.get("phone") or "",
-            "signature_menu": restaurant.get("signature_menu") or "",
-            "weather_tags": restaurant.get("weather_tags") or "",
-        }
-        documents.append(Document(page_content=content, metadata=metadata))
-
-    print(f"✅ {len(documents)}개의 Document 객체 생성 완료")
-    return documents
-
-
-def create_chromadb_vectorstore(documents: List[Document]) -> Chroma:
-    """OpenAI 임베딩으로 ChromaDB에 저장"""
-    try:
-        print(f"📦 OpenAI 임베딩 모델 초기화: {EMBEDDING_MODEL}")
-        embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
-
-        os.makedirs(CHROMA_DB_PATH, exist_ok=True)
-        print(f"💾 ChromaDB에 임베딩 중... (총 {len(documents)}개 문서)")
-
-        vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=embeddings,
-            collection_name=COLLECTION_NAME,
-            persist_directory=CHROMA_DB_PATH,
-        )
-
-        print(f"✅ ChromaDB 저장 완료: {CHROMA_DB_PATH}")
-        print(f"   컬렉션명: {COLLECTION_NAME}")
-        return vectorstore
-    except Exception as exc:
-        print(f"❌ ChromaDB 생성 실패: {exc}")
-        raise
-
-
-def test_search(vectorstore: Chroma, query: str = "냉면") -> None:
-    """임베딩 결과를 간단히 검색 테스트"""
-    print(f"\n🔍 테스트 검색: '{query}'")
-    results = vectorstore.similarity_search(query, k=3)
-
-    print(f"검색 결과 {len(results)}개:")
-    for idx, doc in enumerate(results, start=1):
-        print(f"\n--- 결과 {idx} ---")
-        print(f"이름: {doc.metadata.get('name')}")
-        print(f"카테고리: {doc.metadata.get('category')}")
-        print(f"대표메뉴: {doc.metadata.get('signature_menu')}")
-        print(f"위치: {doc.metadata.get('location_type')}")
-        print(f"리뷰수: {doc.metadata.get('naver_review_count')}")
+# 1이면 임베딩 전에 본문이 거의 같고 가까운 음식점(지점/재등록)을 묶어 대표 하나만 임베딩합니다.
+# 검색되는 음식점이 바뀌고 소스를 한 번 더 읽으므로 기본은 끕니다 (묶인 id는 대표 문서의 duplicate_ids에 남음).
+INDEX_DEDUP = os.getenv("INDEX_DEDUP", "0") == "1"
 
 
 # ==================== 메인 실행 ====================
@@ -224,18 +53,33 @@ def main() -> None:
     print("MySQL → ChromaDB 임베딩 시작")
     print("=" * 60)
 
-    connection = None
     try:
-        connection = get_mysql_connection()
-        restaurants = fetch_restaurants_data(connection)
-
-        if not restaurants:
+        source = KeysetRestaurantSource(mysql_pool())
+        embeddings = load_concurrent_embedder("openai", EMBEDDING_MODEL)
+        versions = DirectoryVersions(CHROMA_DB_PATH, keep=INDEX_KEEP_VERSIONS) if INDEX_VERSIONED else None
+        version = new_version() if versions else None
+        sink = ChromaSink(versions.path(version) if versions else CHROMA_DB_PATH, COLLECTION_NAME)
+
+        template = document_template(optimized_text)
+        if INDEX_DEDUP:
+            template = dedup_template(source.rows(), template)
+
+        stats = run_pipeline(
+            source.rows(),
+            template,
+            embeddings,
+            sink,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            # 버전 빌드는 매번 빈 디렉터리에 쓰므로 증분 기록을 쓰지 않습니다.
+            manifest=None if versions else IndexManifest(INDEX_MANIFEST_PATH, model=EMBEDDING_MODEL, full=REINDEX_FULL),
+        )
+        if not stats["source"].rows:
             print("⚠️  조회된 데이터가 없습니다.")
             return
+        if versions:
+            versions.publish(version, model=EMBEDDING_MODEL, count=stats["sink"].rows)
 
-        documents = convert_to_langchain_documents(restaurants)
-        vectorstore = create_chromadb_vectorstore(documents)
-
+        vectorstore = sink.as_vectorstore(embeddings)
         test_search(vectorstore, "순대국 가성비")
         test_search(vectorstore, "날씨 좋을 때 먹기 좋은 음식")
 
@@ -247,10 +91,6 @@ def main() -> None:
         import traceback
 
         traceback.print_exc()
-    finally:
-        if connection:
-            connection.close()
-            print("MySQL 연결 종료")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+"""
+MySQL 데이터를 한 번만 임베딩해 여러 저장소(Pinecone/ChromaDB/로컬 벡터 인덱스)에 동시에 쓰는 스크립트.
+store.embedding_upstage(Pinecone)와 로컬 개발용 ChromaDB를 따로 돌려 두 번 임베딩하던 것을 대신합니다.
+
+저장소는 SINKS 로 고릅니다 (쉼표 구분, 기본값: pinecone,chroma,local).
+끝나면 저장소별 쓰기 수/저장 수/체크섬을 비교한 일관성 보고서를 출력하고 FANOUT_REPORT_PATH 에 저장합니다.
+
+예시:
+    python -m store.embedding_fanout
+    SINKS=chroma,local python -m store.embedding_fanout
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from store.pipeline import (
+    ChromaSink,
+    FanoutSink,
+    IndexManifest,
+    KeysetRestaurantSource,
+    LocalIndexSink,
+    PineconeSink,
+    dedup_template,
+    document_template,
+    load_concurrent_embedder,
+    mysql_pool,
+    optimized_text_with_links,
+    run_pipeline,
+    test_search,
+)
+
+load_dotenv()
+
+# ==================== 설정 ====================
+# 모든 저장소가 같은 벡터를 받으므로 모델도 하나입니다 (앱의 upstage 검색과 같은 모델).
+EMBEDDING_MODEL = "solar-embedding-1-large"
+EMBEDDING_DIMENSION = 4096  # solar-embedding-1-large 출력 차원
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))  # 파이프라인 배치 (요청 단위는 EMBEDDING_REQUEST_SIZE)
+
+SINKS = [name.strip() for name in os.getenv("SINKS", "pinecone,chroma,local").split(",") if name.strip()]
+
+PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "jamsil-restaurants-upstage")
+PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "public")
+PINECONE_CLOUD = os.getenv("PINECONE_CLOUD", "aws")
+PINECONE_REGION = os.getenv("PINECONE_REGION", "us-east-1")
+
+CHROMA_DB_PATH = "./chroma_db_upstage"
+COLLECTION_NAME = "jamsil_restaurants_upstage"
+
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "./local_index")
+
+# 저장소별 쓰기 묶음 크기 (Pinecone은 PineconeSink가 요청 크기 제한에 맞춰 한 번 더 나눕니다)
+SINK_BATCH_SIZES = {"pinecone": 128, "chroma": 256, "local": EMBEDDING_BATCH_SIZE}
+SINK_MAX_RETRIES = int(os.getenv("SINK_MAX_RETRIES", "5"))
+FANOUT_REPORT_PATH = os.getenv("FANOUT_REPORT_PATH", "./fanout_report.json")
+
+# 바뀐 음식점만 다시 임베딩하기 위한 내용 해시 기록은 저장소 조합마다 하나입니다.
+# 저장소를 새로 추가했다면 그 저장소는 비어 있으므로 REINDEX_FULL=1 로 한 번 전체 색인하세요.
+INDEX_MANIFEST_PATH = os.getenv("INDEX_MANIFEST_PATH", f"./index_manifest_fanout_{'_'.join(sorted(SINKS))}.json")
+REINDEX_FULL = os.getenv("REINDEX_FULL", "0") == "1"
+
+# 1이면 임베딩 전에 본문이 거의 같고 가까운 음식점(지점/재등록)을 묶어 대표 하나만 임베딩합니다.
+# 검색되는 음식점이 바뀌고 소스를 한 번 더 읽으므로 기본은 끕니다 (묶인 id는 대표 문서의 duplicate_ids에 남음).
+INDEX_DEDUP = os.getenv("INDEX_DEDUP", "0") == "1"
+
+
+def open_sink(name: str):
+    if name == "pinecone":
+        return PineconeSink(
+            PINECONE_INDEX_NAME,
+            PINECONE_NAMESPACE,
+            EMBEDDING_DIMENSION,
+            cloud=PINECONE_CLOUD,
+            region=PINECONE_REGION,
+        )
+    if name == "chroma":
+        return ChromaSink(CHROMA_DB_PATH, COLLECTION_NAME)
+    if name == "local":
+        return LocalIndexSink(LOCAL_INDEX_PATH, model=EMBEDDING_MODEL)
+    raise ValueError(f"알 수 없는 저장소: {name} (pinecone/chroma/local)")
+
+
+# ==================== 메인 실행 ====================
+def main() -> None:
+    """MySQL→(Pinecone, Chroma, 로컬 인덱스) 전체 실행"""
+    print("=" * 60)
+    print(f"MySQL → {', '.join(SINKS)} 임베딩 시작")
+    print("=" * 60)
+
+    try:
+        source = KeysetRestaurantSource(
+            mysql_pool(),
+            review_column="naver_place_review_count",
+            # 재정렬의 날씨 특성이 metadata["weather_tags"]를 읽으므로 태그는 항상 함께 저장합니다.
+            weather_tags=True,
+            signature_menu=False,
+        )
+        embeddings = load_concurrent_embedder("upstage", EMBEDDING_MODEL)
+        sink = FanoutSink(
+            {name: open_sink(name) for name in SINKS},
+            batch_sizes=SINK_BATCH_SIZES,
+            max_retries=SINK_MAX_RETRIES,
+            report_path=FANOUT_REPORT_PATH,
+        )
+
+        template = document_template(optimized_text_with_links)
+        if INDEX_DEDUP:
+            template = dedup_template(source.rows(), template)
+
+        stats = run_pipeline(
+            source.rows(),
+            template,
+            embeddings,
+            sink,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            manifest=IndexManifest(INDEX_MANIFEST_PATH, model=EMBEDDING_MODEL, full=REINDEX_FULL),
+        )
+        if not stats["source"].rows:
+            print("⚠️  조회된 데이터가 없습니다.")
+            return
+
+        vectorstore = sink.as_vectorstore(embeddings)
+        test_search(vectorstore, "순대국 가성비")
+
+        print("\n" + "=" * 60)
+        print("✅ 모든 작업 완료!")
+        print("=" * 60)
+    except Exception as exc:
+        print(f"\n❌ 오류 발생: {exc}")
+        import traceback
+
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,227 +1,54 @@
 """
 MySQL 데이터를 Markdown으로 만들어 Pinecone에 임베딩하는 스크립트.
 블로그 로더 대신 DB에서 불러온 레스토랑 데이터를 사용합니다.
+
+예시:
+    python -m store.embedding_upstage
 """
 
 import os
-import time
-from typing import Dict, List
 
-import pymysql
 from dotenv import load_dotenv
-from langchain_core.documents import Document
-from langchain_pinecone import PineconeVectorStore
-from langchain_upstage import UpstageEmbeddings
-from pinecone import Pinecone, ServerlessSpec
+
+from store.pipeline import (
+    IndexManifest,
+    KeysetRestaurantSource,
+    NamespaceVersions,
+    PineconeSink,
+    dedup_template,
+    document_template,
+    load_concurrent_embedder,
+    mysql_pool,
+    new_version,
+    optimized_text_with_links,
+    run_pipeline,
+    test_search,
+)
 
 load_dotenv()
 
 # ==================== 설정 ====================
-UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY")
-if not UPSTAGE_API_KEY:
-    raise ValueError("UPSTAGE_API_KEY가 .env 파일에 설정되지 않았습니다")
-
-MYSQL_CONFIG = {
-    "host": os.getenv("MYSQL_HOST", "localhost"),
-    "user": os.getenv("MYSQL_USER", "root"),
-    "password": os.getenv("MYSQL_PASSWORD"),
-    "database": os.getenv("MYSQL_DATABASE"),
-    "charset": "utf8mb4",
-    "cursorclass": pymysql.cursors.DictCursor,
-}
-
-if not MYSQL_CONFIG["password"]:
-    raise ValueError("MYSQL_PASSWORD가 .env 파일에 설정되지 않았습니다")
-if not MYSQL_CONFIG["database"]:
-    raise ValueError("MYSQL_DATABASE가 .env 파일에 설정되지 않았습니다")
-
 EMBEDDING_MODEL = "solar-embedding-1-large"
 EMBEDDING_DIMENSION = 4096  # solar-embedding-1-large 출력 차원
-
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-if not PINECONE_API_KEY:
-    raise ValueError("PINECONE_API_KEY가 .env 파일에 설정되지 않았습니다")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))  # 파이프라인 배치 (요청 단위는 EMBEDDING_REQUEST_SIZE)
 
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "jamsil-restaurants-upstage")
 PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "public")
 PINECONE_CLOUD = os.getenv("PINECONE_CLOUD", "aws")
 PINECONE_REGION = os.getenv("PINECONE_REGION", "us-east-1")
 
+# 바뀐 음식점만 다시 임베딩하기 위한 내용 해시 기록 (REINDEX_FULL=1 이면 전체 재임베딩)
+INDEX_MANIFEST_PATH = os.getenv("INDEX_MANIFEST_PATH", f"./index_manifest_{PINECONE_INDEX_NAME}_{PINECONE_NAMESPACE}.json")
+REINDEX_FULL = os.getenv("REINDEX_FULL", "0") == "1"
 
-# ==================== 함수 정의 ====================
-def get_mysql_connection() -> pymysql.connections.Connection:
-    """MySQL 연결 생성"""
-    try:
-        connection = pymysql.connect(**MYSQL_CONFIG)
-        print("✅ MySQL 연결 성공")
-        return connection
-    except Exception as exc:
-        print(f"❌ MySQL 연결 실패: {exc}")
-        raise
-
-
-def fetch_restaurants_data(connection: pymysql.connections.Connection) -> List[Dict]:
-    """음식점과 메뉴/날씨 태그를 조인하여 조회"""
-    query = """
-        SELECT
-            r.id,
-            r.name,
-            r.category,
-            r.description,
-            r.naver_place_review_count as naver_review_count,
-            r.phone,
-            r.latitude,
-            r.longitude,
-            r.location_type,
-            r.naver_id,
-            r.homepage_url,
-            r.main_thumbnail_url,
-            GROUP_CONCAT(DISTINCT m.menu_name, ':', m.price ORDER BY m.price SEPARATOR ' | ') AS menus
-        FROM restaurants r
-        LEFT JOIN menus m ON r.id = m.restaurant_id 
-            AND m.price >= 5900 
-            AND m.price <= 20000
-        GROUP BY r.id
-        ORDER BY r.id
-    """
-
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            print(f"✅ {len(results)}개의 음식점 데이터 조회 완료")
-            return results
-    except Exception as exc:
-        print(f"❌ 데이터 조회 실패: {exc}")
-        raise
-
-
-
-def create_optimized_embedding_text(restaurant: Dict) -> str:
-    """검색 최적화된 텍스트 생성"""
-    
-    # 핵심 정보를 반복하여 가중치 부여
-    core_info = f"{restaurant['name']} {restaurant['category']}"
-    
-    # 메뉴 정보 강조
-    menus_text = ""
-    if restaurant.get("menus"):
-        menu_list = restaurant["menus"].split(" | ")
-        menus_text = "\n".join(f"  - {menu}" for menu in menu_list)
-    
-    
-    # 최적화된 순서로 조합
-    optimized_text = f"""
-# {core_info}
-
-## 메뉴
-{menus_text}
-
-## 네이버 리뷰수: {restaurant.get('naver_review_count', '')}
-
-## 특징:
-{restaurant.get('description', '')}
-
-
-## 위치: {restaurant.get('location_type', '')}
-
-## metadata
-- naver_id: {restaurant.get('naver_id', '')}
-- homepage_url: {restaurant.get('homepage_url', '')}
-- main_thumbnail_url: {restaurant.get('main_thumbnail_url', '')}
-
-    """.strip()
-    
-    return optimized_text
-
+# 1이면 새 네임스페이스(<PINECONE_NAMESPACE>-<버전>)에 전체를 쓰고 다 끝난 뒤 현재 버전 포인터만 바꿉니다.
+# 앱은 포인터를 보고 재시작 없이 갈아타며, 바뀌지 않은 음식점은 임베딩 캐시(EMBEDDING_CACHE_PATH)로 재사용하세요.
+INDEX_VERSIONED = os.getenv("INDEX_VERSIONED", "0") == "1"
+INDEX_KEEP_VERSIONS = int(os.getenv("INDEX_KEEP_VERSIONS", "2"))
 
-
-def convert_to_langchain_documents(restaurants: List[Dict]) -> List[Document]:
-    """MySQL 데이터를 LangChain Document 객체로 변환"""
-    documents: List[Document] = []
-
-    for restaurant in restaurants:
-        content = create_optimized_embedding_text(restaurant)
-        metadata = {
-            "restaurant_id": restaurant["id"],
-            "name": restaurant["name"],
-            "category": restaurant["category"],
-            "location_type": restaurant.get("location_type") or "",
-            "latitude": float(restaurant["latitude"]),
-            "longitude": float(restaurant["longitude"]),
-            "main_thumbnail_url": restaurant.get("main_thumbnail_url") or "",
-            "homepage_url": restaurant.get("homepage_url") or "",
-            "naver_review_count": restaurant["naver_review_count"],
-            "naver_id": restaurant.get("naver_id") or "",
-            "phone": restaurant.get("phone") or ""
-        }
-        documents.append(Document(page_content=content, metadata=metadata))
-
-    print(f"✅ {len(documents)}개의 Document 객체 생성 완료")
-    return documents
-
-
-def ensure_pinecone_index(pc: Pinecone) -> None:
-    """필요 시 Pinecone 인덱스를 생성"""
-    existing_indexes = set(pc.list_indexes().names())
-    if PINECONE_INDEX_NAME in existing_indexes:
-        print(f"ℹ️  기존 Pinecone 인덱스 사용: {PINECONE_INDEX_NAME}")
-        return
-
-    print(f"🆕 Pinecone 인덱스 생성: {PINECONE_INDEX_NAME}")
-    pc.create_index(
-        name=PINECONE_INDEX_NAME,
-        dimension=EMBEDDING_DIMENSION,
-        metric="cosine",
-        spec=ServerlessSpec(cloud=PINECONE_CLOUD, region=PINECONE_REGION),
-    )
-
-    print("⌛ 인덱스 준비 대기 중...")
-    while not pc.describe_index(PINECONE_INDEX_NAME).status["ready"]:
-        time.sleep(1)
-    print("✅ 인덱스 준비 완료")
-
-
-def create_pinecone_vectorstore(documents: List[Document]) -> PineconeVectorStore:
-    """Upstage 임베딩으로 Pinecone에 저장"""
-    try:
-        print(f"📦 Upstage 임베딩 모델 초기화: {EMBEDDING_MODEL}")
-        embeddings = UpstageEmbeddings(model=EMBEDDING_MODEL)
-
-        pc = Pinecone(api_key=PINECONE_API_KEY)
-        ensure_pinecone_index(pc)
-
-        print(
-            "💾 Pinecone에 임베딩 중... "
-            f"(총 {len(documents)}개 문서, 인덱스: {PINECONE_INDEX_NAME}, 네임스페이스: {PINECONE_NAMESPACE})"
-        )
-
-        vectorstore = PineconeVectorStore.from_documents(
-            documents=documents,
-            embedding=embeddings,
-            index_name=PINECONE_INDEX_NAME,
-            namespace=PINECONE_NAMESPACE,
-        )
-
-        print("✅ Pinecone 저장 완료")
-        return vectorstore
-    except Exception as exc:
-        print(f"❌ Pinecone 저장 실패: {exc}")
-        raise
-
-
-def test_search(vectorstore: PineconeVectorStore, query: str = "냉면") -> None:
-    """임베딩 결과를 간단히 검색 테스트"""
-    print(f"\n🔍 테스트 검색: '{query}'")
-    results = vectorstore.similarity_search(query, k=3)
-
-    print(f"검색 결과 {len(results)}개:")
-    for idx, doc in enumerate(results, start=1):
-        print(f"\n--- 결과 {idx} ---")
-        print(f"이름: {doc.metadata.get('name')}")
-        print(f"카테고리: {doc.metadata.get('category')}")
-        print(f"위치: {doc.metadata.get('location_type')}")
-        print(f"리뷰수: {doc.metadata.get('naver_review_count')}")
+# 1이면 임베딩 전에 본문이 거의 같고 가까운 음식점(지점/재등록)을 묶어 대표 하나만 임베딩합니다.
+# 검색되는 음식점이 바뀌고 소스를 한 번 더 읽으므로 기본은 끕니다 (묶인 id는 대표 문서의 duplicate_ids에 남음).
+INDEX_DEDUP = os.getenv("INDEX_DEDUP", "0") == "1"
 
 
 # ==================== 메인 실행 ====================
@@ -231,18 +58,45 @@ def main() -> None:
     print("MySQL → Pinecone 임베딩 시작")
     print("=" * 60)
 
-    connection = None
     try:
-        connection = get_mysql_connection()
-        restaurants = fetch_restaurants_data(connection)
+        source = KeysetRestaurantSource(
+            mysql_pool(),
+            review_column="naver_place_review_count",
+            # 재정렬의 날씨 특성이 metadata["weather_tags"]를 읽으므로 태그는 항상 함께 저장합니다.
+            weather_tags=True,
+            signature_menu=False,
+        )
+        embeddings = load_concurrent_embedder("upstage", EMBEDDING_MODEL)
+        version = new_version() if INDEX_VERSIONED else None
+        sink = PineconeSink(
+            PINECONE_INDEX_NAME,
+            f"{PINECONE_NAMESPACE}-{version}" if version else PINECONE_NAMESPACE,
+            EMBEDDING_DIMENSION,
+            cloud=PINECONE_CLOUD,
+            region=PINECONE_REGION,
+        )
 
-        if not restaurants:
+        template = document_template(optimized_text_with_links)
+        if INDEX_DEDUP:
+            template = dedup_template(source.rows(), template)
+
+        stats = run_pipeline(
+            source.rows(),
+            template,
+            embeddings,
+            sink,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            # 버전 빌드는 매번 빈 네임스페이스에 쓰므로 증분 기록을 쓰지 않습니다.
+            manifest=None if version else IndexManifest(INDEX_MANIFEST_PATH, model=EMBEDDING_MODEL, full=REINDEX_FULL),
+        )
+        if not stats["source"].rows:
             print("⚠️  조회된 데이터가 없습니다.")
             return
+        if version:
+            versions = NamespaceVersions(sink.index, PINECONE_NAMESPACE, EMBEDDING_DIMENSION, keep=INDEX_KEEP_VERSIONS)
+            versions.publish(version, count=stats["sink"].rows, model=EMBEDDING_MODEL)
 
-        documents = convert_to_langchain_documents(restaurants)
-        vectorstore = create_pinecone_vectorstore(documents)
-
+        vectorstore = sink.as_vectorstore(embeddings)
         test_search(vectorstore, "순대국 가성비")
         test_search(vectorstore, "날씨 좋을 때 먹기 좋은 음식")
 
@@ -254,10 +108,6 @@ def main() -> None:
         import traceback
 
         traceback.print_exc()
-    finally:
-        if connection:
-            connection.close()
-            print("MySQL 연결 종료")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+"""
+검색 품질/지연 평가 도구.
+
+라벨된 질의 파일(store/eval_queries.jsonl)을 인덱스 변형마다 일괄로 돌려
+recall@k, MRR, nDCG@k, p50/p95 지연, QPS를 계산하고 JSON으로 저장합니다.
+키/디렉터리/패키지가 없는 변형은 이유와 함께 건너뜁니다.
+
+질의 파일 형식 (한 줄에 하나, relevant는 restaurant_id → 관련도 0~2):
+    {"query": "마라탕 맛집", "relevant": {"120": 2, "125": 1}}
+
+예시:
+    python -m store.evaluate --k 5 --out eval_results.json
+    python -m store.evaluate --variants chroma-openai local-int8 --concurrency 4
+    python -m store.evaluate --variants template-markdown_text template-optimized_text   # MySQL 필요
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from agent.index_alias import resolve_directory
+
+load_dotenv()
+
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), "eval_queries.jsonl")
+
+# 질의, k → restaurant_id 순위 목록
+SearchFn = Callable[[str, int], List[str]]
+
+
+# ==================== 지표 ====================
+def recall_at_k(ranked: Sequence[str], relevant: Dict[str, int], k: int) -> float:
+    wanted = {rid for rid, grade in relevant.items() if grade > 0}
+    if not wanted:
+        return 0.0
+    return len(wanted & set(ranked[:k])) / len(wanted)
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: Dict[str, int]) -> float:
+    for rank, rid in enumerate(ranked, start=1):
+        if relevant.get(rid, 0) > 0:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: Sequence[str], relevant: Dict[str, int], k: int) -> float:
+    """관련도 등급을 쓰는 nDCG (gain = 2^rel - 1)."""
+    dcg = sum((2 ** relevant.get(rid, 0) - 1) / math.log2(i + 2) for i, rid in enumerate(ranked[:k]))
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(i + 2) for i, grade in enumerate(ideal))
+    return dcg / idcg if idcg > 0 else 0.0
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ==================== 인덱스 변형 ====================
+def _ids(docs) -> List[str]:
+    ranked = []
+    for doc in docs:
+        rid = str((doc.metadata or {}).get("restaurant_id", ""))
+        if rid and rid not in ranked:
+            ranked.append(rid)
+    return ranked
+
+
+def _vectorstore_search(store) -> SearchFn:
+    return lambda query, k: _ids(store.similarity_search(query, k=k))
+
+
+def _chroma(path: str, collection: str, embedding_factory: Callable[[], Any]) -> Callable[[], SearchFn]:
+    def build() -> SearchFn:
+        directory = resolve_directory(path)
+        if not os.path.exists(os.path.join(directory, "chroma.sqlite3")):
+            raise FileNotFoundError(f"ChromaDB 경로가 없습니다: {directory}")
+        from langchain_chroma import Chroma
+
+        store = Chroma(collection_name=collection, embedding_function=embedding_factory(), persist_directory=directory)
+        if store._collection.count() == 0:
+            raise ValueError(f"컬렉션이 비어 있습니다: {collection}")
+        return _vectorstore_search(store)
+
+    return build
+
+
+def _openai_embeddings():
+    from langchain_openai import OpenAIEmbeddings
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다")
+    return OpenAIEmbeddings(model="text-embedding-3-small")
+
+
+def _upstage_embeddings():
+    from langchain_upstage import UpstageEmbeddings
+
+    if not os.getenv("UPSTAGE_API_KEY"):
+        raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다")
+    return UpstageEmbeddings(model="solar-embedding-1-large")
+
+
+def _local_hf_embeddings():
+    from store.pipeline.local_embedder import LocalEmbedder, local_files_only_from_env
+
+    return LocalEmbedder(
+        os.getenv("HUGGINGFACE_MODEL", "BAAI/bge-m3"),
+        quantize=os.getenv("HUGGINGFACE_QUANTIZE", "none"),
+        token=os.getenv("HUGGINGFACE_TOKEN"),
+        local_files_only=local_files_only_from_env(),
+    )
+
+
+def _pinecone_upstage() -> SearchFn:
+    from langchain_pinecone import PineconeVectorStore
+
+    if not os.getenv("PINECONE_API_KEY"):
+        raise ValueError("PINECONE_API_KEY가 설정되지 않았습니다")
+    store = PineconeVectorStore(
+        index_name=os.getenv("PINECONE_INDEX_NAME", "jamsil-restaurants-upstage"),
+        embedding=_upstage_embeddings(),
+        namespace=os.getenv("PINECONE_NAMESPACE", "public"),
+    )
+    return _vectorstore_search(store)
+
+
+def _local_index(mode: str) -> Callable[[], SearchFn]:
+    def build() -> SearchFn:
+        from agent.vector_index import LocalVectorIndex
+
+        path = os.getenv("LOCAL_INDEX_PATH", "./local_index")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"로컬 인덱스가 없습니다: {path} (store.export_local_index 먼저 실행)")
+        index = LocalVectorIndex(resolve_directory(path), mode=mode, embedding=_upstage_embeddings())
+        return lambda query, k: _ids(doc for doc, _score in index.similarity_search_with_score(query, k=k))
+
+    return build
+
+
+def _template(template_name: str, kind: str) -> Callable[[], SearchFn]:
+    """MySQL 카탈로그를 템플릿으로 텍스트화해 메모리에서 전수 검색합니다 (임베딩 캐시 사용)."""
+
+    def build() -> SearchFn:
+        from store.pipeline import KeysetRestaurantSource, document_template, load_concurrent_embedder, mysql_pool
+        from store.pipeline import templates
+
+        to_document = document_template(getattr(templates, template_name))
+        docs = [to_document(row) for row in KeysetRestaurantSource(mysql_pool()).rows()]
+        embeddings = load_concurrent_embedder(kind)
+        matrix = np.asarray(embeddings.embed_documents([doc.page_content for doc in docs]), dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        ids = [str(doc.metadata["restaurant_id"]) for doc in docs]
+
+        def search(query: str, k: int) -> List[str]:
+            scores = matrix @ np.asarray(embeddings.embed_query(query), dtype=np.float32)
+            return [ids[i] for i in np.argsort(-scores)[:k]]
+
+        return search
+
+    return build
+
+
+@dataclass
+class Variant:
+    name: str
+    build: Callable[[], SearchFn]
+    description: str
+
+
+VARIANTS = [
+    Variant("chroma-openai", _chroma("./chroma_db", "jamsil_restaurants", _openai_embeddings), "ChromaDB + OpenAI text-embedding-3-small"),
+    Variant("chroma-upstage", _chroma("./chroma_db_upstage", "jamsil_restaurants_upstage", _upstage_embeddings), "ChromaDB + Upstage solar"),
+    Variant("chroma-qwen", _chroma("./chroma_db_qwen", "jamsil_restaurants_qwen", _local_hf_embeddings), "ChromaDB + 로컬 HuggingFace"),
+    Variant("pinecone-upstage", _pinecone_upstage, "Pinecone + Upstage solar"),
+    Variant("local-float32", _local_index("float32"), "로컬 인덱스 float32 전수"),
+    Variant("local-int8", _local_index("int8"), "로컬 인덱스 int8 + float32 재점수화"),
+    Variant("local-binary", _local_index("binary"), "로컬 인덱스 binary + float32 재점수화"),
+    Variant("template-markdown_text", _template("markdown_text", "upstage"), "markdown 템플릿 + Upstage (MySQL)"),
+    Variant("template-optimized_text", _template("optimized_text", "upstage"), "optimized 템플릿 + Upstage (MySQL)"),
+]
+DEFAULT_VARIANTS = [v.name for v in VARIANTS if not v.name.startswith("template-")]
+
+
+# ==================== 실행 ====================
+def evaluate(search: SearchFn, queries: List[Dict[str, Any]], k: int, concurrency: int = 1) -> Dict[str, Any]:
+    """질의 전체를 돌려 변형 하나의 지표와 질의별 결과를 만듭니다."""
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        ranked = search(item["query"], k)
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        relevant = {str(rid): int(grade) for rid, grade in item["relevant"].items()}
+        return {
+            "query": item["query"],
+            "ranked": ranked,
+            "latency_ms": round(latency_ms, 2),
+            "recall": recall_at_k(ranked, relevant, k),
+            "rr": reciprocal_rank(ranked, relevant),
+            "ndcg": ndcg_at_k(ranked, relevant, k),
+        }
+
+    search(queries[0]["query"], k)  # 연결/모델 준비 비용은 지연에서 뺍니다
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            per_query = list(pool.map(run, queries))
+    else:
+        per_query = [run(item) for item in queries]
+    wall_s = time.perf_counter() - start
+
+    latencies = np.array([row["latency_ms"] for row in per_query])
+    return {
+        "metrics": {
+            f"recall@{k}": round(float(np.mean([row["recall"] for row in per_query])), 4),
+            "mrr": round(float(np.mean([row["rr"] for row in per_query])), 4),
+            f"ndcg@{k}": round(float(np.mean([row["ndcg"] for row in per_query])), 4),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "qps": round(len(per_query) / wall_s, 2),
+        },
+        "per_query": per_query,
+    }
+
+
+def main() -> None:
+    names = [v.name for v in VARIANTS]
+    parser = argparse.ArgumentParser(description="검색 품질/지연 평가")
+    parser.add_argument("--queries", default=QUERIES_PATH, help="라벨된 질의 JSONL")
+    parser.add_argument("--variants", nargs="+", default=DEFAULT_VARIANTS, choices=names)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 보낼 질의 수 (QPS 측정)")
+    parser.add_argument("--out", default="eval_results.json", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    print(f"📋 질의 {len(queries)}개, k={args.k}, 동시성 {args.concurrency}")
+
+    results: Dict[str, Any] = {}
+    by_name = {v.name: v for v in VARIANTS}
+    for name in args.variants:
+        variant = by_name[name]
+        print(f"\n🔍 {name} ({variant.description})")
+        try:
+            search = variant.build()
+            result = evaluate(search, queries, args.k, args.concurrency)
+        except Exception as exc:
+            print(f"   ⚠️  건너뜀: {exc}")
+            results[name] = {"status": "skipped", "reason": str(exc)}
+            continue
+        results[name] = {"status": "ok", "description": variant.description, **result}
+        print("   " + ", ".join(f"{key} {value}" for key, value in result["metrics"].items()))
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "queries_file": args.queries,
+        "k": args.k,
+        "concurrency": args.concurrency,
+        "variants": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    ok = [(name, r["metrics"]) for name, r in results.items() if r["status"] == "ok"]
+    if ok:
+        columns = list(ok[0][1].keys())
+        print("\n" + " | ".join(["variant".ljust(24), *[c.rjust(9) for c in columns]]))
+        for name, metrics in sorted(ok, key=lambda item: -item[1][f"ndcg@{args.k}"]):
+            print(" | ".join([name.ljust(24), *[str(metrics[c]).rjust(9) for c in columns]]))
+    print(f"\n✅ 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
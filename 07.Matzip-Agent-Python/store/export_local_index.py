@@ -0,0 +1,133 @@
+"""
+검색용 로컬 벡터 인덱스 artifact(agent.vector_index)를 만드는 스크립트.
+
+CI에서 한 번 빌드해 앱 컨테이너에 읽기 전용으로 배포하는 용도입니다.
+artifact는 float32/int8/binary 벡터(.npy), 메타데이터 테이블(Parquet, pyarrow가 없으면 JSONL),
+모델 id와 파일별 sha256을 담은 manifest(index.json)로 이루어집니다.
+
+- chroma: Persisted ChromaDB 컬렉션에 저장된 벡터를 그대로 내보냅니다 (임베딩 재계산 없음).
+- mysql: MySQL 카탈로그를 임베딩 파이프라인으로 바로 임베딩해 내보냅니다.
+
+예시:
+    python -m store.export_local_index --chroma ./chroma_db_upstage --collection jamsil_restaurants_upstage --out ./local_index
+    python -m store.export_local_index --source mysql --out ./local_index
+    python -m store.export_local_index --source mysql --out ./local_index --versioned
+    python -m store.export_local_index --verify ./local_index
+
+--versioned 를 주면 --out 을 버전 루트로 보고 versions/<버전>/ 에 쓴 뒤 current.json 포인터만 바꿉니다.
+실행 중인 앱(RETRIEVER_BACKEND=local)은 포인터를 보고 재시작 없이 새 버전으로 갈아탑니다.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from agent.index_alias import resolve_directory
+from agent.vector_index import LocalVectorIndex
+
+
+def export_from_chroma(args, out: str) -> None:
+    chroma_path = resolve_directory(args.chroma)
+    if not os.path.exists(os.path.join(chroma_path, "chroma.sqlite3")):
+        print(f"❌ ChromaDB가 없습니다: {chroma_path}")
+        sys.exit(1)
+    from langchain_chroma import Chroma
+
+    print(f"📦 ChromaDB 불러오기: {chroma_path} (collection: {args.collection})")
+    store = Chroma(collection_name=args.collection, persist_directory=chroma_path)
+    data = store.get(include=["embeddings", "metadatas", "documents"])
+
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    records = [
+        {"page_content": content or "", "metadata": meta or {}}
+        for content, meta in zip(data["documents"], data["metadatas"])
+    ]
+    if not records:
+        print("⚠️ 내보낼 데이터가 없습니다.")
+        return
+
+    info = LocalVectorIndex.build(out, vectors, records, model=args.model)
+    print(f"✅ {info['count']}개 벡터 ({info['dimension']}차원) 저장 완료: {out}")
+
+
+def export_from_mysql(args, out: str) -> None:
+    from store.pipeline import (
+        KeysetRestaurantSource,
+        LocalIndexSink,
+        dedup_template,
+        document_template,
+        load_concurrent_embedder,
+        mysql_pool,
+        optimized_text_with_links,
+        run_pipeline,
+    )
+
+    # Pinecone 프리셋(store.embedding_upstage)과 같은 데이터/템플릿으로 만듭니다.
+    source = KeysetRestaurantSource(
+        mysql_pool(),
+        review_column="naver_place_review_count",
+        # 재정렬의 날씨 특성이 metadata["weather_tags"]를 읽으므로 태그는 항상 함께 저장합니다.
+        weather_tags=True,
+        signature_menu=False,
+    )
+    template = document_template(optimized_text_with_links)
+    run_pipeline(
+        source.rows(),
+        dedup_template(source.rows(), template) if args.dedup else template,
+        load_concurrent_embedder("upstage", args.model),
+        LocalIndexSink(out, model=args.model),
+        batch_size=256,
+    )
+
+
+def verify(directory: str) -> None:
+    directory = resolve_directory(directory)
+    index = LocalVectorIndex(directory, mode="float32")
+    try:
+        index.verify()
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        sys.exit(1)
+    info = index.info
+    print(f"✅ artifact 확인 완료: {directory} ({info.get('model')}, {info.get('count')}개, {info.get('dimension')}차원)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 벡터 인덱스 artifact 내보내기")
+    parser.add_argument("--source", choices=["chroma", "mysql"], default="chroma", help="벡터를 가져올 곳")
+    parser.add_argument("--chroma", default="./chroma_db_upstage", help="Chroma persist 디렉터리")
+    parser.add_argument("--collection", default="jamsil_restaurants_upstage", help="컬렉션명")
+    parser.add_argument("--model", default="solar-embedding-1-large", help="임베딩 모델 id (manifest에 기록)")
+    parser.add_argument("--out", default="./local_index", help="출력 디렉터리")
+    parser.add_argument("--dedup", action="store_true", help="mysql: 거의 같은 음식점은 대표 하나만 임베딩 (Pinecone 빌드의 INDEX_DEDUP=1과 맞출 때)")
+    parser.add_argument("--versioned", action="store_true", help="--out 아래 새 버전으로 만들고 현재 버전 포인터를 바꿈")
+    parser.add_argument("--keep", type=int, default=2, help="--versioned 일 때 남길 버전 수")
+    parser.add_argument("--verify", metavar="DIR", help="내보내지 않고 artifact 체크섬만 확인")
+    args = parser.parse_args()
+
+    if args.verify:
+        verify(args.verify)
+        return
+
+    versions = None
+    out = args.out
+    if args.versioned:
+        from store.pipeline import DirectoryVersions, new_version
+
+        versions = DirectoryVersions(args.out, keep=args.keep)
+        version = new_version()
+        out = versions.path(version)
+
+    if args.source == "mysql":
+        export_from_mysql(args, out)
+    else:
+        export_from_chroma(args, out)
+
+    if versions and os.path.exists(os.path.join(out, "index.json")):
+        versions.publish(version, model=args.model)
+
+
+if __name__ == "__main__":
+    main()
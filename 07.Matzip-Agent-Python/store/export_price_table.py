@@ -0,0 +1,47 @@
+"""
+MySQL 메뉴 가격을 가격 사이드 테이블(agent.prices.PriceTable)로 내보내는 스크립트.
+
+음식점별 메뉴 가격 배열(CSR)과 최저/중앙/최고가를 .npz 하나에 담습니다.
+검색기는 질의의 가격 조건("만원 이하")을 이 테이블로 restaurant_id 목록으로 바꿔 유사도 검색 전에 거릅니다.
+임베딩은 하지 않으므로 메뉴 가격만 바뀌었을 때도 빠르게 다시 만들 수 있습니다.
+
+예시:
+    python -m store.export_price_table --out ./price_table.npz
+"""
+
+import argparse
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from agent.prices import PriceTable
+from store.pipeline import KeysetRestaurantSource, mysql_pool
+
+load_dotenv()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MySQL → 가격 사이드 테이블 내보내기")
+    parser.add_argument("--out", default=os.getenv("PRICE_TABLE_PATH", "./price_table.npz"), help="출력 .npz 경로")
+    args = parser.parse_args()
+
+    source = KeysetRestaurantSource(mysql_pool(), weather_tags=False, signature_menu=False)
+    table = PriceTable.from_menus((row["id"], row["menu_prices"]) for row in source.rows())
+    if not len(table):
+        print("⚠️ 내보낼 데이터가 없습니다.")
+        return
+
+    tmp_path = f"{args.out}.tmp.npz"
+    table.save(tmp_path)
+    os.replace(tmp_path, args.out)
+    priced = table.min_prices >= 0
+    print(f"✅ 음식점 {len(table)}곳, 메뉴 가격 {table.prices.shape[0]}개 저장: {args.out}")
+    if priced.any():
+        print(f"   중앙가 분포: p25 {np.percentile(table.median_prices[priced], 25):,.0f}원, "
+              f"p50 {np.percentile(table.median_prices[priced], 50):,.0f}원, "
+              f"p75 {np.percentile(table.median_prices[priced], 75):,.0f}원")
+
+
+if __name__ == "__main__":
+    main()
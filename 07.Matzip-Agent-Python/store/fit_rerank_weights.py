@@ -0,0 +1,53 @@
+"""
+재정렬(rerank) 가중치를 오프라인으로 학습하는 스크립트.
+
+RERANK_FEATURE_LOG로 남긴 JSONL 각 줄에 후보별 정답 "labels"(선택=1, 미선택=0)를 채운 뒤 실행합니다.
+
+예시:
+    python -m store.fit_rerank_weights --log rerank_features.jsonl --l2 1.0
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from agent.rerank import FEATURES, RERANK_WEIGHTS_PATH, fit_weights, save_weights
+
+
+def load_training_data(path: str):
+    """라벨이 채워진 줄만 모아 (features, labels) 행렬로 만듭니다."""
+    features, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if not record.get("labels"):
+                continue
+            features.extend(record["features"])
+            labels.extend(record["labels"])
+    return np.array(features, dtype=np.float64), np.array(labels, dtype=np.float64)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="rerank 가중치 학습")
+    parser.add_argument("--log", required=True, help="라벨을 채운 특징 로그 (JSONL)")
+    parser.add_argument("--l2", type=float, default=1.0, help="ridge 정규화 강도")
+    parser.add_argument("--out", default=RERANK_WEIGHTS_PATH, help="가중치 저장 경로")
+    args = parser.parse_args()
+
+    features, labels = load_training_data(args.log)
+    if features.size == 0:
+        print("⚠️ 라벨이 있는 학습 데이터가 없습니다.")
+        return
+
+    print(f"📦 학습 데이터: 후보 {len(labels)}개 (양성 {int(labels.sum())}개)")
+    weights = fit_weights(features, labels, l2=args.l2)
+    for name, weight in zip(FEATURES, weights):
+        print(f"  {name}: {weight:.4f}")
+
+    save_weights(weights, args.out)
+    print(f"✅ 가중치 저장 완료: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
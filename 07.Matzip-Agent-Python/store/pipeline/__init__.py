@@ -0,0 +1,82 @@
+"""
+MySQL → 텍스트 → 배치 임베딩 → 배치 저장을 스트리밍으로 잇는 임베딩 파이프라인.
+
+단계 사이는 크기가 제한된 큐로 연결되어, 음식점 수와 관계없이 메모리 사용량이 일정합니다.
+소스/템플릿/임베딩/저장소는 각각 바꿔 끼울 수 있습니다 (store/embedding*.py 참고).
+IndexManifest를 넘기면 내용 해시가 바뀐 음식점만 다시 임베딩합니다.
+dedup_template로 템플릿을 감싸면 지점/재등록 등 거의 같은 음식점은 대표 하나만 임베딩합니다.
+FanoutSink로 한 번 계산한 임베딩을 여러 저장소(Chroma/Pinecone/로컬 artifact)에 동시에 씁니다.
+DirectoryVersions/NamespaceVersions로 새 버전에 쓴 뒤 "현재" 포인터만 바꾸면 서비스 중단 없이 재색인합니다.
+"""
+
+from .cache import CachedEmbedder, EmbeddingCache, text_hash
+from .cpu_encoder import CPUEncodingEngine
+from .dedup import NearDuplicateIndex, dedup_template
+from .embedders import load_concurrent_embedder, load_embedder
+from .executor import ConcurrentEmbedder, RateLimiter, is_retryable, retry_after
+from .local_embedder import QUANTIZE_MODES, LocalEmbedder, load_local_model
+from .manifest import IndexManifest, content_hash
+from .runner import StageStats, batched, run_pipeline, test_search
+from .sinks import ChromaSink, FanoutSink, LocalIndexSink, PineconeSink, vector_checksum, vector_id
+from .sources import (
+    ConnectionPool,
+    KeysetRestaurantSource,
+    MySQLSource,
+    build_restaurant_query,
+    mysql_config_from_env,
+    mysql_pool,
+)
+from .templates import (
+    build_metadata,
+    document_template,
+    markdown_text,
+    optimized_text,
+    optimized_text_with_links,
+    signature_text,
+)
+from .versions import DirectoryVersions, NamespaceVersions, new_version
+
+__all__ = [
+    "CPUEncodingEngine",
+    "CachedEmbedder",
+    "ChromaSink",
+    "ConcurrentEmbedder",
+    "ConnectionPool",
+    "DirectoryVersions",
+    "EmbeddingCache",
+    "FanoutSink",
+    "IndexManifest",
+    "KeysetRestaurantSource",
+    "LocalEmbedder",
+    "LocalIndexSink",
+    "MySQLSource",
+    "NamespaceVersions",
+    "NearDuplicateIndex",
+    "PineconeSink",
+    "QUANTIZE_MODES",
+    "RateLimiter",
+    "StageStats",
+    "batched",
+    "build_metadata",
+    "build_restaurant_query",
+    "content_hash",
+    "dedup_template",
+    "document_template",
+    "is_retryable",
+    "load_concurrent_embedder",
+    "load_embedder",
+    "load_local_model",
+    "markdown_text",
+    "mysql_config_from_env",
+    "mysql_pool",
+    "new_version",
+    "optimized_text",
+    "optimized_text_with_links",
+    "retry_after",
+    "run_pipeline",
+    "signature_text",
+    "test_search",
+    "text_hash",
+    "vector_checksum",
+    "vector_id",
+]
@@ -0,0 +1,173 @@
+"""
+모든 임베딩 스크립트가 함께 쓰는 SQLite 임베딩 캐시.
+
+(모델 id, 텍스트 sha256) → float32 벡터 blob 으로 저장하므로, 같은 텍스트를 같은 모델로
+다시 임베딩하지 않습니다 (Chroma/Pinecone 재구축, 저장소 전환 시 임베딩 호출 0회).
+
+예시:
+    python -m store.pipeline.cache              # 모델별 항목 수/크기
+    python -m store.pipeline.cache --gc-days 30 # 30일 동안 어떤 빌드에서도 쓰이지 않은 항목 삭제
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.sqlite")
+_SQLITE_MAX_VARS = 900
+
+
+def text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    embeddings(model, text_hash, dim, vector, last_used) 테이블.
+    last_used는 빌드에서 조회/저장될 때마다 갱신되고, gc()는 오래 쓰이지 않은 항목을 지웁니다.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH) -> None:
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, hashes: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        found: Dict[bytes, List[float]] = {}
+        now = int(time.time())
+        with self._lock:
+            for start in range(0, len(hashes), _SQLITE_MAX_VARS):
+                chunk = list(hashes[start:start + _SQLITE_MAX_VARS])
+                marks = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({marks})",
+                    [model, *chunk],
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32).tolist()
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash IN ({marks})",
+                    [now, model, *chunk],
+                )
+            self._conn.commit()
+        return found
+
+    def put_many(self, model: str, items: Iterable[tuple]) -> None:
+        """items: (text_hash, 벡터) 목록"""
+        now = int(time.time())
+        rows = []
+        for key, vector in items:
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((model, key, int(array.shape[0]), array.tobytes(), now))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def touch(self, model: str, hashes: Sequence[bytes]) -> None:
+        """임베딩하지 않고 건너뛴 텍스트도 아직 쓰이는 중으로 표시합니다."""
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [(now, model, key) for key in hashes],
+            )
+            self._conn.commit()
+
+    def gc(self, max_age_days: float) -> int:
+        """max_age_days 동안 어떤 빌드에서도 쓰이지 않은 (카탈로그에서 사라진) 항목을 지웁니다."""
+        cutoff = int(time.time() - max_age_days * 86400)
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM embeddings WHERE last_used < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        if deleted:
+            self._conn.execute("VACUUM")
+        return deleted
+
+    def stats(self) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT model, COUNT(*), SUM(LENGTH(vector)) FROM embeddings GROUP BY model ORDER BY model"
+            ).fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CachedEmbedder:
+    """캐시에 없는 텍스트만 inner 임베딩 모델로 보내는 래퍼 (입력 순서 유지)."""
+
+    def __init__(self, inner: Any, model_id: str, cache: Optional[EmbeddingCache] = None) -> None:
+        self.inner = inner
+        self.model_id = model_id
+        self.cache = cache or EmbeddingCache()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [text_hash(text) for text in texts]
+        found = self.cache.get_many(self.model_id, list(dict.fromkeys(hashes)))
+
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(hashes, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self.inner.embed_documents(list(missing.values()))
+            new_items = list(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_id, new_items)
+            found.update(new_items)
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return [found[key] for key in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+    def touch(self, texts: Iterable[str]) -> None:
+        self.cache.touch(self.model_id, [text_hash(text) for text in texts])
+
+    def report(self) -> None:
+        print(f"🗄️  임베딩 캐시 ({self.model_id}): 적중 {self.hits}개, 새로 임베딩 {self.misses}개")
+        if hasattr(self.inner, "report"):
+            self.inner.report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="임베딩 캐시 관리")
+    parser.add_argument("--path", default=EMBEDDING_CACHE_PATH)
+    parser.add_argument("--gc-days", type=float, help="이 기간 동안 쓰이지 않은 항목 삭제")
+    args = parser.parse_args()
+
+    cache = EmbeddingCache(args.path)
+    if args.gc_days is not None:
+        print(f"🧹 {cache.gc(args.gc_days)}개 항목 삭제")
+    for model, count, size in cache.stats():
+        print(f"- {model}: {count}개, {(size or 0) / 1e6:.1f} MB")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+from .local_embedder import load_local_model
+
+# 워커 프로세스마다 한 번 올리는 모델 (initializer에서 설정)
+_WORKER_MODEL: Any = None
+
+
+def _init_worker(
+    loader: Callable[..., Any],
+    model_name: str,
+    token: Optional[str],
+    quantize: str,
+    threads: int,
+) -> None:
+    # torch를 import 하기 전에 스레드 수를 정해야 워커끼리 코어를 뺏지 않습니다.
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+
+    global _WORKER_MODEL
+    _WORKER_MODEL = loader(model_name, token, quantize)
+
+
+def _encode(texts: List[str], normalize: bool) -> np.ndarray:
+    vectors = _WORKER_MODEL.encode(
+        texts,
+        batch_size=len(texts),
+        normalize_embeddings=normalize,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _load_length_fn(model_name: str, token: Optional[str]) -> Callable[[str], int]:
+    """모델 토크나이저로 토큰 수를 셉니다. 토크나이저를 못 불러오면 글자 수로 대신합니다."""
+    try:
+        from tokenizers import Tokenizer
+
+        tokenizer = Tokenizer.from_pretrained(model_name, token=token)
+        tokenizer.no_padding()
+        tokenizer.no_truncation()
+        return lambda text: len(tokenizer.encode(text).ids)
+    except Exception:
+        return len
+
+
+class CPUEncodingEngine:
+    """
+    로컬 임베딩 모델(HuggingFace/bge-m3 등)을 여러 프로세스로 돌리는 CPU 인코딩 엔진.
+
+    - 텍스트를 토큰 길이순으로 정렬해 비슷한 길이끼리 묶으므로 padding 낭비가 적습니다
+    - 배치는 (가장 긴 길이 × 개수) ≤ max_batch_tokens 가 되도록 만듭니다
+    - 워커 프로세스마다 모델을 하나씩 올리고 torch 스레드 수를 threads_per_worker로 제한합니다
+    - 긴 배치부터 보내 마지막에 한 워커만 오래 일하는 일을 줄이고, 결과는 원래 순서로 돌려줍니다
+    LangChain Embeddings 자리에 그대로 끼울 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        max_batch_tokens: int = 8192,
+        max_batch_size: int = 64,
+        normalize: bool = True,
+        token: Optional[str] = None,
+        quantize: str = "none",
+        loader: Callable[..., Any] = load_local_model,
+        length_fn: Optional[Callable[[str], int]] = None,
+    ) -> None:
+        cores = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = workers or max(1, cores // 2)
+        self.threads_per_worker = threads_per_worker or max(1, cores // self.workers)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.normalize = normalize
+        self.length_fn = length_fn or _load_length_fn(model_name, token)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # fork는 부모의 torch 스레드 상태를 물려받아 멈출 수 있으므로 spawn을 씁니다.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(loader, model_name, token, quantize, self.threads_per_worker),
+        )
+        self.encoded = 0
+        self.busy_s = 0.0
+        print(
+            f"📦 CPU 인코딩 엔진: {model_name} "
+            f"(워커 {self.workers}개 × 스레드 {self.threads_per_worker}, 양자화: {quantize})"
+        )
+
+    def plan_batches(self, texts: Sequence[str]) -> List[List[int]]:
+        """길이 내림차순으로 정렬한 뒤 padding 포함 토큰 예산 안에서 인덱스 배치를 만듭니다."""
+        lengths = np.fromiter((self.length_fn(text) for text in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(-lengths, kind="stable")
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        longest = 0
+        for idx in order.tolist():
+            length = max(int(lengths[idx]), 1)
+            padded = max(longest, length) * (len(current) + 1)
+            if current and (padded > self.max_batch_tokens or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, longest = [], 0
+            current.append(idx)
+            longest = max(longest, length)
+        if current:
+            batches.append(current)
+        return batches
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        start = time.perf_counter()
+        batches = self.plan_batches(texts)
+        futures = [self._pool.submit(_encode, [texts[i] for i in batch], self.normalize) for batch in batches]
+
+        result: Optional[np.ndarray] = None
+        for batch, future in zip(batches, futures):
+            vectors = future.result()
+            if result is None:
+                result = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            result[batch] = vectors
+
+        self.encoded += len(texts)
+        self.busy_s += time.perf_counter() - start
+        return result.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    @property
+    def texts_per_s(self) -> float:
+        return self.encoded / self.busy_s if self.busy_s > 0 else 0.0
+
+    def report(self) -> None:
+        print(f"🧮 CPU 인코딩 {self.encoded}개, 워커 {self.workers}개, {self.texts_per_s:.1f} texts/s")
+
+    def close(self) -> None:
+        self._pool.shutdown()
@@ -0,0 +1,167 @@
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from agent.geo import haversine_m
+
+# a·h + b 가 uint64를 넘지 않도록 31비트 메르센 소수를 씁니다.
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_SPACES = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = 3) -> np.ndarray:
+    """
+    공백을 정리한 문자 n-gram 집합 (한글은 어절 경계가 불안정해 문자 단위로 자릅니다).
+    유니코드 코드 포인트(21비트)를 이어 붙인 정수로 만들어 파이썬 반복 없이 계산합니다.
+    """
+    text = _SPACES.sub(" ", text).strip() or " "
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(size, codes.shape[0])
+    grams = np.zeros(codes.shape[0] - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        grams = (grams << np.uint64(21)) | codes[offset:offset + grams.shape[0]]
+    return np.unique(grams)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH로 임베딩 텍스트가 거의 같은 음식점을 찾고, 좌표가 radius_m 안일 때만 같은 묶음으로 봅니다.
+    (지점/재등록 매장은 본문이 거의 같고 위치도 가깝지만, 멀리 떨어진 체인점은 따로 남깁니다.)
+
+    - 먼저 본 음식점(keyset 순서상 id가 작은 쪽)이 대표가 되고, 이후 중복은 대표에 묶입니다.
+    - 버킷에는 대표만 넣고, 공통 문구(카테고리/메뉴 머리말 등)로 붐비는 버킷은 max_bucket에서 더 받지 않습니다.
+      문서당 후보 수가 상수로 묶여 전체 비용은 행 수에 대략 비례합니다 (진짜 중복은 다른 밴드에서 만납니다).
+    - 후보 쌍은 서명 일치율(자카드 추정치) ≥ threshold 이고 거리 ≤ radius_m 일 때만 중복으로 확정합니다.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        radius_m: float = 150.0,
+        shingle_size: int = 3,
+        max_bucket: int = 64,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다")
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.radius_m = radius_m
+        self.shingle_size = shingle_size
+        self.max_bucket = max_bucket
+
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        # 대표 문서만 기록합니다 (버킷 값은 이 배열들의 행 번호). 가득 차면 두 배로 늘립니다.
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._coords = np.empty((1024, 2), dtype=np.float64)
+        self._ids: List[str] = []
+        self._representative: Dict[str, str] = {}  # 중복 id → 대표 id
+        self.seen = 0
+        self.clusters: Dict[str, List[str]] = {}  # 대표 id → 중복 id 목록
+        self.seconds = 0.0
+
+    def signature(self, text: str) -> np.ndarray:
+        """순열마다 (a·h + b) mod p 의 최솟값을 취한 MinHash 서명."""
+        hashes = shingles(text, self.shingle_size) % _MERSENNE_PRIME
+        mixed = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return mixed.min(axis=1).astype(np.uint32)
+
+    def add(self, doc_id: str, text: str, latitude: float, longitude: float) -> Optional[str]:
+        """문서를 등록합니다. 앞서 본 음식점의 중복이면 그 대표 id를, 새 대표면 None을 반환합니다."""
+        start = time.perf_counter()
+        signature = self.signature(text)
+        keys = [signature[i * self.rows_per_band:(i + 1) * self.rows_per_band].tobytes() for i in range(self.bands)]
+
+        candidates = {idx for band, key in enumerate(keys) for idx in self._buckets[band].get(key, ())}
+        match = self._best_match(signature, latitude, longitude, candidates) if candidates else None
+
+        self.seen += 1
+        representative = None
+        if match is None:
+            idx = len(self._ids)
+            if idx == self._signatures.shape[0]:
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+                self._coords = np.concatenate([self._coords, np.empty_like(self._coords)])
+            self._ids.append(doc_id)
+            self._signatures[idx] = signature
+            self._coords[idx] = (latitude, longitude)
+            for band, key in enumerate(keys):
+                bucket = self._buckets[band].setdefault(key, [])
+                if len(bucket) < self.max_bucket:
+                    bucket.append(idx)
+        else:
+            representative = self._ids[match]
+            self._representative[doc_id] = representative
+            self.clusters.setdefault(representative, []).append(doc_id)
+        self.seconds += time.perf_counter() - start
+        return representative
+
+    def _best_match(self, signature: np.ndarray, latitude: float, longitude: float, candidates) -> Optional[int]:
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        similarity = (self._signatures[candidates] == signature).mean(axis=1)
+        coords = self._coords[candidates]
+        distance = haversine_m(latitude, longitude, coords[:, 0], coords[:, 1])
+        ok = (similarity >= self.threshold) & (distance <= self.radius_m)
+        if not ok.any():
+            return None
+        # 대표 후보가 여럿이면 가장 닮은 문서, 같으면 먼저 본 문서를 고릅니다.
+        best = np.lexsort((candidates, -similarity))
+        return int(next(candidates[i] for i in best if ok[i]))
+
+    def is_duplicate(self, doc_id: str) -> bool:
+        return doc_id in self._representative
+
+    def fit(self, docs: Iterable[Document]) -> "NearDuplicateIndex":
+        for doc in docs:
+            meta = doc.metadata
+            self.add(str(meta["restaurant_id"]), doc.page_content, float(meta["latitude"]), float(meta["longitude"]))
+        return self
+
+    def wrap(self, template: Callable[[Dict[str, Any]], Document]) -> Callable[[Dict[str, Any]], Optional[Document]]:
+        """
+        fit() 이후 파이프라인 템플릿을 감쌉니다. 중복은 None(임베딩하지 않음)이 되고,
+        대표 문서의 metadata에는 묶인 음식점 id를 duplicate_ids("12,57")로 남깁니다.
+        """
+
+        def to_document(row: Dict[str, Any]) -> Optional[Document]:
+            doc = template(row)
+            doc_id = str(doc.metadata["restaurant_id"])
+            if self.is_duplicate(doc_id):
+                return None
+            if doc_id in self.clusters:
+                doc.metadata["duplicate_ids"] = ",".join(self.clusters[doc_id])
+            return doc
+
+        return to_document
+
+    def report(self) -> None:
+        removed = len(self._representative)
+        total = self.seen
+        print(
+            f"🧬 중복 제거: {total}개 중 {removed}개 제외 ({removed / max(total, 1):.1%}), "
+            f"묶음 {len(self.clusters)}개, {self.seconds:.1f}s"
+        )
+
+
+def dedup_template(
+    rows: Iterable[Dict[str, Any]],
+    template: Callable[[Dict[str, Any]], Document],
+    **kwargs: Any,
+) -> Callable[[Dict[str, Any]], Optional[Document]]:
+    """
+    rows를 한 번 훑어 중복 묶음을 만든 뒤 중복을 건너뛰는 템플릿을 돌려줍니다.
+    묶음은 전체를 봐야 정해지므로, 파이프라인 실행 전에 소스를 한 번 더 읽습니다 (임베딩은 하지 않음).
+    """
+    index = NearDuplicateIndex(**kwargs).fit(template(row) for row in rows)
+    index.report()
+    return index.wrap(template)
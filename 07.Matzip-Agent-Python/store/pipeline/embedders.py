@@ -0,0 +1,112 @@
+import os
+from typing import Any, Optional
+
+from .cache import CachedEmbedder, EmbeddingCache
+from .cpu_encoder import CPUEncodingEngine
+from .executor import ConcurrentEmbedder
+
+# 원격 임베딩 API 호출 설정 (제공자 요금제의 RPM/TPM에 맞춰 지정)
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+EMBEDDING_RPM = float(os.getenv("EMBEDDING_RPM", "0")) or None
+EMBEDDING_TPM = float(os.getenv("EMBEDDING_TPM", "0")) or None
+EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", "8000"))
+EMBEDDING_REQUEST_SIZE = int(os.getenv("EMBEDDING_REQUEST_SIZE", "32"))
+# 로컬(HuggingFace) 모델 CPU 인코딩: 워커 프로세스 수 (0이면 코어 수의 절반), 배치당 padding 포함 토큰 예산
+HF_ENCODE_WORKERS = int(os.getenv("HF_ENCODE_WORKERS", "0"))
+HF_MAX_BATCH_TOKENS = int(os.getenv("HF_MAX_BATCH_TOKENS", "8192"))
+# none / int8 / onnx (store.pipeline.local_embedder 참고)
+HUGGINGFACE_QUANTIZE = os.getenv("HUGGINGFACE_QUANTIZE", "none")
+# 빈 값이면 캐시를 쓰지 않습니다.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.sqlite")
+
+DEFAULT_MODELS = {
+    "upstage": "solar-embedding-1-large",
+    "openai": "text-embedding-3-small",
+    "huggingface": "BAAI/bge-m3",
+}
+
+
+def load_embedder(kind: str, model: Optional[str] = None, **kwargs: Any) -> Any:
+    """
+    이름으로 LangChain 임베딩 모델을 만듭니다. 사용하는 패키지만 import 합니다.
+
+    - upstage: solar-embedding-1-large (기본)
+    - openai: text-embedding-3-small (기본)
+    - huggingface: BAAI/bge-m3 (기본), kwargs로 device/token/batch_size 지정
+    """
+    if kind == "upstage":
+        from langchain_upstage import UpstageEmbeddings
+
+        if not os.getenv("UPSTAGE_API_KEY"):
+            raise ValueError("UPSTAGE_API_KEY가 .env 파일에 설정되지 않았습니다")
+        model = model or DEFAULT_MODELS["upstage"]
+        print(f"📦 Upstage 임베딩 모델 초기화: {model}")
+        return UpstageEmbeddings(model=model, max_retries=kwargs.get("max_retries", 2))
+
+    if kind == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다")
+        model = model or DEFAULT_MODELS["openai"]
+        print(f"📦 OpenAI 임베딩 모델 초기화: {model}")
+        return OpenAIEmbeddings(model=model, max_retries=kwargs.get("max_retries", 2))
+
+    if kind == "huggingface":
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        model = model or DEFAULT_MODELS["huggingface"]
+        device = kwargs.get("device", "cpu")
+        print(f"📦 HuggingFace 임베딩 모델 초기화: {model}")
+        print(f"   디바이스: {device}")
+        print("   ⚠️  모델이 로컬에 없으면 다운로드가 필요합니다 (토큰/네트워크 확인).")
+        return HuggingFaceEmbeddings(
+            model_name=model,
+            model_kwargs={
+                "device": device,
+                "trust_remote_code": True,
+                "token": kwargs.get("token"),
+            },
+            encode_kwargs={
+                "normalize_embeddings": True,
+                "batch_size": kwargs.get("batch_size", 8),
+            },
+        )
+
+    raise ValueError(f"지원하지 않는 임베딩 종류: {kind}")
+
+
+def load_concurrent_embedder(kind: str, model: Optional[str] = None, **kwargs: Any) -> Any:
+    """
+    원격 API(upstage/openai)는 ConcurrentEmbedder로 감싸 여러 배치를 동시에 보냅니다.
+    재시도는 실행기가 맡으므로 클라이언트 자체 재시도는 끕니다.
+    CPU의 로컬 모델은 길이별 배치를 여러 프로세스로 나눠 인코딩하는 CPUEncodingEngine을 씁니다.
+    EMBEDDING_CACHE_PATH가 있으면 가장 바깥에서 (모델, 텍스트) 캐시를 먼저 확인합니다.
+    """
+    if kind == "huggingface" and kwargs.get("device", "cpu") == "cpu":
+        embeddings = CPUEncodingEngine(
+            model or DEFAULT_MODELS[kind],
+            workers=HF_ENCODE_WORKERS or None,
+            max_batch_tokens=HF_MAX_BATCH_TOKENS,
+            token=kwargs.get("token"),
+            quantize=HUGGINGFACE_QUANTIZE,
+        )
+    elif kind == "huggingface":
+        embeddings = load_embedder(kind, model, **kwargs)
+    else:
+        embeddings = ConcurrentEmbedder.from_langchain(
+            load_embedder(kind, model, max_retries=0, **kwargs),
+            max_concurrency=EMBEDDING_CONCURRENCY,
+            rpm=EMBEDDING_RPM,
+            tpm=EMBEDDING_TPM,
+            max_batch_tokens=EMBEDDING_MAX_BATCH_TOKENS,
+            max_batch_size=EMBEDDING_REQUEST_SIZE,
+        )
+
+    if not EMBEDDING_CACHE_PATH:
+        return embeddings
+    model_id = f"{kind}:{model or DEFAULT_MODELS[kind]}"
+    if kind == "huggingface" and HUGGINGFACE_QUANTIZE != "none":
+        # 양자화 모델의 벡터는 float32와 조금 다르므로 캐시를 따로 씁니다.
+        model_id += f"#{HUGGINGFACE_QUANTIZE}"
+    return CachedEmbedder(embeddings, model_id, EmbeddingCache(EMBEDDING_CACHE_PATH))
@@ -0,0 +1,206 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+# 텍스트 배치 → 벡터 배치
+EmbedBatchFn = Callable[[List[str]], List[List[float]]]
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적 추정치. 한글은 대략 글자당 1토큰으로 셉니다."""
+    return max(1, len(text))
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429/5xx 응답이나 연결 끊김/타임아웃처럼 다시 시도할 만한 오류인지 판단합니다."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # 상태 코드가 없는 연결 끊김/타임아웃 (openai.APIConnectionError, requests.ConnectionError 등)
+    name = type(exc).__name__
+    return isinstance(exc, (ConnectionError, TimeoutError)) or "Timeout" in name or "Connection" in name
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """응답의 Retry-After 헤더(초)가 있으면 반환합니다."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """분당 한도를 초당 속도로 채우는 토큰 버킷 (최대 burst_s초 분량까지 모아 둠)."""
+
+    def __init__(self, per_minute: float, burst_s: float = 10.0) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(self.rate * burst_s, 1.0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # 버킷보다 큰 요청은 가득 찼을 때 보내고 빚(음수)으로 남깁니다.
+        need = min(amount, self.capacity)
+        return 0.0 if self.level >= need else (need - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class RateLimiter:
+    """제공자의 RPM(분당 요청)/TPM(분당 토큰) 한도를 넘지 않도록 요청 전에 기다립니다."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        self._requests = _Bucket(rpm) if rpm else None
+        self._tokens = _Bucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        while True:
+            with self._lock:
+                wait = max(
+                    self._requests.wait_time(1) if self._requests else 0.0,
+                    self._tokens.wait_time(tokens) if self._tokens else 0.0,
+                )
+                if wait <= 0:
+                    if self._requests:
+                        self._requests.take(1)
+                    if self._tokens:
+                        self._tokens.take(tokens)
+                    return
+            time.sleep(wait)
+
+
+class ConcurrentEmbedder:
+    """
+    embed_documents 입력을 토큰 수 기준 배치로 나눠 스레드 풀로 동시에 보내는 임베딩 실행기.
+
+    - 배치: max_batch_tokens / max_batch_size 를 넘지 않게 순서대로 묶습니다
+    - 동시성: max_concurrency, RPM을 알면 Little's law(요청률 × 예상 지연)로 더 줄입니다
+    - 429/5xx/연결 오류: Retry-After 또는 지수 백오프(full jitter)로 재시도합니다
+    결과 순서는 입력 순서와 같고, LangChain Embeddings 자리에 그대로 끼울 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        embed_query: Optional[Callable[[str], List[float]]] = None,
+        max_concurrency: int = 4,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_batch_tokens: int = 8000,
+        max_batch_size: int = 32,
+        max_retries: int = 6,
+        base_delay_s: float = 0.5,
+        max_delay_s: float = 30.0,
+        expected_latency_s: float = 2.0,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        self.embed_batch = embed_batch
+        self._embed_query = embed_query
+        if rpm:
+            max_concurrency = min(max_concurrency, max(1, math.ceil(rpm / 60.0 * expected_latency_s)))
+        self.max_concurrency = max_concurrency
+        self.limiter = RateLimiter(rpm, tpm)
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.token_counter = token_counter
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embed")
+        self._stats_lock = threading.Lock()
+        self.embedded = 0
+        self.requests = 0
+        self.retries = 0
+        self.busy_s = 0.0
+
+    @classmethod
+    def from_langchain(cls, embeddings: Any, **kwargs: Any) -> "ConcurrentEmbedder":
+        """LangChain Embeddings의 embed_documents를 배치 호출 함수로 씁니다."""
+        return cls(embeddings.embed_documents, embed_query=embeddings.embed_query, **kwargs)
+
+    def split_batches(self, texts: Sequence[str]) -> List[List[int]]:
+        """입력 순서를 유지하며 토큰/개수 한도 안에서 인덱스 배치를 만듭니다."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        tokens = 0
+        for idx, text in enumerate(texts):
+            n = self.token_counter(text)
+            if current and (tokens + n > self.max_batch_tokens or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(idx)
+            tokens += n
+        if current:
+            batches.append(current)
+        return batches
+
+    def _call(self, batch: List[str]) -> List[List[float]]:
+        tokens = sum(self.token_counter(text) for text in batch)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(tokens)
+            try:
+                vectors = self.embed_batch(batch)
+                with self._stats_lock:
+                    self.requests += 1
+                return vectors
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    raise
+                delay = retry_after(exc)
+                if delay is None:
+                    delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+                with self._stats_lock:
+                    self.retries += 1
+                print(f"⚠️  임베딩 요청 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {exc}")
+                time.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        start = time.perf_counter()
+        batches = self.split_batches(texts)
+        futures = [self._executor.submit(self._call, [texts[i] for i in batch]) for batch in batches]
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, future in zip(batches, futures):
+            for idx, vector in zip(batch, future.result()):
+                results[idx] = vector
+        with self._stats_lock:
+            self.embedded += len(texts)
+            self.busy_s += time.perf_counter() - start
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        if self._embed_query is not None:
+            return self._embed_query(text)
+        return self.embed_documents([text])[0]
+
+    @property
+    def embeddings_per_s(self) -> float:
+        return self.embedded / self.busy_s if self.busy_s > 0 else 0.0
+
+    def report(self) -> None:
+        print(
+            f"🚀 임베딩 {self.embedded}개, 요청 {self.requests}회 (재시도 {self.retries}회), "
+            f"동시성 {self.max_concurrency}, {self.embeddings_per_s:.1f} embeddings/s"
+        )
@@ -0,0 +1,86 @@
+import os
+from typing import Any, List, Optional
+
+import numpy as np
+
+# none: float32 그대로, int8: Linear 층 동적 int8 양자화(torch), onnx: ONNX Runtime CPU 실행
+QUANTIZE_MODES = ("none", "int8", "onnx")
+
+
+def load_local_model(
+    model_name: str,
+    token: Optional[str] = None,
+    quantize: str = "none",
+    local_files_only: bool = False,
+) -> Any:
+    """
+    로컬 캐시(또는 Hub)의 SentenceTransformer 모델을 CPU로 올립니다.
+    local_files_only=True면 네트워크 없이 이미 받아 둔 모델만 사용합니다.
+    """
+    if quantize not in QUANTIZE_MODES:
+        raise ValueError(f"지원하지 않는 양자화 모드: {quantize} (가능: {', '.join(QUANTIZE_MODES)})")
+
+    from sentence_transformers import SentenceTransformer
+
+    kwargs = {"device": "cpu", "trust_remote_code": True, "token": token, "local_files_only": local_files_only}
+    if quantize == "onnx":
+        # ONNX 그래프가 없으면 sentence-transformers가 optimum으로 내보낸 뒤 캐시에 둡니다.
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"provider": "CPUExecutionProvider"},
+            **kwargs,
+        )
+
+    model = SentenceTransformer(model_name, **kwargs)
+    if quantize == "int8":
+        import torch
+
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+class LocalEmbedder:
+    """
+    한 프로세스 안에서 도는 로컬 임베딩 모델 (질의 임베딩용).
+    quantize로 int8/ONNX 추론을 고르면 CPU 질의 지연이 줄어듭니다 (bench.quantized_embedder로 recall 확인).
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: str = "none",
+        token: Optional[str] = None,
+        normalize: bool = True,
+        batch_size: int = 8,
+        local_files_only: bool = False,
+    ) -> None:
+        self.model_name = model_name
+        self.quantize = quantize
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self.model = load_local_model(model_name, token, quantize, local_files_only)
+        print(f"📦 로컬 임베딩 모델: {model_name} (양자화: {quantize})")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ),
+            dtype=np.float32,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts).tolist() if texts else []
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+
+def local_files_only_from_env() -> bool:
+    """HF_HUB_OFFLINE=1 이면 캐시된 모델만 씁니다."""
+    return os.getenv("HF_HUB_OFFLINE", "0") == "1"
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from langchain_core.documents import Document
+
+from .sinks import vector_id
+
+
+def content_hash(doc: Document) -> str:
+    """임베딩 텍스트와 메타데이터를 합친 sha256. 둘 중 하나라도 바뀌면 다시 임베딩합니다."""
+    payload = json.dumps(
+        {"text": doc.page_content, "metadata": doc.metadata},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """
+    저장소에 올라간 벡터의 {벡터 id: 내용 해시}를 로컬 JSON으로 기록합니다.
+
+    - changed(): 새로 생겼거나 내용이 바뀐 문서만 남깁니다 (템플릿 단계 스레드에서 호출)
+    - record(): 저장이 끝난 문서의 해시를 기록합니다 (저장 단계에서 호출)
+    - stale_ids(): 이번 실행의 소스에 없었던 (DB에서 사라진) 벡터 id
+    임베딩 모델이 바뀌면 기존 기록을 버리고 전체를 다시 임베딩합니다.
+    """
+
+    def __init__(self, path: str, model: str = "", full: bool = False) -> None:
+        self.path = path
+        self.model = model
+        self.previous: Dict[str, str] = {}
+        # 저장소에 있다고 알려진 id → 해시. 전체 재임베딩 때도 id는 남겨 사라진 음식점을 지울 수 있게 합니다.
+        self.current: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            hashes = data.get("hashes", {})
+            if data.get("model") != model:
+                print(f"ℹ️  임베딩 모델이 바뀌어 전체를 다시 임베딩합니다: {data.get('model')} → {model}")
+            elif not full:
+                self.previous = hashes
+            self.current = {key: "" for key in hashes}
+            self.current.update(self.previous)
+        self.seen: Set[str] = set()
+        self.skipped = 0
+
+    def changed(self, docs: Iterable[Document]) -> List[Document]:
+        result = []
+        for doc in docs:
+            key = vector_id(doc)
+            self.seen.add(key)
+            digest = content_hash(doc)
+            if self.previous.get(key) == digest:
+                self.skipped += 1
+                continue
+            doc.metadata["content_hash"] = digest
+            result.append(doc)
+        return result
+
+    def record(self, docs: Iterable[Document]) -> None:
+        for doc in docs:
+            self.current[vector_id(doc)] = doc.metadata.get("content_hash") or content_hash(doc)
+
+    def stale_ids(self) -> List[str]:
+        return sorted(set(self.current) - self.seen)
+
+    def forget(self, ids: Iterable[str]) -> None:
+        for key in ids:
+            self.current.pop(key, None)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """임시 파일에 쓴 뒤 교체해, 중간에 중단돼도 이전 기록이 깨지지 않게 합니다."""
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "hashes": self.current}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
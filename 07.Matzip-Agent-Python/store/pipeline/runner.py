@@ -0,0 +1,186 @@
+import threading
+import time
+from dataclasses import dataclass
+from queue import Queue
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+if TYPE_CHECKING:
+    from .manifest import IndexManifest
+
+# 단계 사이를 오가는 배치 (Document, 벡터) 쌍
+Embedded = List[Tuple[Document, List[float]]]
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """단계별 처리 행 수와 실제 작업 시간 (대기 시간 제외)."""
+
+    name: str
+    rows: int = 0
+    busy_s: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.busy_s if self.busy_s > 0 else float("inf")
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """이터레이터를 size개씩 묶습니다 (마지막 배치는 더 작을 수 있음)."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _stage(
+    upstream: Iterator[List[Any]],
+    fn: Optional[Callable[[List[Any]], Any]],
+    stats: StageStats,
+    queue_size: int,
+) -> Iterator[Any]:
+    """
+    upstream의 배치마다 fn을 적용하는 스레드를 띄우고, 결과를 크기가 제한된 큐로 넘깁니다.
+    큐가 가득 차면 앞 단계가 멈추므로 전체 메모리는 (단계 수 × queue_size) 배치로 묶입니다.
+    fn이 None이면 upstream에서 꺼내는 시간 자체를 이 단계의 작업 시간으로 잽니다 (소스 단계).
+    """
+    queue: Queue = Queue(maxsize=queue_size)
+
+    def work() -> None:
+        try:
+            iterator = iter(upstream)
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    break
+                if fn is not None:
+                    start = time.perf_counter()
+                    out = fn(batch)
+                else:
+                    out = batch
+                stats.busy_s += time.perf_counter() - start
+                stats.rows += len(batch)
+                queue.put(out)
+        except BaseException as exc:
+            queue.put(_Failure(exc))
+        finally:
+            queue.put(_DONE)
+
+    threading.Thread(target=work, name=f"pipeline-{stats.name}", daemon=True).start()
+    while True:
+        item = queue.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.exc
+        yield item
+
+
+def run_pipeline(
+    rows: Iterable[Dict[str, Any]],
+    template: Callable[[Dict[str, Any]], Document],
+    embedder: Any,
+    sink: Any,
+    batch_size: int = 64,
+    queue_size: int = 4,
+    manifest: Optional["IndexManifest"] = None,
+) -> Dict[str, StageStats]:
+    """
+    source → template → embed → sink 를 스트리밍으로 연결해 실행합니다.
+
+    - rows: 행(dict) 이터레이터 (예: MySQLSource.rows())
+    - template: 행 → Document (store.pipeline.templates), None을 돌려주면 그 행은 건너뜁니다
+    - embedder: LangChain Embeddings (embed_documents 사용)
+    - sink: write(List[(Document, 벡터)]) / delete(ids) / close() 를 가진 저장소
+    - manifest: 주면 내용 해시가 바뀐 음식점만 임베딩하고, 소스에서 사라진 벡터는 삭제합니다
+    """
+    stats = {name: StageStats(name) for name in ("source", "template", "embed", "sink")}
+
+    def build(batch: List[Dict[str, Any]]) -> List[Document]:
+        docs = [doc for doc in map(template, batch) if doc is not None]
+        if manifest is None:
+            return docs
+        changed = manifest.changed(docs)
+        if hasattr(embedder, "touch") and len(changed) < len(docs):
+            # 건너뛴 문서의 캐시 항목도 아직 쓰이는 중으로 표시해 gc 대상에서 빼냅니다.
+            kept = {id(doc) for doc in changed}
+            embedder.touch(doc.page_content for doc in docs if id(doc) not in kept)
+        return changed
+
+    def embed(docs: List[Document]) -> Embedded:
+        vectors = embedder.embed_documents([doc.page_content for doc in docs])
+        return list(zip(docs, vectors))
+
+    start = time.perf_counter()
+    stream = _stage(batched(rows, batch_size), None, stats["source"], queue_size)
+    stream = _stage(stream, build, stats["template"], queue_size)
+    # 바뀐 문서만 남으면 배치가 작아지므로 임베딩 전에 다시 묶습니다.
+    stream = batched((doc for docs in stream for doc in docs), batch_size)
+    stream = _stage(stream, embed, stats["embed"], queue_size)
+    try:
+        for items in stream:
+            sink_start = time.perf_counter()
+            sink.write(items)
+            stats["sink"].busy_s += time.perf_counter() - sink_start
+            stats["sink"].rows += len(items)
+            if manifest is not None:
+                manifest.record(doc for doc, _vector in items)
+            print(f"   ↳ {stats['sink'].rows}개 저장")
+
+        # 소스를 끝까지 읽은 경우에만 사라진 음식점을 지웁니다.
+        # (조회 결과가 0행이면 잘못된 DB일 수 있으므로 지우지 않습니다.)
+        if manifest is not None:
+            stale = manifest.stale_ids() if manifest.seen else []
+            if stale:
+                sink.delete(stale)
+                manifest.forget(stale)
+            print(f"♻️  변경 없음 {manifest.skipped}개 건너뜀, 삭제 {len(stale)}개")
+    finally:
+        # 실패해도 이미 저장된 배치의 해시는 남겨 다음 실행에서 건너뜁니다.
+        if manifest is not None:
+            manifest.save()
+        sink.close()
+
+    print_stats(stats.values(), time.perf_counter() - start)
+    if hasattr(embedder, "report"):
+        embedder.report()
+    return stats
+
+
+def print_stats(stats: Sequence[StageStats], wall_s: float) -> None:
+    """단계별 rows/s를 출력합니다. 가장 느린 단계가 전체 처리량을 결정합니다."""
+    stats = list(stats)
+    total = stats[-1].rows if stats else 0
+    print(f"\n📊 파이프라인 처리량 (총 {total}행, {wall_s:.1f}s, {total / max(wall_s, 1e-9):.1f} rows/s)")
+    for stage in stats:
+        print(f"   - {stage.name:<8} {stage.rows:>7}행  {stage.busy_s:7.2f}s  {stage.rows_per_s:10.1f} rows/s")
+
+
+def test_search(vectorstore: Any, query: str = "냉면", k: int = 3) -> None:
+    """임베딩 결과를 간단히 검색 테스트"""
+    print(f"\n🔍 테스트 검색: '{query}'")
+    results = vectorstore.similarity_search(query, k=k)
+
+    print(f"검색 결과 {len(results)}개:")
+    for idx, doc in enumerate(results, start=1):
+        print(f"\n--- 결과 {idx} ---")
+        print(f"이름: {doc.metadata.get('name')}")
+        print(f"카테고리: {doc.metadata.get('category')}")
+        if doc.metadata.get("signature_menu"):
+            print(f"대표메뉴: {doc.metadata.get('signature_menu')}")
+        print(f"위치: {doc.metadata.get('location_type')}")
+        print(f"리뷰수: {doc.metadata.get('naver_review_count')}")
@@ -0,0 +1,396 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .executor import is_retryable, retry_after
+from .runner import Embedded, batched
+
+
+def vector_id(doc: Document) -> str:
+    """restaurant_id를 벡터 id로 씁니다. 다시 실행해도 같은 음식점은 덮어쓰기(upsert)됩니다."""
+    return str(doc.metadata["restaurant_id"])
+
+
+def legacy_ids(ids: Iterable[str]) -> List[str]:
+    """restaurant_id가 아닌 id (파이프라인 이전 스크립트가 uuid4로 올린 벡터)."""
+    return [id_ for id_ in ids if not str(id_).isdigit()]
+
+
+def vector_digest(id_: str, vector: Sequence[float]) -> int:
+    """(id, float32 벡터) 한 쌍의 64비트 해시."""
+    digest = hashlib.blake2b(str(id_).encode() + b"\0", digest_size=8)
+    digest.update(np.asarray(vector, dtype=np.float32).tobytes())
+    return int.from_bytes(digest.digest(), "little")
+
+
+def vector_checksum(pairs: Iterable[Tuple[str, Sequence[float]]]) -> str:
+    """
+    (id, 벡터) 집합의 체크섬. 해시를 2^64로 나눈 나머지로 더하므로 저장 순서와 무관하고,
+    저장소마다 따로 계산해 비교할 수 있습니다 (벡터는 float32로 맞춘 뒤 해시합니다).
+    """
+    total = 0
+    for id_, vector in pairs:
+        total = (total + vector_digest(id_, vector)) % (1 << 64)
+    return f"{total:016x}"
+
+
+class PineconeSink:
+    """배치 단위로 Pinecone에 upsert 합니다. 본문은 langchain_pinecone과 같이 metadata["text"]에 둡니다."""
+
+    def __init__(
+        self,
+        index_name: str,
+        namespace: str,
+        dimension: int,
+        cloud: str = "aws",
+        region: str = "us-east-1",
+        upsert_batch_size: int = 32,
+    ) -> None:
+        from pinecone import Pinecone
+
+        api_key = os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("PINECONE_API_KEY가 .env 파일에 설정되지 않았습니다")
+
+        self.pc = Pinecone(api_key=api_key)
+        self.index_name = index_name
+        self.namespace = namespace
+        self.upsert_batch_size = upsert_batch_size
+        self._ensure_index(dimension, cloud, region)
+        self.index = self.pc.Index(index_name)
+        print(f"💾 Pinecone에 저장 (인덱스: {index_name}, 네임스페이스: {namespace})")
+        self._drop_legacy_ids()
+
+    def _ensure_index(self, dimension: int, cloud: str, region: str) -> None:
+        """필요 시 Pinecone 인덱스를 생성"""
+        from pinecone import ServerlessSpec
+
+        if self.index_name in set(self.pc.list_indexes().names()):
+            print(f"ℹ️  기존 Pinecone 인덱스 사용: {self.index_name}")
+            return
+
+        print(f"🆕 Pinecone 인덱스 생성: {self.index_name}")
+        self.pc.create_index(
+            name=self.index_name,
+            dimension=dimension,
+            metric="cosine",
+            spec=ServerlessSpec(cloud=cloud, region=region),
+        )
+        print("⌛ 인덱스 준비 대기 중...")
+        while not self.pc.describe_index(self.index_name).status["ready"]:
+            time.sleep(1)
+        print("✅ 인덱스 준비 완료")
+
+    def _drop_legacy_ids(self) -> None:
+        """
+        이전 스크립트가 uuid4 id로 올린 벡터를 지웁니다 (처음 한 번만 해당).
+        upsert는 restaurant_id id로 새 벡터를 더할 뿐이라, 남겨 두면 모든 음식점이 두 번씩 검색됩니다.
+        """
+        stale = [id_ for page in self.index.list(namespace=self.namespace) for id_ in legacy_ids(page)]
+        if stale:
+            print(f"🧹 이전 uuid id 벡터 {len(stale)}개 삭제 (네임스페이스: {self.namespace})")
+            self.delete(stale)
+
+    def write(self, items: Embedded) -> None:
+        # 4096차원 벡터는 요청 크기 제한(2MB) 때문에 작은 묶음으로 나눠 보냅니다.
+        for chunk in batched(items, self.upsert_batch_size):
+            self.index.upsert(
+                vectors=[
+                    {
+                        "id": vector_id(doc),
+                        "values": list(vector),
+                        "metadata": {**doc.metadata, "text": doc.page_content},
+                    }
+                    for doc, vector in chunk
+                ],
+                namespace=self.namespace,
+            )
+
+    def delete(self, ids: List[str]) -> None:
+        for chunk in batched(ids, 1000):
+            self.index.delete(ids=chunk, namespace=self.namespace)
+
+    def close(self) -> None:
+        pass
+
+    def count(self) -> int:
+        """네임스페이스의 벡터 수 (Pinecone 통계는 쓰기 직후 바로 반영되지 않을 수 있습니다)."""
+        summary = (self.index.describe_index_stats().namespaces or {}).get(self.namespace)
+        return int(summary.vector_count) if summary is not None else 0
+
+    def as_vectorstore(self, embedding: Any) -> Any:
+        from langchain_pinecone import PineconeVectorStore
+
+        return PineconeVectorStore(index=self.index, embedding=embedding, namespace=self.namespace)
+
+
+class ChromaSink:
+    """배치 단위로 로컬 ChromaDB 컬렉션에 upsert 합니다."""
+
+    def __init__(self, path: str, collection_name: str) -> None:
+        import chromadb
+
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.collection_name = collection_name
+        self.client = chromadb.PersistentClient(path=path)
+        self.collection = self.client.get_or_create_collection(collection_name)
+        print(f"💾 ChromaDB에 저장: {path} (컬렉션명: {collection_name})")
+        self._drop_legacy_ids()
+
+    def _drop_legacy_ids(self) -> None:
+        """이전 스크립트가 uuid4 id로 넣은 문서를 지웁니다 (PineconeSink._drop_legacy_ids 참고)."""
+        stale = legacy_ids(self.collection.get(include=[])["ids"])
+        if stale:
+            print(f"🧹 이전 uuid id 문서 {len(stale)}개 삭제 (컬렉션: {self.collection_name})")
+            for chunk in batched(stale, 1000):
+                self.delete(chunk)
+
+    def write(self, items: Embedded) -> None:
+        docs: List[Document] = [doc for doc, _vector in items]
+        metadatas: List[Dict[str, Any]] = [doc.metadata for doc in docs]
+        self.collection.upsert(
+            ids=[vector_id(doc) for doc in docs],
+            embeddings=[list(vector) for _doc, vector in items],
+            metadatas=metadatas,
+            documents=[doc.page_content for doc in docs],
+        )
+
+    def delete(self, ids: List[str]) -> None:
+        self.collection.delete(ids=list(ids))
+
+    def close(self) -> None:
+        pass
+
+    def count(self) -> int:
+        return int(self.collection.count())
+
+    def checksum(self, page_size: int = 1000) -> str:
+        """컬렉션에 실제로 저장된 (id, 벡터) 전체의 vector_checksum."""
+
+        def pairs() -> Iterable[Tuple[str, Sequence[float]]]:
+            offset = 0
+            while True:
+                page = self.collection.get(include=["embeddings"], limit=page_size, offset=offset)
+                if not page["ids"]:
+                    return
+                yield from zip(page["ids"], page["embeddings"])
+                offset += len(page["ids"])
+
+        return vector_checksum(pairs())
+
+    def as_vectorstore(self, embedding: Any) -> Any:
+        from langchain_chroma import Chroma
+
+        return Chroma(
+            client=self.client,
+            collection_name=self.collection_name,
+            embedding_function=embedding,
+        )
+
+
+class LocalIndexSink:
+    """
+    임베딩 결과를 모아 close() 때 로컬 벡터 인덱스 artifact(agent.vector_index)로 내보냅니다.
+    기존 artifact가 있으면 불러와서 바뀐 음식점만 덮어쓰므로 IndexManifest 증분 실행과 함께 쓸 수 있습니다.
+    새 artifact는 임시 디렉터리에 다 쓴 뒤 교체해, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 합니다.
+    """
+
+    def __init__(self, directory: str, model: str = "") -> None:
+        self.directory = directory
+        self.model = model
+        self._items: Dict[str, Tuple[Dict[str, Any], np.ndarray]] = {}
+
+        if os.path.exists(os.path.join(directory, "index.json")):
+            from agent.vector_index import LocalVectorIndex
+
+            index = LocalVectorIndex(directory, mode="float32")
+            if not model or index.info.get("model") in ("", model):
+                for idx, record in enumerate(index.records):
+                    self._items[str(record["metadata"]["restaurant_id"])] = (record, np.array(index.vectors[idx]))
+        print(f"💾 로컬 벡터 인덱스로 내보내기: {directory} (기존 {len(self._items)}개)")
+
+    def write(self, items: Embedded) -> None:
+        for doc, vector in items:
+            record = {"page_content": doc.page_content, "metadata": dict(doc.metadata)}
+            self._items[vector_id(doc)] = (record, np.asarray(vector, dtype=np.float32))
+
+    def delete(self, ids: List[str]) -> None:
+        for id_ in ids:
+            self._items.pop(str(id_), None)
+
+    def count(self) -> int:
+        return len(self._items)
+
+    def checksum(self) -> str:
+        return vector_checksum((id_, vector) for id_, (_record, vector) in self._items.items())
+
+    def close(self) -> None:
+        from agent.vector_index import LocalVectorIndex
+
+        if not self._items:
+            print("⚠️  내보낼 벡터가 없습니다.")
+            return
+        records = [record for record, _vector in self._items.values()]
+        vectors = np.stack([vector for _record, vector in self._items.values()])
+
+        staging = f"{self.directory.rstrip(os.sep)}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        info = LocalVectorIndex.build(staging, vectors, records, model=self.model)
+        previous = f"{self.directory.rstrip(os.sep)}.old"
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(self.directory):
+            os.replace(self.directory, previous)
+        os.replace(staging, self.directory)
+        shutil.rmtree(previous, ignore_errors=True)
+        print(f"✅ {info['count']}개 벡터 ({info['dimension']}차원) artifact 저장: {self.directory}")
+
+    def as_vectorstore(self, embedding: Any) -> Any:
+        from agent.vector_index import LocalVectorIndex
+
+        return LocalVectorIndex(self.directory, mode="float32", embedding=embedding)
+
+
+class FanoutSink:
+    """
+    한 번 계산한 임베딩을 여러 저장소(Chroma 컬렉션, Pinecone 네임스페이스, 로컬 artifact 등)에 나란히 씁니다.
+
+    - 배치마다 저장소별 write를 스레드로 동시에 호출하고 모두 끝날 때까지 기다립니다.
+      저장 단계 시간은 저장소 수의 합이 아니라 가장 느린 저장소 하나 정도가 되고,
+      run_pipeline의 IndexManifest에는 모든 저장소에 들어간 배치만 기록됩니다.
+    - batch_sizes로 저장소별 묶음 크기를 정할 수 있고, 일시적인 오류(429/5xx/연결 끊김)는
+      저장소별로 지수 백오프 후 그 묶음만 다시 씁니다. 재시도 뒤에도 실패하면 예외를 올립니다.
+    - close() 때 저장소별 쓰기/삭제 수, 실제 저장 수(count), 체크섬을 한 번에 비교해 출력합니다.
+      "이번 실행" 체크섬은 이번에 쓴 (id, 벡터)로, "저장" 체크섬은 저장소가 지원할 때 실제 내용으로 계산합니다.
+    """
+
+    def __init__(
+        self,
+        sinks: Dict[str, Any],
+        batch_sizes: Optional[Dict[str, int]] = None,
+        max_retries: int = 5,
+        base_delay_s: float = 1.0,
+        max_delay_s: float = 30.0,
+        report_path: Optional[str] = None,
+    ) -> None:
+        if not sinks:
+            raise ValueError("저장소가 하나 이상 필요합니다")
+        self.sinks = dict(sinks)
+        self.batch_sizes = batch_sizes or {}
+        self.max_retries = max_retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.report_path = report_path
+        self.written = {name: 0 for name in self.sinks}
+        self.deleted = {name: 0 for name in self.sinks}
+        self.retries = {name: 0 for name in self.sinks}
+        self.busy_s = {name: 0.0 for name in self.sinks}
+        # 저장소별로 이번 실행에서 쓴 id → 해시 (나중 upsert가 덮어쓰고 delete는 지웁니다)
+        self._digests: Dict[str, Dict[str, int]] = {name: {} for name in self.sinks}
+        self._pool = ThreadPoolExecutor(max_workers=len(self.sinks), thread_name_prefix="fanout")
+        print(f"🔀 저장소 {len(self.sinks)}곳에 동시에 저장: {', '.join(self.sinks)}")
+
+    def _retrying(self, name: str, fn: Any, *args: Any) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return fn(*args)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    raise RuntimeError(f"[{name}] 저장 실패: {exc}") from exc
+                delay = retry_after(exc)
+                if delay is None:
+                    delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+                self.retries[name] += 1
+                print(f"⚠️  [{name}] 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {exc}")
+                time.sleep(delay)
+
+    def _fanout(self, task: Any) -> None:
+        """저장소마다 task(name, sink)를 동시에 실행하고, 모두 끝난 뒤 첫 오류를 올립니다."""
+        futures = {name: self._pool.submit(task, name, sink) for name, sink in self.sinks.items()}
+        errors = [future.exception() for future in futures.values()]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def write(self, items: Embedded) -> None:
+        # 해시는 저장소 수와 관계없이 배치당 한 번만 계산합니다.
+        digests = [(vector_id(doc), vector_digest(vector_id(doc), vector)) for doc, vector in items]
+
+        def write_one(name: str, sink: Any) -> None:
+            start = time.perf_counter()
+            for chunk in batched(items, self.batch_sizes.get(name, len(items) or 1)):
+                self._retrying(name, sink.write, chunk)
+            self.busy_s[name] += time.perf_counter() - start
+            self.written[name] += len(items)
+            self._digests[name].update(digests)
+
+        self._fanout(write_one)
+
+    def delete(self, ids: List[str]) -> None:
+        def delete_one(name: str, sink: Any) -> None:
+            self._retrying(name, sink.delete, ids)
+            self.deleted[name] += len(ids)
+            for id_ in ids:
+                self._digests[name].pop(str(id_), None)
+
+        self._fanout(delete_one)
+
+    def close(self) -> None:
+        try:
+            # 로컬 artifact 빌드처럼 close가 오래 걸리는 저장소도 있어 닫기도 동시에 합니다.
+            self._fanout(lambda _name, sink: sink.close())
+        finally:
+            self._pool.shutdown(wait=True)
+        self.report()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """저장소별 일관성 보고서를 출력하고 (report_path가 있으면 JSON으로도 저장) 돌려줍니다."""
+        report: Dict[str, Dict[str, Any]] = {}
+        for name, sink in self.sinks.items():
+            entry: Dict[str, Any] = {
+                "written": self.written[name],
+                "deleted": self.deleted[name],
+                "retries": self.retries[name],
+                "busy_s": round(self.busy_s[name], 3),
+                "run_checksum": f"{sum(self._digests[name].values()) % (1 << 64):016x}",
+            }
+            for key in ("count", "checksum"):
+                if hasattr(sink, key):
+                    try:
+                        entry["stored_count" if key == "count" else "stored_checksum"] = getattr(sink, key)()
+                    except Exception as exc:
+                        entry[f"{key}_error"] = str(exc)
+            report[name] = entry
+
+        consistent = all(
+            len({entry[key] for entry in report.values() if key in entry}) <= 1
+            for key in ("run_checksum", "stored_count", "stored_checksum")
+        )
+        print(f"\n🧾 저장소 일관성 보고서 ({'일치' if consistent else '불일치'})")
+        for name, entry in report.items():
+            stored = ", ".join(
+                f"{key} {entry[key]}" for key in ("stored_count", "stored_checksum") if key in entry
+            )
+            print(
+                f"   - {name:<10} 쓰기 {entry['written']:>7}  삭제 {entry['deleted']:>5}  재시도 {entry['retries']:>3}  "
+                f"{entry['busy_s']:7.2f}s  run {entry['run_checksum']}" + (f"  ({stored})" if stored else "")
+            )
+        if not consistent:
+            print("⚠️  저장소 간 수/체크섬이 다릅니다. 새로 추가한 저장소라면 REINDEX_FULL=1 로 한 번 전체 색인하세요.")
+
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump({"consistent": consistent, "sinks": report}, f, ensure_ascii=False, indent=2)
+        return report
+
+    def as_vectorstore(self, embedding: Any) -> Any:
+        """첫 번째 저장소로 검색합니다."""
+        return next(iter(self.sinks.values())).as_vectorstore(embedding)
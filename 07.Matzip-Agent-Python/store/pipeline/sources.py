@@ -0,0 +1,272 @@
+import os
+import queue
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pymysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def mysql_config_from_env() -> Dict[str, Any]:
+    """.env의 MySQL 접속 정보를 읽습니다."""
+    config = {
+        "host": os.getenv("MYSQL_HOST", "localhost"),
+        "user": os.getenv("MYSQL_USER", "root"),
+        "password": os.getenv("MYSQL_PASSWORD"),
+        "database": os.getenv("MYSQL_DATABASE"),
+        "charset": "utf8mb4",
+    }
+    if not config["password"]:
+        raise ValueError("MYSQL_PASSWORD가 .env 파일에 설정되지 않았습니다")
+    if not config["database"]:
+        raise ValueError("MYSQL_DATABASE가 .env 파일에 설정되지 않았습니다")
+    return config
+
+
+def build_restaurant_query(
+    review_column: str = "naver_review_count",
+    min_price: int = 7000,
+    max_price: int = 20000,
+    weather_tags: bool = True,
+) -> str:
+    """음식점과 메뉴(가격대 안)/날씨 태그를 조인하는 조회 SQL"""
+    weather_select = ",\n            GROUP_CONCAT(DISTINCT wt.tag_name SEPARATOR ', ') AS weather_tags" if weather_tags else ""
+    weather_join = """
+        LEFT JOIN restaurant_weather_tags rwt ON r.id = rwt.restaurant_id
+        LEFT JOIN weather_tags wt ON rwt.weather_tag_id = wt.id""" if weather_tags else ""
+    signature_select = "\n            r.signature_menu," if weather_tags else ""
+
+    return f"""
+        SELECT
+            r.id,
+            r.name,
+            r.category,{signature_select}
+            r.description,
+            r.{review_column} AS naver_review_count,
+            r.phone,
+            r.latitude,
+            r.longitude,
+            r.location_type,
+            r.naver_id,
+            r.homepage_url,
+            r.main_thumbnail_url,
+            GROUP_CONCAT(DISTINCT m.menu_name, ':', m.price ORDER BY m.price SEPARATOR ' | ') AS menus{weather_select}
+        FROM restaurants r
+        LEFT JOIN menus m ON r.id = m.restaurant_id
+            AND m.price >= {int(min_price)}
+            AND m.price <= {int(max_price)}{weather_join}
+        GROUP BY r.id
+        ORDER BY r.id
+    """
+
+
+class MySQLSource:
+    """
+    서버 측 커서(SSDictCursor)로 결과를 fetch_size행씩 스트리밍하는 소스.
+    fetchall()과 달리 전체 결과를 클라이언트 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self, query: str, config: Optional[Dict[str, Any]] = None, fetch_size: int = 500) -> None:
+        self.query = query
+        self.config = config or mysql_config_from_env()
+        self.fetch_size = fetch_size
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        connection = pymysql.connect(**self.config, cursorclass=pymysql.cursors.SSDictCursor)
+        print("✅ MySQL 연결 성공")
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.query)
+                while True:
+                    rows = cursor.fetchmany(self.fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
+        finally:
+            connection.close()
+            print("MySQL 연결 종료")
+
+
+class ConnectionPool:
+    """
+    factory로 만든 DB 연결을 최대 size개까지 재사용하는 간단한 풀.
+    MySQL 연결은 꺼낼 때 ping(reconnect=True)으로 끊긴 연결을 되살립니다.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 4) -> None:
+        self.factory = factory
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self._slots = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._slots.put(None)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        self._slots.get()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self.factory()
+        else:
+            if hasattr(conn, "ping"):
+                conn.ping(reconnect=True)
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        else:
+            self._idle.put(conn)
+        finally:
+            self._slots.put(None)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def mysql_pool(config: Optional[Dict[str, Any]] = None, size: int = 4) -> ConnectionPool:
+    """.env 설정으로 pymysql 연결 풀을 만듭니다."""
+    config = config or mysql_config_from_env()
+    return ConnectionPool(lambda: pymysql.connect(**config), size=size)
+
+
+def _fetch(conn: Any, sql: str, params: Sequence[Any]) -> Tuple[List[str], List[Sequence[Any]]]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, tuple(params))
+        return [col[0] for col in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _fetch_dicts(conn: Any, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+    columns, rows = _fetch(conn, sql, params)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class KeysetRestaurantSource:
+    """
+    restaurants를 id 키셋(WHERE r.id > 마지막 id ORDER BY r.id LIMIT n)으로 페이지 단위로 읽고,
+    메뉴/날씨 태그는 페이지의 id 목록으로 따로 조회해 클라이언트에서 합칩니다.
+
+    GROUP BY + GROUP_CONCAT 한 방 조회와 달리 group_concat_max_len에 잘리지 않고,
+    메모리는 페이지 크기에만 비례합니다. menus(restaurant_id, price)와
+    restaurant_weather_tags(restaurant_id) 인덱스가 있어야 페이지 조회가 빠릅니다.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ConnectionPool] = None,
+        page_size: int = 1000,
+        review_column: str = "naver_review_count",
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        weather_tags: bool = True,
+        signature_menu: bool = True,
+        placeholder: str = "%s",
+    ) -> None:
+        self.pool = pool or mysql_pool()
+        self.page_size = page_size
+        self.review_column = review_column
+        self.min_price = min_price
+        self.max_price = max_price
+        self.weather_tags = weather_tags
+        self.signature_menu = signature_menu
+        self.placeholder = placeholder  # pymysql은 %s, sqlite3는 ?
+
+    def _restaurant_sql(self) -> str:
+        signature = "r.signature_menu, " if self.signature_menu else ""
+        p = self.placeholder
+        return f"""
+            SELECT r.id, r.name, r.category, {signature}r.description,
+                   r.{self.review_column} AS naver_review_count, r.phone,
+                   r.latitude, r.longitude, r.location_type, r.naver_id,
+                   r.homepage_url, r.main_thumbnail_url
+            FROM restaurants r
+            WHERE r.id > {p}
+            ORDER BY r.id
+            LIMIT {p}
+        """
+
+    def _in_clause(self, n: int) -> str:
+        return ", ".join([self.placeholder] * n)
+
+    def _menus(self, conn: Any, ids: List[Any]) -> Dict[Any, Tuple[str, List[int]]]:
+        """restaurant_id → (메뉴 텍스트, 오름차순 메뉴 가격 목록)."""
+        p = self.placeholder
+        # 가격 조건은 검색 시점의 가격 필터로 처리하므로 기본은 모든 메뉴를 읽습니다.
+        price_window = ""
+        params: List[Any] = list(ids)
+        if self.min_price is not None:
+            price_window += f" AND price >= {p}"
+            params.append(self.min_price)
+        if self.max_price is not None:
+            price_window += f" AND price <= {p}"
+            params.append(self.max_price)
+        _, rows = _fetch(
+            conn,
+            f"""
+            SELECT restaurant_id, menu_name, price
+            FROM menus
+            WHERE restaurant_id IN ({self._in_clause(len(ids))}){price_window}
+            ORDER BY restaurant_id, price
+            """,
+            params,
+        )
+        # GROUP_CONCAT(DISTINCT menu_name, ':', price ORDER BY price SEPARATOR ' | ') 와 같은 모양
+        # (가격이 없는 메뉴는 "메뉴명:None" 대신 메뉴명만 남깁니다)
+        grouped: Dict[Any, Dict[str, None]] = {}
+        prices: Dict[Any, List[int]] = {}
+        for restaurant_id, menu_name, price in rows:
+            item = menu_name if price is None else f"{menu_name}:{price}"
+            grouped.setdefault(restaurant_id, {})[item] = None
+            if price is not None:
+                prices.setdefault(restaurant_id, []).append(int(price))
+        return {key: (" | ".join(items), prices.get(key, [])) for key, items in grouped.items()}
+
+    def _weather_tags(self, conn: Any, ids: List[Any]) -> Dict[Any, str]:
+        _, rows = _fetch(
+            conn,
+            f"""
+            SELECT rwt.restaurant_id, wt.tag_name
+            FROM restaurant_weather_tags rwt
+            JOIN weather_tags wt ON rwt.weather_tag_id = wt.id
+            WHERE rwt.restaurant_id IN ({self._in_clause(len(ids))})
+            """,
+            ids,
+        )
+        grouped: Dict[Any, Dict[str, None]] = {}
+        for restaurant_id, tag_name in rows:
+            grouped.setdefault(restaurant_id, {})[tag_name] = None
+        return {key: ", ".join(tags) for key, tags in grouped.items()}
+
+    def pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """페이지(음식점 page_size개) 단위로 메뉴/태그가 합쳐진 행 목록을 내보냅니다."""
+        last_id: Any = 0
+        while True:
+            with self.pool.connection() as conn:
+                restaurants = _fetch_dicts(conn, self._restaurant_sql(), [last_id, self.page_size])
+                if not restaurants:
+                    return
+                ids = [row["id"] for row in restaurants]
+                menus = self._menus(conn, ids)
+                tags = self._weather_tags(conn, ids) if self.weather_tags else {}
+            for row in restaurants:
+                row["menus"], row["menu_prices"] = menus.get(row["id"], (None, []))
+                if self.weather_tags:
+                    row["weather_tags"] = tags.get(row["id"])
+            yield restaurants
+            last_id = ids[-1]
+            if len(restaurants) < self.page_size:
+                return
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for page in self.pages():
+            yield from page
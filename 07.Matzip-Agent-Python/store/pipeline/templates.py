@@ -0,0 +1,126 @@
+from typing import Any, Callable, Dict
+
+from langchain_core.documents import Document
+
+from agent.prices import price_summary
+
+# 행(dict) → 임베딩 텍스트
+TextTemplate = Callable[[Dict[str, Any]], str]
+
+
+def _menu_lines(restaurant: Dict[str, Any]) -> str:
+    if not restaurant.get("menus"):
+        return ""
+    return "\n".join(f"  - {menu}" for menu in restaurant["menus"].split(" | "))
+
+
+def optimized_text(restaurant: Dict[str, Any]) -> str:
+    """검색 최적화된 텍스트 생성 (이름/카테고리 → 메뉴 → 특징 순)"""
+    return f"""
+# {restaurant['name']} {restaurant['category']}
+
+## 메뉴
+{_menu_lines(restaurant)}
+
+## 특징:
+{restaurant.get('description', '')}
+위치: {restaurant.get('location_type', '')}
+날씨태그: {restaurant.get('weather_tags', '')}
+    """.strip()
+
+
+def optimized_text_with_links(restaurant: Dict[str, Any]) -> str:
+    """리뷰수와 네이버/홈페이지/썸네일 정보까지 포함한 검색 텍스트"""
+    return f"""
+# {restaurant['name']} {restaurant['category']}
+
+## 메뉴
+{_menu_lines(restaurant)}
+
+## 네이버 리뷰수: {restaurant.get('naver_review_count', '')}
+
+## 특징:
+{restaurant.get('description', '')}
+
+
+## 위치: {restaurant.get('location_type', '')}
+
+## metadata
+- naver_id: {restaurant.get('naver_id', '')}
+- homepage_url: {restaurant.get('homepage_url', '')}
+- main_thumbnail_url: {restaurant.get('main_thumbnail_url', '')}
+    """.strip()
+
+
+def signature_text(restaurant: Dict[str, Any]) -> str:
+    """대표메뉴를 반복해 가중치를 준 검색 텍스트"""
+    signature = restaurant.get("signature_menu", "")
+    signature_emphasized = f"{signature} {signature} {signature}" if signature else ""
+    return f"""
+# {restaurant['name']} {restaurant['category']}
+{signature_emphasized}
+
+## 메뉴
+{_menu_lines(restaurant)}
+
+
+{restaurant.get('description', '')}
+위치: {restaurant.get('location_type', '')}
+날씨태그: {restaurant.get('weather_tags', '')}
+    """.strip()
+
+
+def markdown_text(restaurant: Dict[str, Any]) -> str:
+    """음식점 데이터를 사람이 읽기 좋은 Markdown으로 변환"""
+    return f"""# {restaurant['name']}
+
+## 기본 정보
+- **카테고리**: {restaurant['category']}
+- **대표메뉴**: {restaurant.get('signature_menu') or '정보 없음'}
+- **위치 타입**: {restaurant.get('location_type') or '일반 음식점'}
+- **네이버 리뷰수**: {restaurant.get('naver_review_count')}
+
+## 메뉴
+{_menu_lines(restaurant) or '  - 메뉴 정보 없음'}
+
+## 설명
+{restaurant.get('description') or '설명 없음'}
+
+## 날씨 태그
+{restaurant.get('weather_tags') or '태그 없음'}
+
+## 위치 정보
+- 위도: {restaurant.get('latitude')}
+- 경도: {restaurant.get('longitude')}""".strip()
+
+
+def build_metadata(restaurant: Dict[str, Any]) -> Dict[str, Any]:
+    """검색 필터/앱 표시에 쓰는 메타데이터. 조회하지 않은 선택 컬럼은 넣지 않습니다."""
+    metadata = {
+        "restaurant_id": restaurant["id"],
+        "name": restaurant["name"],
+        "category": restaurant["category"],
+        "location_type": restaurant.get("location_type") or "",
+        "latitude": float(restaurant["latitude"]),
+        "longitude": float(restaurant["longitude"]),
+        "main_thumbnail_url": restaurant.get("main_thumbnail_url") or "",
+        "homepage_url": restaurant.get("homepage_url") or "",
+        "naver_review_count": restaurant.get("naver_review_count") or 0,
+        "naver_id": restaurant.get("naver_id") or "",
+        "phone": restaurant.get("phone") or "",
+    }
+    for key in ("signature_menu", "weather_tags"):
+        if key in restaurant:
+            metadata[key] = restaurant.get(key) or ""
+    # 가격 범위 필터용 최저/중앙/최고가 (메뉴별 가격 배열은 가격 사이드 테이블에 따로 둡니다)
+    metadata.update(price_summary(restaurant.get("menu_prices") or []))
+    return metadata
+
+
+def document_template(text: TextTemplate) -> Callable[[Dict[str, Any]], Document]:
+    """텍스트 템플릿을 행 → Document 변환 함수로 감쌉니다."""
+
+    def to_document(restaurant: Dict[str, Any]) -> Document:
+        return Document(page_content=text(restaurant), metadata=build_metadata(restaurant))
+
+    return to_document
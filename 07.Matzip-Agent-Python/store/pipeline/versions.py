@@ -0,0 +1,122 @@
+import os
+import shutil
+import time
+from typing import Any, List, Optional
+
+from agent.index_alias import VERSIONS_DIR, FileAlias, PineconeAlias
+
+
+def new_version() -> str:
+    """시간순으로 정렬되는 버전 이름 (예: v20261019-120000)."""
+    return time.strftime("v%Y%m%d-%H%M%S")
+
+
+def _expired(versions: List[str], current: Optional[str], keep: int) -> List[str]:
+    """
+    현재 버전보다 오래된 버전 중 최근 keep-1개를 남기고 나머지를 반환합니다.
+    현재보다 새 버전(빌드 중이거나 실패한 빌드)은 건드리지 않습니다.
+    직전 버전을 남겨 두는 것은 아직 포인터를 다시 읽지 않은 앱 프로세스를 위해서입니다.
+    """
+    if current is None:
+        return []
+    older = sorted(v for v in versions if v < current)
+    return older[: max(len(older) - (keep - 1), 0)]
+
+
+class DirectoryVersions:
+    """
+    root/versions/<version>/ 에 새 버전을 만들고, 다 쓴 뒤 root/current.json 포인터만 바꿉니다.
+    ChromaDB persist 디렉터리와 로컬 벡터 인덱스 artifact에 같이 씁니다.
+    """
+
+    def __init__(self, root: str, keep: int = 2) -> None:
+        self.root = root
+        self.keep = keep
+        self.alias = FileAlias(root)
+
+    def current(self) -> Optional[str]:
+        return (self.alias.read() or {}).get("version")
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.root, VERSIONS_DIR, version)
+
+    def publish(self, version: str, **info: Any) -> None:
+        if not os.path.isdir(self.path(version)):
+            raise FileNotFoundError(f"게시할 버전 디렉터리가 없습니다: {self.path(version)}")
+        self.alias.write(
+            {
+                "version": version,
+                "directory": os.path.join(VERSIONS_DIR, version),
+                "published_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **info,
+            }
+        )
+        print(f"🔀 현재 버전 → {version} ({self.alias.path})")
+        self.gc()
+
+    def gc(self) -> List[str]:
+        versions_root = os.path.join(self.root, VERSIONS_DIR)
+        versions = os.listdir(versions_root) if os.path.isdir(versions_root) else []
+        expired = _expired(versions, self.current(), self.keep)
+        for version in expired:
+            shutil.rmtree(self.path(version), ignore_errors=True)
+        if expired:
+            print(f"🧹 오래된 버전 {len(expired)}개 삭제: {', '.join(expired)}")
+        return expired
+
+
+class NamespaceVersions:
+    """
+    Pinecone 네임스페이스 <alias>-<version> 에 새 버전을 만들고,
+    다 쓴 뒤 예약 네임스페이스의 포인터 레코드만 바꿉니다 (agent.index_alias.PineconeAlias).
+    """
+
+    def __init__(self, index: Any, alias: str, dimension: int, keep: int = 2) -> None:
+        self.index = index
+        self.alias = alias
+        self.keep = keep
+        self.pointer = PineconeAlias(index, alias, dimension)
+
+    def current(self) -> Optional[str]:
+        return (self.pointer.read() or {}).get("version")
+
+    def namespace(self, version: str) -> str:
+        return f"{self.alias}-{version}"
+
+    def _namespaces(self) -> dict:
+        return dict(self.index.describe_index_stats().namespaces or {})
+
+    def wait_until_visible(self, version: str, count: int, timeout: float = 60.0) -> None:
+        """Pinecone 쓰기는 바로 보이지 않으므로, 새 네임스페이스의 벡터 수가 맞을 때까지 기다립니다."""
+        namespace = self.namespace(version)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            summary = self._namespaces().get(namespace)
+            if summary is not None and summary.vector_count >= count:
+                return
+            time.sleep(2)
+        raise TimeoutError(f"네임스페이스 {namespace}에 벡터 {count}개가 {timeout:.0f}s 안에 보이지 않습니다")
+
+    def publish(self, version: str, count: Optional[int] = None, **info: Any) -> None:
+        if count:
+            self.wait_until_visible(version, count)
+        self.pointer.write(
+            {
+                "version": version,
+                "namespace": self.namespace(version),
+                "published_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **info,
+            }
+        )
+        print(f"🔀 현재 버전 → {self.namespace(version)}")
+        self.gc()
+
+    def gc(self) -> List[str]:
+        prefix = f"{self.alias}-"
+        versions = [ns[len(prefix):] for ns in self._namespaces() if ns.startswith(f"{prefix}v")]
+        expired = _expired(versions, self.current(), self.keep)
+        for version in expired:
+            self.index.delete(delete_all=True, namespace=self.namespace(version))
+        if expired:
+            print(f"🧹 오래된 네임스페이스 {len(expired)}개 삭제: {', '.join(expired)}")
+        return expired
@@ -2,7 +2,7 @@
 Persisted ChromaDB 검색 도구 (HuggingFace/Qwen 임베딩 컬렉션).
 
 예시:
-    python store/test._qwen.py --query "비 오는 날 먹기 좋은 음식" --k 5
+    python -m store.test_qwen --query "비 오는 날 먹기 좋은 음식" --k 5
 """
 
 import argparse
@@ -13,6 +13,8 @@ from dotenv import load_dotenv
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 
+from store.pipeline.local_embedder import LocalEmbedder, local_files_only_from_env
+
 load_dotenv()
 
 CHROMA_DB_PATH = "./chroma_db_qwen"
@@ -20,10 +22,24 @@ COLLECTION_NAME = "jamsil_restaurants_qwen"
 HUGGINGFACE_MODEL = os.getenv("HUGGINGFACE_MODEL", "BAAI/bge-m3")
 HUGGINGFACE_DEVICE = os.getenv("HUGGINGFACE_DEVICE", "cpu")
 HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
+# CPU 질의 임베딩 양자화 (none / int8 / onnx)
+HUGGINGFACE_QUANTIZE = os.getenv("HUGGINGFACE_QUANTIZE", "none")
 
 
 def load_vectorstore() -> Chroma:
     """Persisted Chroma 컬렉션 로드 (HuggingFace 임베딩)."""
+    if HUGGINGFACE_QUANTIZE != "none" and HUGGINGFACE_DEVICE == "cpu":
+        return Chroma(
+            collection_name=COLLECTION_NAME,
+            embedding_function=LocalEmbedder(
+                HUGGINGFACE_MODEL,
+                quantize=HUGGINGFACE_QUANTIZE,
+                token=HUGGINGFACE_TOKEN,
+                local_files_only=local_files_only_from_env(),
+            ),
+            persist_directory=CHROMA_DB_PATH,
+        )
+
     embeddings = HuggingFaceEmbeddings(
         model_name=HUGGINGFACE_MODEL,
         model_kwargs={